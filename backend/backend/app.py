@@ -1,24 +1,37 @@
 import os
 import asyncio
 import logging
-from collections import defaultdict
+import socket
 from contextlib import asynccontextmanager
-from typing import Set, Optional
+from typing import Optional
 
 from fastapi import FastAPI, Request, APIRouter, WebSocket, WebSocketDisconnect, Depends
 from starlette.middleware import Middleware
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.staticfiles import StaticFiles
-from starlette.websockets import WebSocket as StarletteWebSocket
 
 from entities.repositories import Repository
-from infrastructure.station_listeners import station_listener
+from infrastructure.station_listeners import station_listener, with_db_connection
 from utils.logging_config import setup_logging
 from utils.mqtt_client import MQTTClient
 from utils.mqtt_wrapper import MQTTWrapper
 from utils.routes_auto_import import import_sub_routes
-from infrastructure.pgpool import init_pool, close_pool, obtain_connection_from_pool, release_connection
+from infrastructure.pgpool import init_pool, close_pool, get_pool_metrics, create_lazy_database, \
+    obtain_connection_async, release_connection_async
+from psycopg2.pool import PoolError
+from fastapi.responses import JSONResponse
 from infrastructure.database import set_db, get_db, Database
+from infrastructure.image_pipeline import shutdown_image_pool
+from infrastructure.ingestion_queue import ingestion_queue_from_env
+from infrastructure.report_batch_writer import report_batch_writer_from_env
+from infrastructure.report_partitions import maintain_report_partitions, MAINTENANCE_INTERVAL
+from infrastructure.websocket_fanout import websocket_fanout_from_env
+from infrastructure.broadcast_bus import BroadcastBus, InProcessBroadcastBus, broadcast_bus_from_env
+from infrastructure.station_notifications import StationNotificationSubscriptions
+from infrastructure.station_cache import station_cache, StationCacheListener
+from entities.station_registry import StationRegistry
+from utils.ttl_cache import MISSING
+from starlette.concurrency import run_in_threadpool
 from jose import jwt
 from jose.exceptions import ExpiredSignatureError, JWTError
 
@@ -27,52 +40,57 @@ from jose.exceptions import ExpiredSignatureError, JWTError
 setup_logging()
 logger = logging.getLogger(__name__)
 
-# Registry per station and reference to main asyncio loop
-active_by_station: dict[str, Set[StarletteWebSocket]] = defaultdict(set)
+# Registry per station (per-socket send queues) and reference to main asyncio loop
+ws_fanout = websocket_fanout_from_env()
+# Route station events to the worker holding the socket (in-process until lifespan picks the bus)
+broadcast_bus: BroadcastBus = InProcessBroadcastBus(ws_fanout)
+# Abonnements MQTT stations/<id>/# des stations ayant un socket ici (None sans MQTT)
+station_notifications: Optional[StationNotificationSubscriptions] = None
 _main_loop: Optional[asyncio.AbstractEventLoop] = None
 
-async def _safe_send(ws: StarletteWebSocket, text: str):
-    try:
-        await ws.send_text(text)
-    except Exception:
-        # remove closed socket from all station sets
-        try:
-            for sset in list(active_by_station.values()):
-                sset.discard(ws)
-        except Exception:
-            pass
-        logger.info("Removed closed websocket during send")
-
 mqtt_host = os.getenv("MQTT_HOST")
 mqtt_port = int(os.getenv("MQTT_PORT", "1883"))
+# Un client id par processus: le broker déconnecte un client dont l'id est repris
+mqtt_client_id = os.getenv("MQTT_CLIENT_ID") or f"backend-{socket.gethostname()}-{os.getpid()}"
+
+def _connect_mqtt(client_id: str) -> MQTTClient:
+    # Si le port est 8883, utiliser TLS. Sinon, connexion simple.
+    if mqtt_port == 8883:
+        return MQTTClient(broker_host=mqtt_host, broker_port=mqtt_port, client_id=client_id)
+    return MQTTClient(broker_host=mqtt_host, broker_port=mqtt_port, client_id=client_id,
+                      ca_cert=None, certfile=None, keyfile=None)
+
 mqtt_raw = None
+# Connexion séparée pour les notifications des stations ayant un socket local
+mqtt_notify_raw = None
 if mqtt_host and os.environ.get("TESTING") != "1":
     try:
-        # Si le port est 8883, utiliser TLS. Sinon, connexion simple.
-        if mqtt_port == 8883:
-            mqtt_raw = MQTTClient(broker_host=mqtt_host, broker_port=mqtt_port, client_id="backend")
-        else:
-            mqtt_raw = MQTTClient(broker_host=mqtt_host, broker_port=mqtt_port, client_id="backend", 
-                                 ca_cert=None, certfile=None, keyfile=None)
+        mqtt_raw = _connect_mqtt(mqtt_client_id)
+        mqtt_notify_raw = _connect_mqtt(f"{mqtt_client_id}-notify")
         logger.info(f"MQTT client initialized for {mqtt_host}:{mqtt_port}")
     except Exception as e:
         logger.warning(f"MQTT client initialization failed: {e}. Running without MQTT.")
+        mqtt_raw = mqtt_notify_raw = None
+
+# Commandes des stations: abonnement partagé, un seul réplica traite chaque message
+# (MQTT_SHARED_GROUP vide: abonnement simple, un seul processus backend)
+mqtt_shared_group = os.getenv("MQTT_SHARED_GROUP", "backend")
 
-def _safe_task(coro):
-    task = asyncio.create_task(coro)
-    def _swallow_done(t):
+async def _report_partition_maintenance():
+    # Partitions mensuelles des rapports créées d'avance, une fois par jour
+    while True:
         try:
-            t.result()
-        except Exception as e:
-            logger.warning("Unhandled exception in background task: %s", e)
-    task.add_done_callback(_swallow_done)
-    return task
+            await run_in_threadpool(with_db_connection, maintain_report_partitions)
+        except Exception:
+            logger.exception("Report partition maintenance failed")
+        await asyncio.sleep(MAINTENANCE_INTERVAL)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global _main_loop
+    global _main_loop, broadcast_bus, station_notifications
     # Capture la boucle asyncio qui sert les WebSockets/uvicorn
     _main_loop = asyncio.get_running_loop()
+    ws_fanout.bind(_main_loop)
 
     if os.environ.get("TESTING") != "1":
         dsn = "host={host} port={port} dbname={db} user={user} password={pwd}".format(
@@ -82,12 +100,33 @@ async def lifespan(app: FastAPI):
             user=os.getenv("DB_USER", "postgres"),
             pwd=os.getenv("DB_PASSWORD", "postgres"),
         )
-        init_pool(minconn=1, maxconn=10, dsn=dsn)
+        init_pool(
+            minconn=int(os.getenv("DB_POOL_MIN", "1")),
+            maxconn=int(os.getenv("DB_POOL_MAX", "10")),
+            dsn=dsn,
+            acquire_timeout=float(os.getenv("DB_POOL_ACQUIRE_TIMEOUT", "5")),
+            max_waiting=int(os.getenv("DB_POOL_MAX_WAITING", "100")),
+            max_lifetime=float(os.getenv("DB_POOL_MAX_LIFETIME", "1800")),
+            max_idle_time=float(os.getenv("DB_POOL_MAX_IDLE_TIME", "300")),
+        )
+        app.state.partition_maintenance = asyncio.create_task(_report_partition_maintenance())
+        if os.getenv("STATION_CACHE_LISTEN", "1") == "1":
+            # Écritures de stations des autres processus: LISTEN station_changed, hors pool
+            app.state.station_cache_listener = StationCacheListener(dsn).start()
 
         if mqtt_raw:
             logger.info("Register mqtt callbacks")
-            app.state.mqtt = MQTTWrapper(mqtt_raw, _main_loop, active_by_station)
-            mqtt_raw.register_callback("stations/#", station_listener(active_by_station, _main_loop, _safe_task))
+            broadcast_bus = broadcast_bus_from_env(ws_fanout, mqtt_raw)
+            app.state.mqtt = MQTTWrapper(mqtt_raw, broadcast_bus)
+            # Le thread paho ne fait que mettre en file; les workers font le travail
+            app.state.mqtt_ingestion = ingestion_queue_from_env().start()
+            # Rapports regroupés par petites fenêtres: un INSERT multi-lignes et un commit par lot
+            app.state.report_writer = report_batch_writer_from_env(with_db_connection).start()
+            mqtt_raw.register_callback(
+                "stations/#",
+                station_listener(broadcast_bus, app.state.mqtt_ingestion, app.state.report_writer),
+                subscription=f"$share/{mqtt_shared_group}/stations/#" if mqtt_shared_group else None)
+            station_notifications = StationNotificationSubscriptions(mqtt_notify_raw, ws_fanout)
         else:
             logger.info("Running without MQTT broker")
             app.state.mqtt = None
@@ -95,6 +134,20 @@ async def lifespan(app: FastAPI):
     try:
         yield
     finally:
+        partition_maintenance = getattr(app.state, "partition_maintenance", None)
+        if partition_maintenance is not None:
+            partition_maintenance.cancel()
+        ingestion = getattr(app.state, "mqtt_ingestion", None)
+        if ingestion is not None:
+            ingestion.stop(timeout=float(os.getenv("MQTT_DRAIN_TIMEOUT", "5")))
+        report_writer = getattr(app.state, "report_writer", None)
+        if report_writer is not None:
+            report_writer.stop()
+        station_cache_listener = getattr(app.state, "station_cache_listener", None)
+        if station_cache_listener is not None:
+            station_cache_listener.stop()
+        await ws_fanout.close()
+        shutdown_image_pool()
         if os.environ.get("TESTING") != "1":
             try:
                 close_pool()
@@ -109,6 +162,7 @@ middleware = [
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor"],  # pagination des résumés de rapports
     )
 ]
 
@@ -141,6 +195,31 @@ JWT_SECRET = os.getenv(
 )
 
 
+async def _load_station_owner(station_id: str) -> Optional[int]:
+    """
+    Propriétaire de la station (None si inconnue ou non jumelée), depuis le cache des
+    stations ou la base. La connexion n'est empruntée que le temps de la requête.
+    Lève PoolError si le pool est saturé, LookupError si aucune base n'est disponible.
+    """
+    station = StationRegistry.cached_station_by_mac_address(station_id)
+    if station is MISSING:
+        # Obtain DB connection manually for WebSocket (middleware doesn't run for WS)
+        try:
+            conn, from_pool = await obtain_connection_async()
+        except RuntimeError:
+            current_db = get_db()
+            if current_db is None:
+                raise LookupError("Database unavailable")
+            conn, from_pool = current_db.conn, False
+        try:
+            registry = StationRegistry(Repository(Database(conn, commit_on_execute=False)))
+            station = await run_in_threadpool(registry.get_station_by_mac_address, station_id)
+        finally:
+            await release_connection_async(conn, from_pool)
+
+    return station.user_id if station else None
+
+
 @app.websocket("/ws/stations/{station_id}")
 async def websocket_endpoint(websocket: WebSocket, station_id: str):
     # Accept connection first, then validate
@@ -151,108 +230,96 @@ async def websocket_endpoint(websocket: WebSocket, station_id: str):
         await websocket.close(code=4003, reason="Missing token")
         return
 
-    # Obtain DB connection manually for WebSocket (middleware doesn't run for WS)
     try:
-        try:
-            conn, from_pool = obtain_connection_from_pool()
-        except RuntimeError:
-            current_db = get_db()
-            if current_db is None:
-                await websocket.close(code=5000, reason="Database unavailable")
-                return
-            conn = current_db.conn
-            from_pool = False
-        
-        db = Database(conn, commit_on_execute=False)
-
         payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGO])
         user_id = int(payload.get("sub"))
-        repository = Repository(db)
-        station = repository.get_station_by_mac_address(station_id)
-        logger.info(f"Authentified WS user {user_id} for station {station_id}")
-        if not station or station.user_id != user_id:
-            logger.info(f"WS rejected: station={station}, station.user_id={station.user_id if station else None}, user_id={user_id}")
-            await websocket.close(code=4003, reason="Unauthorized station access")
-            release_connection(conn, from_pool)
-            return
-
-        active_by_station.setdefault(station_id, set()).add(websocket)
-        logger.info("✅ WebSocket client %s connecté pour station %s (total WS pour cette station: %d)", user_id, station_id, len(active_by_station[station_id]))
     except ExpiredSignatureError:
         await websocket.close(code=4001, reason="Token expired")
-        release_connection(conn, from_pool)
         return
     except JWTError:
         await websocket.close(code=4002)
-        release_connection(conn, from_pool)
         return
-    except Exception:
-        release_connection(conn, from_pool)
-        raise
+
+    # Aucune ressource base n'est gardée pendant la vie du socket
+    try:
+        owner_id = await _load_station_owner(station_id)
+    except PoolError as e:
+        logger.warning("WS rejected, DB pool saturated: %s", e)
+        await websocket.close(code=1013, reason="Database busy")
+        return
+    except LookupError:
+        await websocket.close(code=5000, reason="Database unavailable")
+        return
+
+    logger.info(f"Authentified WS user {user_id} for station {station_id}")
+    if owner_id is None or owner_id != user_id:
+        logger.info(f"WS rejected: station={station_id}, station.user_id={owner_id}, user_id={user_id}")
+        await websocket.close(code=4003, reason="Unauthorized station access")
+        return
+
+    ws_fanout.register(station_id, websocket)
+    if station_notifications is not None:
+        station_notifications.acquire(station_id)
+    logger.info("✅ WebSocket client %s connecté pour station %s (total WS pour cette station: %d)", user_id, station_id, ws_fanout.connection_count(station_id))
 
     try:
         while True:
             data = await websocket.receive_text()
-            text = f"Broadcast: {data}"
-            for ws in list(active_by_station.get(station_id, set())):
-                _safe_task(_safe_send(ws, text))
+            broadcast_bus.publish(station_id, f"Broadcast: {data}")
     except WebSocketDisconnect:
         logger.info("WebSocket client disconnected for station %s", station_id)
     finally:
-        active_by_station[station_id].discard(websocket)
-        if not active_by_station[station_id]:
-            del active_by_station[station_id]
-        release_connection(conn, from_pool)
+        ws_fanout.unregister(websocket)
+        if station_notifications is not None:
+            station_notifications.release(station_id)
 
 
 
 # DB session middleware
 @app.middleware("http")
 async def db_session_middleware(request: Request, call_next):
-    # 1) try to obtain a connection from the pool; if pool not ready, fallback to get_db()
-    try:
-        conn, from_pool = obtain_connection_from_pool()
-    except RuntimeError:
-        current_db = get_db()
-        if current_db is None:
-            raise RuntimeError("No DB pool and no test DB available; init_pool(...) must be called before handling requests.")
-        conn = current_db.conn
-        from_pool = False
-
-    # 2) ensure a Database wrapper is installed in the current context if needed
+    # 1) connection provided by tests (get_db fallback): use it as is, no commit
     current_db = get_db()
-    created_db = False
-    if current_db is None or getattr(current_db, "conn", None) is not conn:
-        db = Database(conn, commit_on_execute=False)
-        set_db(db)
-        created_db = True
-    else:
-        db = current_db
-
-    # 3) run the request and manage transaction (commit on success only for pool connections)
-    try:
-        response = await call_next(request)
+    if current_db is not None:
         try:
-            if from_pool:
-                conn.commit()
+            return await call_next(request)
         except Exception:
             try:
-                conn.rollback()
+                await run_in_threadpool(current_db.conn.rollback)
             except Exception:
                 pass
             raise
+
+    # 2) install a lazy Database: a pool connection is only checked out on the
+    #    first query/execute (health, docs, static files never take one)
+    try:
+        db = create_lazy_database()
+    except RuntimeError:
+        raise RuntimeError("No DB pool and no test DB available; init_pool(...) must be called before handling requests.")
+    set_db(db)
+
+    # 3) run the request and manage transaction, only if a connection was taken
+    try:
+        response = await call_next(request)
+        if db.acquired:
+            await run_in_threadpool(db.finish, True)
         return response
     except Exception:
-        try:
-            conn.rollback()
-        except Exception:
-            pass
+        if db.acquired:
+            try:
+                await run_in_threadpool(db.finish, False)
+            except Exception:
+                pass
         raise
     finally:
-        # 4) cleanup: unset context DB only if we set it here, then release connection appropriately
-        if created_db:
-            set_db(None)
-        release_connection(conn, from_pool)
+        # 4) cleanup: unset context DB
+        set_db(None)
+
+
+@app.exception_handler(PoolError)
+async def pool_error_handler(request: Request, exc: PoolError):
+    logger.warning("DB pool saturated: %s", exc)
+    return JSONResponse(status_code=503, content={"detail": "Database busy, retry later"})
 
 # API router import/include
 api_router = APIRouter(prefix="/api")
@@ -263,3 +330,25 @@ app.include_router(api_router)
 @app.get("/health")
 def health():
     return {"status": "ok"}
+
+@app.get("/health/db-pool")
+def health_db_pool():
+    return {"pool": get_pool_metrics()}
+
+@app.get("/health/mqtt-ingestion")
+def health_mqtt_ingestion():
+    ingestion = getattr(app.state, "mqtt_ingestion", None)
+    report_writer = getattr(app.state, "report_writer", None)
+    return {
+        "ingestion": ingestion.metrics() if ingestion is not None else None,
+        "report_batches": report_writer.metrics() if report_writer is not None else None,
+    }
+
+@app.get("/health/websockets")
+def health_websockets():
+    return {
+        "fanout": ws_fanout.metrics(),
+        "bus": broadcast_bus.metrics(),
+        "notifications": station_notifications.metrics() if station_notifications is not None else None,
+        "station_cache": station_cache.metrics(),
+    }
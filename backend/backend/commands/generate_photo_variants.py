@@ -0,0 +1,60 @@
+# commands/generate_photo_variants.py
+"""
+Génère les miniatures (photo_variant) des photos qui n'en ont pas encore,
+typiquement celles migrées depuis maintenance_sheet.photo.
+
+    python -m commands.generate_photo_variants
+"""
+import logging
+import os
+
+import psycopg2
+
+from entities.repositories import Repository
+from infrastructure.database import Database
+from infrastructure.image_pipeline import ingest_photo, InvalidPhotoError, shutdown_image_pool
+from utils.logging_config import setup_logging
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 50
+
+
+def main() -> int:
+    conn = psycopg2.connect(
+        host=os.getenv("DB_HOST", "postgres"),
+        port=os.getenv("DB_PORT", "5432"),
+        dbname=os.getenv("DB_NAME", "ezplantparent"),
+        user=os.getenv("DB_USER", "postgres"),
+        password=os.getenv("DB_PASSWORD", "postgres"),
+    )
+    repository = Repository(Database(conn, commit_on_execute=True))
+    generated = 0
+    skipped = set()
+    try:
+        while True:
+            photo_ids = [i for i in repository.list_photo_ids_without_variants(BATCH_SIZE + len(skipped)) if i not in skipped]
+            if not photo_ids:
+                break
+            for photo_id in photo_ids:
+                blob = repository.get_photo_blob(photo_id)
+                try:
+                    # L'original migré est conservé tel quel; seules les miniatures sont ajoutées
+                    processed = ingest_photo(blob.content)
+                except InvalidPhotoError as e:
+                    logger.warning("photo %s skipped: %s", photo_id, e)
+                    skipped.add(photo_id)
+                    continue
+                repository.store_photo_variants(photo_id, processed.variants)
+                generated += 1
+    finally:
+        shutdown_image_pool()
+        conn.close()
+
+    logger.info("thumbnails generated for %d photo(s), %d skipped", generated, len(skipped))
+    return 0
+
+
+if __name__ == "__main__":
+    setup_logging()
+    raise SystemExit(main())
@@ -0,0 +1,48 @@
+# commands/maintain_report_partitions.py
+"""
+Crée les partitions mensuelles des rapports à venir et applique la rétention.
+Le backend le fait aussi chaque jour; utile en cron ou après une longue coupure.
+
+    python -m commands.maintain_report_partitions
+    python -m commands.maintain_report_partitions --months-ahead 6 --retention-months 24
+"""
+import argparse
+import logging
+import os
+
+import psycopg2
+
+from infrastructure.database import Database
+from infrastructure.report_partitions import maintain_report_partitions, MONTHS_AHEAD, RETENTION_MONTHS
+from utils.logging_config import setup_logging
+
+logger = logging.getLogger(__name__)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Create upcoming report partitions and drop expired ones")
+    parser.add_argument("--months-ahead", type=int, default=MONTHS_AHEAD)
+    parser.add_argument("--retention-months", type=int, default=RETENTION_MONTHS,
+                        help="drop partitions older than this many months (default: keep everything)")
+    args = parser.parse_args(argv)
+
+    conn = psycopg2.connect(
+        host=os.getenv("DB_HOST", "postgres"),
+        port=os.getenv("DB_PORT", "5432"),
+        dbname=os.getenv("DB_NAME", "ezplantparent"),
+        user=os.getenv("DB_USER", "postgres"),
+        password=os.getenv("DB_PASSWORD", "postgres"),
+    )
+    try:
+        result = maintain_report_partitions(Database(conn, commit_on_execute=True),
+                                            args.months_ahead, args.retention_months)
+    finally:
+        conn.close()
+
+    logger.info("report partitions: %d created, %d dropped", result["created"], result["dropped"])
+    return 0
+
+
+if __name__ == "__main__":
+    setup_logging()
+    raise SystemExit(main())
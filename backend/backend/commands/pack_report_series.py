@@ -0,0 +1,49 @@
+# commands/pack_report_series.py
+"""
+Convertit les séries JSON des anciens rapports (*_data) vers le format binaire
+compact (*_series, utils/series.py), par lots.
+
+    python -m commands.pack_report_series
+"""
+import logging
+import os
+
+import psycopg2
+
+from entities.repositories import Repository
+from infrastructure.database import Database
+from utils.logging_config import setup_logging
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+TABLES = ("express_analysis_report", "watering_report")
+
+
+def main() -> int:
+    conn = psycopg2.connect(
+        host=os.getenv("DB_HOST", "postgres"),
+        port=os.getenv("DB_PORT", "5432"),
+        dbname=os.getenv("DB_NAME", "ezplantparent"),
+        user=os.getenv("DB_USER", "postgres"),
+        password=os.getenv("DB_PASSWORD", "postgres"),
+    )
+    # commit_on_execute: un commit par lot, la table n'est jamais verrouillée longtemps
+    repository = Repository(Database(conn, commit_on_execute=True))
+    try:
+        for table in TABLES:
+            packed = 0
+            while True:
+                count = repository.pack_legacy_report_series(table, BATCH_SIZE)
+                if not count:
+                    break
+                packed += count
+            logger.info("%s: %d report(s) packed", table, packed)
+    finally:
+        conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    setup_logging()
+    raise SystemExit(main())
@@ -0,0 +1,57 @@
+# commands/purge_unreferenced_photos.py
+"""
+Supprime les photos (photo_blob et leurs miniatures) qu'aucune fiche ne référence,
+typiquement celles des fiches supprimées avant que la suppression ne les nettoie.
+
+    python -m commands.purge_unreferenced_photos
+"""
+import logging
+import os
+
+import psycopg2
+
+from entities.repositories import Repository
+from infrastructure.database import Database
+from utils.logging_config import setup_logging
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 100
+
+
+def main() -> int:
+    conn = psycopg2.connect(
+        host=os.getenv("DB_HOST", "postgres"),
+        port=os.getenv("DB_PORT", "5432"),
+        dbname=os.getenv("DB_NAME", "ezplantparent"),
+        user=os.getenv("DB_USER", "postgres"),
+        password=os.getenv("DB_PASSWORD", "postgres"),
+    )
+    # une transaction par photo: le verrou de delete_photo_if_unreferenced tient
+    # jusqu'à la suppression
+    repository = Repository(Database(conn, commit_on_execute=False))
+    deleted = 0
+    kept = set()
+    try:
+        while True:
+            photo_ids = [i for i in repository.list_unreferenced_photo_ids(BATCH_SIZE + len(kept)) if i not in kept]
+            conn.commit()
+            if not photo_ids:
+                break
+            for photo_id in photo_ids:
+                if repository.delete_photo_if_unreferenced(photo_id):
+                    deleted += 1
+                else:
+                    # réutilisée entre-temps par une nouvelle fiche
+                    kept.add(photo_id)
+                conn.commit()
+    finally:
+        conn.close()
+
+    logger.info("%d unreferenced photo(s) deleted", deleted)
+    return 0
+
+
+if __name__ == "__main__":
+    setup_logging()
+    raise SystemExit(main())
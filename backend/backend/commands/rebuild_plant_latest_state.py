@@ -0,0 +1,46 @@
+# commands/rebuild_plant_latest_state.py
+"""
+Recalcule la projection plant_latest_state depuis watering_report et
+express_analysis_report (backfill après migration, réparation).
+
+    python -m commands.rebuild_plant_latest_state            # toutes les plantes
+    python -m commands.rebuild_plant_latest_state --plant-id 42
+"""
+import argparse
+import logging
+import os
+
+import psycopg2
+
+from entities.repositories import Repository
+from infrastructure.database import Database
+from utils.logging_config import setup_logging
+
+logger = logging.getLogger(__name__)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Rebuild plant_latest_state from report history")
+    parser.add_argument("--plant-id", type=int, default=None, help="only rebuild this maintenance sheet")
+    args = parser.parse_args(argv)
+
+    conn = psycopg2.connect(
+        host=os.getenv("DB_HOST", "postgres"),
+        port=os.getenv("DB_PORT", "5432"),
+        dbname=os.getenv("DB_NAME", "ezplantparent"),
+        user=os.getenv("DB_USER", "postgres"),
+        password=os.getenv("DB_PASSWORD", "postgres"),
+    )
+    try:
+        # commit_on_execute: la reconstruction est une seule transaction
+        refreshed = Repository(Database(conn, commit_on_execute=True)).rebuild_plant_latest_state(args.plant_id)
+    finally:
+        conn.close()
+
+    logger.info("plant_latest_state rebuilt for %d plant(s)", refreshed)
+    return 0
+
+
+if __name__ == "__main__":
+    setup_logging()
+    raise SystemExit(main())
@@ -0,0 +1,21 @@
+from typing import Optional
+
+from entities.models import MaintenanceSheetOwnership
+from entities.repositories import Repository
+from infrastructure.maintenance_sheet_cache import maintenance_sheet_cache
+from utils.ttl_cache import TTLCache
+
+
+class MaintenanceSheetRegistry:
+    """
+    Propriétaire et cibles d'humidité des fiches à travers maintenance_sheet_cache:
+    les vérifications d'appartenance et les commandes ne lisent la base qu'en cas
+    d'absence du cache. Les projections sont immuables (frozen).
+    """
+
+    def __init__(self, repository: Repository, cache: TTLCache = maintenance_sheet_cache):
+        self._repository = repository
+        self._cache = cache
+
+    def get_ownership(self, sheet_id: int) -> Optional[MaintenanceSheetOwnership]:
+        return self._cache.get_or_load(sheet_id, lambda: self._repository.get_maintenance_sheet_ownership(sheet_id))
@@ -52,14 +52,17 @@ class MaintenanceSheet:
     max_temperature: Optional[int]
     min_watering_days_frequency: Optional[int]
     max_watering_days_frequency: Optional[int]
-    ideal_soil_humidity_after_watering: Optional[int]
-    ideal_air_humidity: Optional[int]
-    ideal_lumens: Optional[int]
-    ideal_temperature: Optional[int]
-    ideal_watering_days_frequency: Optional[int]
-    photo: Optional[bytes]
-    created_at: Optional[Any]
-    updated_at: Optional[Any]
+    ideal_soil_humidity_after_watering: Optional[int] = None
+    ideal_air_humidity: Optional[int] = None
+    ideal_lumens: Optional[int] = None
+    ideal_temperature: Optional[int] = None
+    ideal_watering_days_frequency: Optional[int] = None
+    photo_id: Optional[int] = None  # référence photo_blob, jamais les octets
+    created_at: Optional[Any] = None
+    updated_at: Optional[Any] = None
+    photo_hash: Optional[str] = None  # sha256 du contenu de la photo
+    # Octets de la photo: fournis à la création, ou chargés explicitement (get_photo_contents)
+    photo: Optional[bytes] = None
 
 
 @dataclass
@@ -79,6 +82,8 @@ class ExpressAnalysisReport:
     temperature_data: Optional[str] = None
 
     created_at: Optional[datetime] = None
+    # statistiques serveur par série (utils/series_stats.py)
+    stats: Optional[dict] = None
 
 @dataclass
 class WateringReport:
@@ -93,6 +98,8 @@ class WateringReport:
     pump_data: Optional[str] = None
 
     created_at: Optional[datetime] = None
+    # statistiques serveur par série (utils/series_stats.py)
+    stats: Optional[dict] = None
 
 @dataclass
 class MaintenanceSummary:
@@ -156,7 +163,27 @@ class LastFeeledHumidity:
     last_express_air_humidity: Optional[float] = None
     last_express_temperature: Optional[float] = None
     
-    photo: Optional[bytes] = None
+    photo_id: Optional[int] = None
+    photo_hash: Optional[str] = None
+
+
+@dataclass
+class PhotoBlob:
+    id: int
+    content_hash: str
+    content_type: str
+    byte_size: int
+    content: Optional[bytes] = None
+    created_at: Optional[datetime] = None
+
+
+@dataclass
+class PhotoVariant:
+    photo_id: int
+    variant: str  # 'original', 'small' ou 'medium'
+    content_hash: str
+    content_type: str
+    byte_size: int
 
 
 @dataclass
@@ -175,4 +202,22 @@ class User:
     created_at: Optional[datetime] = None
 
 
-
+@dataclass
+class MetricRollup:
+    """Agrégat d'une métrique sur un bucket (heure, jour ou semaine) de plant_metric_rollup."""
+    bucket_start: datetime
+    metric: str
+    count: int
+    mean: float
+    min: float
+    max: float
+
+
+@dataclass(frozen=True)
+class MaintenanceSheetOwnership:
+    """Projection légère d'une fiche, gardée en cache: propriétaire et cibles d'humidité du sol."""
+    id: int
+    user_id: int
+    min_soil_humidity: Optional[int]
+    max_soil_humidity: Optional[int]
+    ideal_soil_humidity_after_watering: Optional[int]
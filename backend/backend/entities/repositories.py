@@ -1,9 +1,116 @@
+import hashlib
+import json
 from typing import List, Optional
 
+import psycopg2
+from psycopg2.extras import Json
 from infrastructure.database import get_db, Database
 from entities.models import Station, MaintenanceSheet, ExpressAnalysisReport, RefreshToken, User, WateringReport, \
-    MaintenanceSummary, LastFeeledHumidity
+    MaintenanceSummary, LastFeeledHumidity, PhotoBlob, PhotoVariant, MetricRollup, MaintenanceSheetOwnership
 from datetime import datetime, timezone
+from utils.series import encode_series, decode_series
+from infrastructure.station_cache import invalidate_stations
+from infrastructure.maintenance_sheet_cache import maintenance_sheet_cache
+from infrastructure.maintenance_schedule_cache import maintenance_schedule_cache
+
+
+# Plus grand id SERIAL: borne haute des clés de pagination
+_MAX_REPORT_ID = 2147483647
+
+def _sniff_image_content_type(content: bytes) -> str:
+    if content[:3] == b"\xff\xd8\xff":
+        return "image/jpeg"
+    if content[:8] == b"\x89PNG\r\n\x1a\n":
+        return "image/png"
+    if content[:4] == b"RIFF" and content[8:12] == b"WEBP":
+        return "image/webp"
+    return "application/octet-stream"
+
+
+def _pack_series(values):
+    """Série capteur -> BYTEA compact. Accepte une liste ou son JSON (ancien format des handlers)."""
+    if values is None:
+        return None
+    if isinstance(values, str):
+        values = json.loads(values)
+    return psycopg2.Binary(encode_series(values))
+
+
+def _series_json(series, legacy: Optional[str]) -> Optional[str]:
+    """BYTEA compact -> JSON exposé par l'API; les rapports pas encore convertis gardent leur JSON."""
+    if series is None:
+        return legacy
+    return json.dumps(decode_series(series), separators=(",", ":"))
+
+
+# Colonnes JSON historiques -> colonnes binaires, par table de rapports
+_LEGACY_SERIES_COLUMNS = {
+    "express_analysis_report": (
+        ("soil_humidity_data", "soil_humidity_series"),
+        ("lumens_data", "lumens_series"),
+        ("air_humidity_data", "air_humidity_series"),
+        ("temperature_data", "temperature_series"),
+    ),
+    "watering_report": (
+        ("soil_humidity_data", "soil_humidity_series"),
+        ("pump_data", "pump_series"),
+    ),
+}
+
+
+# Résolutions des agrégats plant_metric_rollup (database/init/12-metric-rollups.sql)
+ROLLUP_RESOLUTIONS = ("hour", "day", "week")
+
+
+def _rollup_upsert_sql(samples_sql: str) -> str:
+    """
+    CTE qui ajoute aux agrégats plant_metric_rollup les échantillons
+    (plant_id, created_at, metric, value) produits par samples_sql.
+    GROUP BY: une seule ligne par bucket et par statement pour ON CONFLICT.
+    """
+    return f"""
+            rollup AS (
+                INSERT INTO plant_metric_rollup AS r (
+                    plant_id, resolution, bucket_start, metric,
+                    sample_count, value_sum, value_min, value_max
+                )
+                SELECT s.plant_id, res.resolution, date_trunc(res.resolution, s.created_at, 'UTC'), s.metric,
+                       count(*), sum(s.value), min(s.value), max(s.value)
+                FROM ({samples_sql}) AS s
+                CROSS JOIN (VALUES ('hour'), ('day'), ('week')) AS res (resolution)
+                GROUP BY 1, 2, 3, 4
+                ON CONFLICT (plant_id, resolution, bucket_start, metric) DO UPDATE SET
+                    sample_count = r.sample_count + EXCLUDED.sample_count,
+                    value_sum = r.value_sum + EXCLUDED.value_sum,
+                    value_min = LEAST(r.value_min, EXCLUDED.value_min),
+                    value_max = GREATEST(r.value_max, EXCLUDED.value_max)
+            )"""
+
+
+_EXPRESS_ROLLUP_SQL = _rollup_upsert_sql("""
+                    SELECT i.plant_id, i.created_at, m.metric, m.value::float AS value
+                    FROM inserted i
+                    CROSS JOIN LATERAL (VALUES
+                        ('soil_humidity', i.soil_humidity_mean),
+                        ('air_humidity', i.air_humidity_mean),
+                        ('temperature', i.temperature_mean),
+                        ('lumens', i.lumens_mean)
+                    ) AS m (metric, value)
+                    WHERE m.value IS NOT NULL
+                """)
+
+_WATERING_ROLLUP_SQL = _rollup_upsert_sql("""
+                    SELECT i.plant_id, i.created_at, 'watering_soil_humidity' AS metric, i.soil_humidity_mean::float AS value
+                    FROM inserted i
+                    WHERE i.soil_humidity_mean IS NOT NULL
+                """)
+
+
+# Cible d'humidité du sol d'une fiche (alias ms): idéal après arrosage, sinon milieu min/max
+_TARGET_HUMIDITY_SQL = """COALESCE(
+                        ms.ideal_soil_humidity_after_watering::float,
+                        (ms.min_soil_humidity + ms.max_soil_humidity) / 2.0
+                    )"""
 
 
 class Repository:
@@ -32,13 +139,17 @@ class Repository:
             (station.user_id, station.name, station.location, station.pairing_code, station.mac_adress, station.pairing_timeout)
         )
         station.id = row[0][0]
+        # une absence (None) a pu être mise en cache
+        keys = [station.id], [station.mac_adress], [station.pairing_code]
+        db.after_commit(lambda: invalidate_stations(*keys))
         return station.id
 
 
     def get_station_by_id(self, id_):
         db = self._db
         row = db.query(
-            "SELECT id, user_id, name, location, created_at, pairing_code, mac_adress, pairing_timeout FROM station WHERE id = %s;", (id_,)
+            "SELECT id, user_id, name, location, created_at, pairing_code, mac_adress, pairing_timeout FROM station WHERE id = %s;", (id_,),
+            statement_name="station_by_id"
         )
         if not row:
             return None
@@ -53,7 +164,8 @@ class Repository:
             FROM station
             WHERE mac_adress = %s;
             """,
-            (mac_adress,)
+            (mac_adress,),
+            statement_name="station_by_mac_address"
         )
         if not row:
             return None
@@ -77,7 +189,8 @@ class Repository:
             FROM station
             WHERE pairing_code = %s;
             """,
-            (pairing_code,)
+            (pairing_code,),
+            statement_name="station_by_pairing_code"
         )
         if not row:
             return None
@@ -95,20 +208,31 @@ class Repository:
 
     def update_station(self, station: Station) -> bool:
         db = self._db
-        result = db.execute(
-            "UPDATE station SET user_id=%s, name=%s, location=%s, pairing_code=%s, mac_adress=%s, pairing_timeout=%s WHERE id=%s;",
+        # old: ligne avant mise à jour, pour invalider aussi les anciennes clés du cache
+        rows = db.query(
+            """
+            UPDATE station s
+            SET user_id=%s, name=%s, location=%s, pairing_code=%s, mac_adress=%s, pairing_timeout=%s
+            FROM station old
+            WHERE s.id = %s AND old.id = s.id
+            RETURNING old.mac_adress, old.pairing_code;
+            """,
             (station.user_id, station.name, station.location, station.pairing_code, station.mac_adress, station.pairing_timeout, station.id)
         )
-        return result.rowcount > 0
+        ids, mac_adresses = [station.id], [station.mac_adress, *(r[0] for r in rows)]
+        pairing_codes = [station.pairing_code, *(r[1] for r in rows)]
+        db.after_commit(lambda: invalidate_stations(ids, mac_adresses, pairing_codes))
+        return len(rows) > 0
 
     def delete_other_user_stations(self, user_id: int, keep_station_id: int) -> int:
         """Supprime toutes les stations d'un utilisateur sauf celle spécifiée"""
         db = self._db
-        result = db.execute(
-            "DELETE FROM station WHERE user_id = %s AND id != %s;",
+        rows = db.query(
+            "DELETE FROM station WHERE user_id = %s AND id != %s RETURNING id, mac_adress, pairing_code;",
             (user_id, keep_station_id)
         )
-        return result.rowcount
+        db.after_commit(lambda: invalidate_stations([r[0] for r in rows], [r[1] for r in rows], [r[2] for r in rows]))
+        return len(rows)
 
     ## Maintenance sheets
 
@@ -142,9 +266,10 @@ class Repository:
               ideal_lumens,
               ideal_temperature,
               ideal_watering_days_frequency,
-              photo,
+              photo_id,
               created_at,
-              updated_at
+              updated_at,
+              (SELECT pb.content_hash FROM photo_blob pb WHERE pb.id = maintenance_sheet.photo_id) AS photo_hash
             FROM maintenance_sheet
             WHERE user_id = %s
             ORDER BY id ASC;
@@ -181,21 +306,41 @@ class Repository:
               ideal_lumens,
               ideal_temperature,
               ideal_watering_days_frequency,
-              photo,
+              photo_id,
               created_at,
-              updated_at
+              updated_at,
+              (SELECT pb.content_hash FROM photo_blob pb WHERE pb.id = maintenance_sheet.photo_id) AS photo_hash
             FROM maintenance_sheet
             WHERE id = %s
             LIMIT 1;
             """,
-            (id_,)
+            (id_,),
+            statement_name="maintenance_sheet_by_id"
         )
         if row is None:
             return None
         return MaintenanceSheet(**row)
 
+    def get_maintenance_sheet_ownership(self, id_: int) -> Optional[MaintenanceSheetOwnership]:
+        """Propriétaire et cibles d'humidité du sol seulement (cf. MaintenanceSheetRegistry)."""
+        rows = self._db.query(
+            """
+            SELECT id, user_id, min_soil_humidity, max_soil_humidity, ideal_soil_humidity_after_watering
+            FROM maintenance_sheet
+            WHERE id = %s;
+            """,
+            (id_,),
+            statement_name="maintenance_sheet_ownership"
+        )
+        if not rows:
+            return None
+        return MaintenanceSheetOwnership(*rows[0])
+
     def create_maintenance_sheet(self, sheet: MaintenanceSheet) -> int:
         db = self._db
+        if sheet.photo and sheet.photo_id is None:
+            sheet.photo_id = self.store_photo(sheet.photo)
+            sheet.photo_hash = hashlib.sha256(sheet.photo).hexdigest()
         row = db.query(
             """
             INSERT INTO maintenance_sheet (
@@ -212,7 +357,7 @@ class Repository:
               ideal_lumens,
               ideal_temperature,
               ideal_watering_days_frequency,
-              photo,
+              photo_id,
               created_at, updated_at
             )
             VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
@@ -244,12 +389,16 @@ class Repository:
                 sheet.ideal_lumens,
                 sheet.ideal_temperature,
                 sheet.ideal_watering_days_frequency,
-                sheet.photo,
+                sheet.photo_id,
                 sheet.created_at or None,
                 sheet.updated_at or None,
             )
         )
         sheet.id = row[0][0]
+        # une absence (None) a pu être mise en cache pour cet id
+        sheet_id, user_id = sheet.id, sheet.user_id
+        db.after_commit(lambda: maintenance_sheet_cache.invalidate(sheet_id))
+        db.after_commit(lambda: maintenance_schedule_cache.invalidate_users([user_id]))
         return sheet.id
 
     def create_express_analysis_report(
@@ -259,37 +408,116 @@ class Repository:
             temperature_mean: float | None,
             air_humidity_mean: float | None,
             lumens_mean: float | None,
-            soil_humidity_data: str | None,
-            temperature_data: str | None,
-            air_humidity_data: str | None,
-            lumens_data: str | None,
+            soil_humidity_data: list | str | None,
+            temperature_data: list | str | None,
+            air_humidity_data: list | str | None,
+            lumens_data: list | str | None,
             analysis_type: str = "express",
+            stats: dict | None = None,
     ) -> int:
-        row = self._db.query(
-            """
-            INSERT INTO express_analysis_report (
-                plant_id,
-                analysis_type,
-                soil_humidity_mean, lumens_mean, air_humidity_mean, temperature_mean,
-                soil_humidity_data, lumens_data, air_humidity_data, temperature_data
-            )
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            RETURNING id;
+        return self.create_express_analysis_reports([dict(
+            plant_id=plant_id,
+            analysis_type=analysis_type,
+            soil_humidity_mean=soil_humidity_mean,
+            lumens_mean=lumens_mean,
+            air_humidity_mean=air_humidity_mean,
+            temperature_mean=temperature_mean,
+            soil_humidity_data=soil_humidity_data,
+            lumens_data=lumens_data,
+            air_humidity_data=air_humidity_data,
+            temperature_data=temperature_data,
+            stats=stats,
+        )])[0]
+
+    def create_express_analysis_reports(self, reports: List[dict]) -> List[int]:
+        """
+        Insère plusieurs rapports express en un seul statement (INSERT multi-lignes)
+        et met à jour plant_latest_state dans la même transaction.
+        reports: dicts avec les arguments de create_express_analysis_report.
+        Retourne les ids dans l'ordre de `reports`.
+        """
+        if not reports:
+            return []
+        # Les ids SERIAL sont attribués dans l'ordre du VALUES: ORDER BY id = ordre d'entrée.
+        # DISTINCT ON: une seule ligne par plante pour l'upsert (ON CONFLICT ne peut pas
+        # toucher deux fois la même ligne dans un statement).
+        rows = self._db.query_values(
+            f"""
+            WITH inserted AS (
+                INSERT INTO express_analysis_report (
+                    plant_id,
+                    analysis_type,
+                    soil_humidity_mean, lumens_mean, air_humidity_mean, temperature_mean,
+                    soil_humidity_series, lumens_series, air_humidity_series, temperature_series,
+                    stats
+                )
+                VALUES %s
+                RETURNING id, plant_id, created_at, soil_humidity_mean, air_humidity_mean, temperature_mean, lumens_mean
+            ),
+            last_per_plant AS (
+                SELECT DISTINCT ON (i.plant_id) i.*
+                FROM inserted i
+                ORDER BY i.plant_id, i.created_at DESC, i.id DESC
+            ),
+            above_per_plant AS (
+                SELECT DISTINCT ON (i.plant_id) i.*
+                FROM inserted i
+                JOIN maintenance_sheet ms ON ms.id = i.plant_id
+                WHERE i.soil_humidity_mean > {_TARGET_HUMIDITY_SQL}
+                ORDER BY i.plant_id, i.created_at DESC, i.id DESC
+            ),
+            latest AS (
+                INSERT INTO plant_latest_state AS pls (
+                    plant_id,
+                    last_express_id, last_express_at,
+                    last_express_soil_humidity, last_express_air_humidity, last_express_temperature,
+                    last_express_above_target_id, last_express_above_target_at, last_express_above_target_humidity
+                )
+                SELECT
+                    l.plant_id,
+                    l.id, l.created_at,
+                    l.soil_humidity_mean, l.air_humidity_mean, l.temperature_mean,
+                    a.id, a.created_at, a.soil_humidity_mean
+                FROM last_per_plant l
+                JOIN maintenance_sheet ms ON ms.id = l.plant_id
+                LEFT JOIN above_per_plant a ON a.plant_id = l.plant_id
+                ON CONFLICT (plant_id) DO UPDATE SET
+                    last_express_id = EXCLUDED.last_express_id,
+                    last_express_at = EXCLUDED.last_express_at,
+                    last_express_soil_humidity = EXCLUDED.last_express_soil_humidity,
+                    last_express_air_humidity = EXCLUDED.last_express_air_humidity,
+                    last_express_temperature = EXCLUDED.last_express_temperature,
+                    last_express_above_target_id = COALESCE(EXCLUDED.last_express_above_target_id, pls.last_express_above_target_id),
+                    last_express_above_target_at = COALESCE(EXCLUDED.last_express_above_target_at, pls.last_express_above_target_at),
+                    last_express_above_target_humidity = CASE
+                        WHEN EXCLUDED.last_express_above_target_id IS NOT NULL THEN EXCLUDED.last_express_above_target_humidity
+                        ELSE pls.last_express_above_target_humidity
+                    END,
+                    updated_at = now()
+                WHERE pls.last_express_at IS NULL OR EXCLUDED.last_express_at >= pls.last_express_at
+            ),{_EXPRESS_ROLLUP_SQL}
+            SELECT id FROM inserted ORDER BY id;
             """,
-            (
-                plant_id,
-                analysis_type,
-                soil_humidity_mean,
-                lumens_mean,
-                air_humidity_mean,
-                temperature_mean,
-                soil_humidity_data,
-                lumens_data,
-                air_humidity_data,
-                temperature_data,
-            )
+            [
+                (
+                    r["plant_id"],
+                    r.get("analysis_type", "express"),
+                    r.get("soil_humidity_mean"),
+                    r.get("lumens_mean"),
+                    r.get("air_humidity_mean"),
+                    r.get("temperature_mean"),
+                    _pack_series(r.get("soil_humidity_data")),
+                    _pack_series(r.get("lumens_data")),
+                    _pack_series(r.get("air_humidity_data")),
+                    _pack_series(r.get("temperature_data")),
+                    Json(r["stats"]) if r.get("stats") is not None else None,
+                )
+                for r in reports
+            ]
         )
-        return row[0][0]
+        plant_ids = {r["plant_id"] for r in reports}
+        self._db.after_commit(lambda: maintenance_schedule_cache.invalidate_plants(plant_ids))
+        return [row[0] for row in rows]
 
     def list_all_express_reports(self, user_id: int) -> List[ExpressAnalysisReport]:
         db = self._db
@@ -306,13 +534,18 @@ class Repository:
               ear.lumens_data,
               ear.air_humidity_data,
               ear.temperature_data,
-              ear.created_at
+              ear.created_at,
+              ear.soil_humidity_series,
+              ear.lumens_series,
+              ear.air_humidity_series,
+              ear.temperature_series,
+              ear.stats
             FROM express_analysis_report ear
             JOIN maintenance_sheet ms ON ear.plant_id = ms.id
             WHERE ms.user_id = %s
             ORDER BY ear.id;
         """, (user_id,))
-        return [ExpressAnalysisReport(*row) for row in rows]
+        return [self._express_report_from_row(row) for row in rows]
 
     def get_express_analysis_report_by_id(self, report_id: int) -> Optional[ExpressAnalysisReport]:
         rows = self._db.query(
@@ -329,25 +562,82 @@ class Repository:
               lumens_data,
               air_humidity_data,
               temperature_data,
-              created_at
+              created_at,
+              soil_humidity_series,
+              lumens_series,
+              air_humidity_series,
+              temperature_series,
+              stats
             FROM express_analysis_report
             WHERE id = %s
             """,
-            (report_id,)
+            (report_id,),
+            statement_name="express_analysis_report_by_id"
         )
         if not rows:
             return None
-        return ExpressAnalysisReport(*rows[0])
+        return self._express_report_from_row(rows[0])
+
+    def get_express_analysis_report_for_user(self, report_id: int, user_id: int) -> Optional[ExpressAnalysisReport]:
+        """Rapport d'une fiche de user_id, en une requête; None s'il n'existe pas ou appartient à un autre."""
+        rows = self._db.query(
+            """
+            SELECT
+              r.id,
+              r.plant_id,
+              r.analysis_type,
+              r.soil_humidity_mean,
+              r.lumens_mean,
+              r.air_humidity_mean,
+              r.temperature_mean,
+              r.soil_humidity_data,
+              r.lumens_data,
+              r.air_humidity_data,
+              r.temperature_data,
+              r.created_at,
+              r.soil_humidity_series,
+              r.lumens_series,
+              r.air_humidity_series,
+              r.temperature_series,
+              r.stats
+            FROM express_analysis_report r
+            JOIN maintenance_sheet ms ON ms.id = r.plant_id
+            WHERE r.id = %s AND ms.user_id = %s
+            """,
+            (report_id, user_id),
+            statement_name="express_analysis_report_for_user"
+        )
+        if not rows:
+            return None
+        return self._express_report_from_row(rows[0])
+
+    @staticmethod
+    def _express_report_from_row(row) -> ExpressAnalysisReport:
+        # 12 colonnes du modèle, les 4 séries binaires puis stats
+        report = ExpressAnalysisReport(*row[:12], stats=row[16])
+        soil, lumens, air, temperature = row[12:16]
+        report.soil_humidity_data = _series_json(soil, report.soil_humidity_data)
+        report.lumens_data = _series_json(lumens, report.lumens_data)
+        report.air_humidity_data = _series_json(air, report.air_humidity_data)
+        report.temperature_data = _series_json(temperature, report.temperature_data)
+        return report
 
     def delete_express_analysis_report_by_id(self, report_id: int) -> bool:
-        result = self._db.execute(
+        rows = self._db.query(
             """
             DELETE FROM express_analysis_report
             WHERE id = %s
+            RETURNING plant_id, created_at
             """,
             (report_id,)
         )
-        return result.rowcount > 0
+        if not rows:
+            return False
+        plant_id, created_at = rows[0]
+        # Le rapport supprimé était peut-être le dernier connu de la plante
+        self.rebuild_plant_latest_state(plant_id)
+        self.refresh_plant_metric_rollups(plant_id, created_at)
+        return True
 
     def create_watering_report(
             self,
@@ -355,32 +645,98 @@ class Repository:
             soil_humidity_mean: float,
             sigma3: float,
             target_humidity: float,
-            soil_humidity_data: str | None,
-            pump_data: str | None,
+            soil_humidity_data: list | str | None,
+            pump_data: list | str | None,
+            stats: dict | None = None,
     ) -> int:
-        row = self._db.query(
-            """
-            INSERT INTO watering_report (
-                plant_id,
-                soil_humidity_mean,
-                sigma3,
-                target_humidity,
-                soil_humidity_data,
-                pump_data
-            )
-            VALUES (%s, %s, %s, %s, %s, %s)
-            RETURNING id;
+        return self.create_watering_reports([dict(
+            plant_id=plant_id,
+            soil_humidity_mean=soil_humidity_mean,
+            sigma3=sigma3,
+            target_humidity=target_humidity,
+            soil_humidity_data=soil_humidity_data,
+            pump_data=pump_data,
+            stats=stats,
+        )])[0]
+
+    def create_watering_reports(self, reports: List[dict]) -> List[int]:
+        """
+        Insère plusieurs rapports d'arrosage en un seul statement et met à jour
+        plant_latest_state dans la même transaction. Retourne les ids dans l'ordre de `reports`.
+        """
+        if not reports:
+            return []
+        rows = self._db.query_values(
+            f"""
+            WITH inserted AS (
+                INSERT INTO watering_report (
+                    plant_id,
+                    soil_humidity_mean,
+                    sigma3,
+                    target_humidity,
+                    soil_humidity_series,
+                    pump_series,
+                    stats
+                )
+                VALUES %s
+                RETURNING id, plant_id, created_at, soil_humidity_mean
+            ),
+            last_per_plant AS (
+                SELECT DISTINCT ON (i.plant_id) i.*
+                FROM inserted i
+                ORDER BY i.plant_id, i.created_at DESC, i.id DESC
+            ),
+            above_per_plant AS (
+                SELECT DISTINCT ON (i.plant_id) i.*
+                FROM inserted i
+                JOIN maintenance_sheet ms ON ms.id = i.plant_id
+                WHERE i.soil_humidity_mean > {_TARGET_HUMIDITY_SQL}
+                ORDER BY i.plant_id, i.created_at DESC, i.id DESC
+            ),
+            latest AS (
+                INSERT INTO plant_latest_state AS pls (
+                    plant_id,
+                    last_watering_id, last_watering_at, last_watering_humidity,
+                    last_watering_above_target_id, last_watering_above_target_at, last_watering_above_target_humidity
+                )
+                SELECT
+                    l.plant_id,
+                    l.id, l.created_at, l.soil_humidity_mean,
+                    a.id, a.created_at, a.soil_humidity_mean
+                FROM last_per_plant l
+                JOIN maintenance_sheet ms ON ms.id = l.plant_id
+                LEFT JOIN above_per_plant a ON a.plant_id = l.plant_id
+                ON CONFLICT (plant_id) DO UPDATE SET
+                    last_watering_id = EXCLUDED.last_watering_id,
+                    last_watering_at = EXCLUDED.last_watering_at,
+                    last_watering_humidity = EXCLUDED.last_watering_humidity,
+                    last_watering_above_target_id = COALESCE(EXCLUDED.last_watering_above_target_id, pls.last_watering_above_target_id),
+                    last_watering_above_target_at = COALESCE(EXCLUDED.last_watering_above_target_at, pls.last_watering_above_target_at),
+                    last_watering_above_target_humidity = CASE
+                        WHEN EXCLUDED.last_watering_above_target_id IS NOT NULL THEN EXCLUDED.last_watering_above_target_humidity
+                        ELSE pls.last_watering_above_target_humidity
+                    END,
+                    updated_at = now()
+                WHERE pls.last_watering_at IS NULL OR EXCLUDED.last_watering_at >= pls.last_watering_at
+            ),{_WATERING_ROLLUP_SQL}
+            SELECT id FROM inserted ORDER BY id;
             """,
-            (
-                plant_id,
-                soil_humidity_mean,
-                sigma3,
-                target_humidity,
-                soil_humidity_data,
-                pump_data,
-            )
+            [
+                (
+                    r["plant_id"],
+                    r.get("soil_humidity_mean"),
+                    r.get("sigma3"),
+                    r.get("target_humidity"),
+                    _pack_series(r.get("soil_humidity_data")),
+                    _pack_series(r.get("pump_data")),
+                    Json(r["stats"]) if r.get("stats") is not None else None,
+                )
+                for r in reports
+            ]
         )
-        return row[0][0]
+        plant_ids = {r["plant_id"] for r in reports}
+        self._db.after_commit(lambda: maintenance_schedule_cache.invalidate_plants(plant_ids))
+        return [row[0] for row in rows]
 
     def get_watering_report_by_id(self, report_id: int) -> Optional[WateringReport]:
         rows = self._db.query(
@@ -393,25 +749,72 @@ class Repository:
               target_humidity,
               soil_humidity_data,
               pump_data,
-              created_at
+              created_at,
+              soil_humidity_series,
+              pump_series,
+              stats
             FROM watering_report
             WHERE id = %s
             """,
-            (report_id,)
+            (report_id,),
+            statement_name="watering_report_by_id"
+        )
+        if not rows:
+            return None
+        return self._watering_report_from_row(rows[0])
+
+    def get_watering_report_for_user(self, report_id: int, user_id: int) -> Optional[WateringReport]:
+        """Rapport d'une fiche de user_id, en une requête; None s'il n'existe pas ou appartient à un autre."""
+        rows = self._db.query(
+            """
+            SELECT
+              r.id,
+              r.plant_id,
+              r.soil_humidity_mean,
+              r.sigma3,
+              r.target_humidity,
+              r.soil_humidity_data,
+              r.pump_data,
+              r.created_at,
+              r.soil_humidity_series,
+              r.pump_series,
+              r.stats
+            FROM watering_report r
+            JOIN maintenance_sheet ms ON ms.id = r.plant_id
+            WHERE r.id = %s AND ms.user_id = %s
+            """,
+            (report_id, user_id),
+            statement_name="watering_report_for_user"
         )
         if not rows:
             return None
-        return WateringReport(*rows[0])
+        return self._watering_report_from_row(rows[0])
+
+    @staticmethod
+    def _watering_report_from_row(row) -> WateringReport:
+        # 8 colonnes du modèle, les 2 séries binaires puis stats
+        report = WateringReport(*row[:8], stats=row[10])
+        soil, pump = row[8:10]
+        report.soil_humidity_data = _series_json(soil, report.soil_humidity_data)
+        report.pump_data = _series_json(pump, report.pump_data)
+        return report
 
     def delete_watering_report_by_id(self, report_id: int) -> bool:
-        result = self._db.execute(
+        rows = self._db.query(
             """
             DELETE FROM watering_report
             WHERE id = %s
+            RETURNING plant_id, created_at
             """,
             (report_id,)
         )
-        return result.rowcount > 0
+        if not rows:
+            return False
+        plant_id, created_at = rows[0]
+        # Le rapport supprimé était peut-être le dernier connu de la plante
+        self.rebuild_plant_latest_state(plant_id)
+        self.refresh_plant_metric_rollups(plant_id, created_at)
+        return True
 
 
 
@@ -420,53 +823,80 @@ class Repository:
         plant_id: int,
         user_id: int,
         limit: int = 20,
-        before: Optional[datetime] = None
+        before: Optional[tuple[datetime, str, int]] = None
     ) -> List[MaintenanceSummary]:
+        """
+        Résumés des rapports d'une plante, du plus récent au plus ancien, ordonnés
+        par (created_at, type, id) DESC. before est la clé (created_at, type, id)
+        de la dernière ligne de la page précédente (pagination par keyset).
+        """
         db = self._db
 
+        # Bornes par branche sur (created_at, id), seules colonnes de l'index
+        # (plant_id, created_at DESC, id DESC): à created_at égal, les 'watering'
+        # précèdent les 'express' dans l'ordre DESC sur le type.
+        # created_at <= borne (redondant avec la comparaison de lignes) permet
+        # d'écarter les partitions mensuelles postérieures au curseur.
         if before is None:
-            before = datetime.now(timezone.utc)
+            express_key = watering_key = ("infinity", _MAX_REPORT_ID)
+        else:
+            created_at, type_, id_ = before
+            express_key = (created_at, id_ if type_ == "express" else _MAX_REPORT_ID)
+            watering_key = (created_at, id_ if type_ == "watering" else 0)
 
+        # Chaque branche est triée et limitée séparément: elle lit au plus `limit`
+        # entrées de son index à partir du curseur, quelle que soit la profondeur de page
         rows = db.query(
             """
             SELECT *
             FROM (
-                SELECT
-                    ear.id,
-                    ear.plant_id,
-                    ear.created_at,
-                    'express' AS type,
-                    ear.soil_humidity_mean,
-                    ear.lumens_mean,
-                    ear.air_humidity_mean,
-                    ear.temperature_mean
-                FROM express_analysis_report ear
-                JOIN maintenance_sheet ms ON ear.plant_id = ms.id
-                WHERE ear.created_at < %s
-                    AND ear.plant_id = %s
-                    AND ms.user_id = %s
+                (
+                    SELECT
+                        ear.id,
+                        ear.plant_id,
+                        ear.created_at,
+                        'express' AS type,
+                        ear.soil_humidity_mean,
+                        ear.lumens_mean,
+                        ear.air_humidity_mean,
+                        ear.temperature_mean
+                    FROM express_analysis_report ear
+                    JOIN maintenance_sheet ms ON ear.plant_id = ms.id
+                    WHERE (ear.created_at, ear.id) < (%s, %s)
+                        AND ear.created_at <= %s
+                        AND ear.plant_id = %s
+                        AND ms.user_id = %s
+                    ORDER BY ear.created_at DESC, ear.id DESC
+                    LIMIT %s
+                )
 
                 UNION ALL
 
-                SELECT
-                    wr.id,
-                    wr.plant_id,
-                    wr.created_at,
-                    'watering' AS type,
-                    wr.soil_humidity_mean,
-                    NULL AS lumens_mean,
-                    NULL AS air_humidity_mean,
-                    NULL AS temperature_mean
-                FROM watering_report wr
-                JOIN maintenance_sheet ms ON wr.plant_id = ms.id
-                WHERE wr.created_at < %s
-                    AND wr.plant_id = %s
-                    AND ms.user_id = %s
+                (
+                    SELECT
+                        wr.id,
+                        wr.plant_id,
+                        wr.created_at,
+                        'watering' AS type,
+                        wr.soil_humidity_mean,
+                        NULL AS lumens_mean,
+                        NULL AS air_humidity_mean,
+                        NULL AS temperature_mean
+                    FROM watering_report wr
+                    JOIN maintenance_sheet ms ON wr.plant_id = ms.id
+                    WHERE (wr.created_at, wr.id) < (%s, %s)
+                        AND wr.created_at <= %s
+                        AND wr.plant_id = %s
+                        AND ms.user_id = %s
+                    ORDER BY wr.created_at DESC, wr.id DESC
+                    LIMIT %s
+                )
             ) AS merged
-            ORDER BY created_at DESC
+            ORDER BY created_at DESC, type DESC, id DESC
             LIMIT %s;
             """,
-            (before, plant_id, user_id, before, plant_id, user_id, limit)
+            (*express_key, express_key[0], plant_id, user_id, limit,
+             *watering_key, watering_key[0], plant_id, user_id, limit, limit)
         )
 
         return [MaintenanceSummary(*row) for row in rows]
@@ -554,12 +984,175 @@ class Repository:
         )
 
     def delete_maintenance_sheet_for_user(self, sheet_id: int) -> bool:
-        result = self._db.execute(
-            "DELETE FROM maintenance_sheet WHERE id = %s;",
+        rows = self._db.query(
+            "DELETE FROM maintenance_sheet WHERE id = %s RETURNING photo_id;",
             (sheet_id,)
         )
+        self._db.after_commit(lambda: maintenance_sheet_cache.invalidate(sheet_id))
+        self._db.after_commit(lambda: maintenance_schedule_cache.invalidate_plants([sheet_id]))
+        if rows and rows[0][0] is not None:
+            # la photo n'est supprimée que si plus aucune fiche ne la partage
+            self.delete_photo_if_unreferenced(rows[0][0])
+        return bool(rows)
+
+    ## Photos
+
+    def store_photo(self, content: bytes, variants: Optional[dict] = None) -> int:
+        """
+        Stocke une photo adressée par son sha256 et retourne son id. Une image
+        déjà connue n'est pas renvoyée à la base: on réutilise la ligne existante.
+        variants: {"small": ProcessedImage, ...} miniatures à enregistrer avec elle,
+        ajoutées aussi à une image déjà connue qui n'en avait pas.
+        """
+        content_hash = hashlib.sha256(content).hexdigest()
+        # FOR KEY SHARE: delete_photo_if_unreferenced attend la fin de la transaction
+        # qui réutilise la ligne avant de vérifier qu'aucune fiche ne la référence
+        rows = self._db.query(
+            "SELECT id FROM photo_blob WHERE content_hash = %s FOR KEY SHARE;", (content_hash,),
+            statement_name="photo_blob_id_by_hash"
+        )
+        if rows:
+            photo_id = rows[0][0]
+            if variants:
+                self.store_photo_variants(photo_id, variants)
+            return photo_id
+        rows = self._db.query(
+            """
+            INSERT INTO photo_blob (content_hash, content_type, byte_size, content)
+            VALUES (%s, %s, %s, %s)
+            ON CONFLICT (content_hash) DO UPDATE SET content_hash = EXCLUDED.content_hash
+            RETURNING id;
+            """,
+            (content_hash, _sniff_image_content_type(content), len(content), psycopg2.Binary(content))
+        )
+        photo_id = rows[0][0]
+        if variants:
+            self.store_photo_variants(photo_id, variants)
+        return photo_id
+
+    def store_photo_variants(self, photo_id: int, variants: dict) -> None:
+        for name, image in variants.items():
+            self._db.query(
+                """
+                INSERT INTO photo_variant (photo_id, variant, content_hash, content_type, byte_size, width, height, content)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                ON CONFLICT (photo_id, variant) DO NOTHING
+                RETURNING photo_id;
+                """,
+                (
+                    photo_id, name, hashlib.sha256(image.content).hexdigest(), image.content_type,
+                    len(image.content), image.width, image.height, psycopg2.Binary(image.content),
+                )
+            )
+
+    def delete_photo_if_unreferenced(self, photo_id: int) -> bool:
+        """
+        Supprime une photo (et ses miniatures, ON DELETE CASCADE) si aucune fiche ne la
+        référence. Le verrou attend une transaction qui réutilise la photo
+        (store_photo); la vérification suivante voit alors sa fiche.
+        """
+        locked = self._db.query("SELECT id FROM photo_blob WHERE id = %s FOR UPDATE;", (photo_id,))
+        if not locked:
+            return False
+        result = self._db.execute(
+            """
+            DELETE FROM photo_blob pb
+            WHERE pb.id = %s
+              AND NOT EXISTS (SELECT 1 FROM maintenance_sheet ms WHERE ms.photo_id = pb.id);
+            """,
+            (photo_id,)
+        )
         return result.rowcount > 0
 
+    def list_unreferenced_photo_ids(self, limit: int = 100) -> List[int]:
+        """Photos qu'aucune fiche ne référence (supprimées avant le nettoyage à la suppression)."""
+        rows = self._db.query(
+            """
+            SELECT pb.id FROM photo_blob pb
+            WHERE NOT EXISTS (SELECT 1 FROM maintenance_sheet ms WHERE ms.photo_id = pb.id)
+            ORDER BY pb.id
+            LIMIT %s;
+            """,
+            (limit,)
+        )
+        return [r[0] for r in rows]
+
+    def list_photo_ids_without_variants(self, limit: int = 100) -> List[int]:
+        rows = self._db.query(
+            """
+            SELECT pb.id
+            FROM photo_blob pb
+            WHERE NOT EXISTS (SELECT 1 FROM photo_variant pv WHERE pv.photo_id = pb.id)
+            ORDER BY pb.id
+            LIMIT %s;
+            """,
+            (limit,)
+        )
+        return [r[0] for r in rows]
+
+    def get_photo_blob(self, photo_id: int, with_content: bool = True) -> Optional[PhotoBlob]:
+        rows = self._db.query(
+            f"""
+            SELECT id, content_hash, content_type, byte_size, {"content" if with_content else "NULL"}, created_at
+            FROM photo_blob
+            WHERE id = %s;
+            """,
+            (photo_id,)
+        )
+        if not rows:
+            return None
+        r = rows[0]
+        return PhotoBlob(r[0], r[1], r[2], r[3], bytes(r[4]) if r[4] is not None else None, r[5])
+
+    def get_photo_contents(self, photo_ids: List[int]) -> dict[int, bytes]:
+        """Charge en une requête les octets de plusieurs photos: {photo_id: bytes}."""
+        ids = sorted({i for i in photo_ids if i is not None})
+        if not ids:
+            return {}
+        rows = self._db.query(
+            "SELECT id, content FROM photo_blob WHERE id = ANY(%s);", (ids,)
+        )
+        return {r[0]: bytes(r[1]) for r in rows}
+
+    def get_photo_variant(self, photo_id: int, variant: str = "original") -> Optional[PhotoVariant]:
+        """
+        Métadonnées (sans les octets) de la variante demandée d'une photo.
+        Si la miniature n'existe pas (encore), retombe sur l'original.
+        """
+        rows = self._db.query(
+            """
+            SELECT
+              pb.id,
+              COALESCE(pv.variant, 'original'),
+              COALESCE(pv.content_hash, pb.content_hash),
+              COALESCE(pv.content_type, pb.content_type),
+              COALESCE(pv.byte_size, pb.byte_size)
+            FROM photo_blob pb
+            LEFT JOIN photo_variant pv ON pv.photo_id = pb.id AND pv.variant = %s
+            WHERE pb.id = %s;
+            """,
+            (variant, photo_id),
+            statement_name="photo_variant_by_id"
+        )
+        if not rows:
+            return None
+        return PhotoVariant(*rows[0])
+
+    def read_photo_variant_content(self, photo: PhotoVariant, offset: int = 0, length: Optional[int] = None) -> bytes:
+        """Octets de la variante (ou d'une plage [offset, offset + length[)."""
+        if length is None:
+            length = photo.byte_size - offset
+        table = "photo_blob WHERE id = %s" if photo.variant == "original" \
+            else "photo_variant WHERE photo_id = %s AND variant = %s"
+        params = (photo.photo_id,) if photo.variant == "original" else (photo.photo_id, photo.variant)
+        rows = self._db.query(
+            f"SELECT substring(content FROM %s FOR %s) FROM {table};",
+            (offset + 1, length, *params)
+        )
+        if not rows:
+            return b""
+        return bytes(rows[0][0])
+
     def get_last_feeled_humidity(self, user_id: int) -> List[LastFeeledHumidity]:
         """
         Récupère pour chaque plante de l'utilisateur:
@@ -570,6 +1163,9 @@ class Repository:
         Les cibles sont calculées:
         - ideal_soil_humidity_after_watering si présent, sinon moyenne min/max
         - ideal_watering_days_frequency si présent, sinon moyenne min/max
+
+        Les derniers rapports viennent de plant_latest_state (une ligne par plante),
+        le coût ne dépend donc pas de la taille de l'historique.
         """
         rows = self._db.query(
             """
@@ -577,7 +1173,7 @@ class Repository:
                 SELECT 
                     ms.id as plant_id,
                     ms.name as plant_name,
-                    ms.photo,
+                    ms.photo_id,
                     ms.ideal_soil_humidity_after_watering,
                     ms.min_soil_humidity,
                     ms.max_soil_humidity,
@@ -608,69 +1204,11 @@ class Repository:
                     ) as target_watering_days
                 FROM maintenance_sheet ms
                 WHERE ms.user_id = %s
-            ),
-            ranked_watering_above_target AS (
-                SELECT 
-                    wr.plant_id,
-                    wr.id,
-                    wr.created_at,
-                    wr.soil_humidity_mean,
-                    pt.target_humidity,
-                    ROW_NUMBER() OVER (
-                        PARTITION BY wr.plant_id 
-                        ORDER BY wr.created_at DESC
-                    ) as rn
-                FROM watering_report wr
-                INNER JOIN plant_targets pt ON wr.plant_id = pt.plant_id
-                WHERE wr.soil_humidity_mean > pt.target_humidity
-            ),
-            ranked_express_above_target AS (
-                SELECT 
-                    ear.plant_id,
-                    ear.id,
-                    ear.created_at,
-                    ear.soil_humidity_mean,
-                    pt.target_humidity,
-                    ROW_NUMBER() OVER (
-                        PARTITION BY ear.plant_id 
-                        ORDER BY ear.created_at DESC
-                    ) as rn
-                FROM express_analysis_report ear
-                INNER JOIN plant_targets pt ON ear.plant_id = pt.plant_id
-                WHERE ear.soil_humidity_mean > pt.target_humidity
-            ),
-            ranked_watering_all AS (
-                SELECT 
-                    wr.plant_id,
-                    wr.id,
-                    wr.created_at,
-                    wr.soil_humidity_mean,
-                    ROW_NUMBER() OVER (
-                        PARTITION BY wr.plant_id 
-                        ORDER BY wr.created_at DESC
-                    ) as rn
-                FROM watering_report wr
-                INNER JOIN plant_targets pt ON wr.plant_id = pt.plant_id
-            ),
-            ranked_express_all AS (
-                SELECT 
-                    ear.plant_id,
-                    ear.id,
-                    ear.created_at,
-                    ear.soil_humidity_mean,
-                    ear.air_humidity_mean,
-                    ear.temperature_mean,
-                    ROW_NUMBER() OVER (
-                        PARTITION BY ear.plant_id 
-                        ORDER BY ear.created_at DESC
-                    ) as rn
-                FROM express_analysis_report ear
-                INNER JOIN plant_targets pt ON ear.plant_id = pt.plant_id
             )
             SELECT 
                 pt.plant_id,
                 pt.plant_name,
-                pt.photo,
+                pt.photo_id,
                 pt.ideal_soil_humidity_after_watering,
                 pt.min_soil_humidity,
                 pt.max_soil_humidity,
@@ -687,35 +1225,35 @@ class Repository:
                 pt.min_watering_days_frequency,
                 pt.max_watering_days_frequency,
                 pt.target_watering_days,
-                rwat.id as last_watering_above_target_id,
-                rwat.created_at as last_watering_above_target_date,
-                rwat.soil_humidity_mean as last_watering_above_target_humidity,
-                reat.id as last_express_above_target_id,
-                reat.created_at as last_express_above_target_date,
-                reat.soil_humidity_mean as last_express_above_target_humidity,
-                rwa.id as last_watering_id,
-                rwa.created_at as last_watering_date,
-                rwa.soil_humidity_mean as last_watering_humidity,
-                rea.id as last_express_id,
-                rea.created_at as last_express_date,
-                rea.soil_humidity_mean as last_express_soil_humidity,
-                rea.air_humidity_mean as last_express_air_humidity,
-                rea.temperature_mean as last_express_temperature
+                pls.last_watering_above_target_id,
+                pls.last_watering_above_target_at,
+                pls.last_watering_above_target_humidity,
+                pls.last_express_above_target_id,
+                pls.last_express_above_target_at,
+                pls.last_express_above_target_humidity,
+                pls.last_watering_id,
+                pls.last_watering_at,
+                pls.last_watering_humidity,
+                pls.last_express_id,
+                pls.last_express_at,
+                pls.last_express_soil_humidity,
+                pls.last_express_air_humidity,
+                pls.last_express_temperature,
+                pb.content_hash as photo_hash
             FROM plant_targets pt
-            LEFT JOIN ranked_watering_above_target rwat ON rwat.plant_id = pt.plant_id AND rwat.rn = 1
-            LEFT JOIN ranked_express_above_target reat ON reat.plant_id = pt.plant_id AND reat.rn = 1
-            LEFT JOIN ranked_watering_all rwa ON rwa.plant_id = pt.plant_id AND rwa.rn = 1
-            LEFT JOIN ranked_express_all rea ON rea.plant_id = pt.plant_id AND rea.rn = 1
+            LEFT JOIN plant_latest_state pls ON pls.plant_id = pt.plant_id
+            LEFT JOIN photo_blob pb ON pb.id = pt.photo_id
             ORDER BY pt.plant_id;
             """,
-            (user_id,)
+            (user_id,),
+            statement_name="last_feeled_humidity_by_user"
         )
         
         return [
             LastFeeledHumidity(
                 plant_id=row[0],
                 plant_name=row[1],
-                photo=row[2],
+                photo_id=row[2],
                 ideal_soil_humidity_after_watering=row[3],
                 min_soil_humidity=row[4],
                 max_soil_humidity=row[5],
@@ -745,16 +1283,111 @@ class Repository:
                 last_express_date=row[29],
                 last_express_soil_humidity=row[30],
                 last_express_air_humidity=row[31],
-                last_express_temperature=row[32]
+                last_express_temperature=row[32],
+                photo_hash=row[33]
             )
             for row in rows
         ]
 
+    def get_maintenance_schedule_version(self, user_id: int) -> str:
+        """
+        Empreinte des données du planning d'un utilisateur: ses fiches et les ids des
+        derniers rapports de plant_latest_state. Change à chaque rapport, suppression
+        de rapport, création ou suppression de fiche; lit une ligne par plante.
+        """
+        rows = self._db.query(
+            """
+            SELECT md5(COALESCE(string_agg((
+                ms.id, ms.photo_id,
+                pls.last_watering_id, pls.last_watering_above_target_id,
+                pls.last_express_id, pls.last_express_above_target_id
+            )::text, ',' ORDER BY ms.id), ''))
+            FROM maintenance_sheet ms
+            LEFT JOIN plant_latest_state pls ON pls.plant_id = ms.id
+            WHERE ms.user_id = %s
+            """,
+            (user_id,),
+            statement_name="maintenance_schedule_version"
+        )
+        return rows[0][0]
 
+    def rebuild_plant_latest_state(self, plant_id: int | None = None) -> int:
+        """
+        Recalcule plant_latest_state depuis les rapports (toutes les plantes si
+        plant_id est None). Retourne le nombre de plantes recalculées.
+        """
+        rows = self._db.query("SELECT refresh_plant_latest_state(%s);", (plant_id,))
+        if plant_id is None:
+            self._db.after_commit(maintenance_schedule_cache.clear)
+        else:
+            self._db.after_commit(lambda: maintenance_schedule_cache.invalidate_plants([plant_id]))
+        return rows[0][0]
 
+    def refresh_plant_metric_rollups(self, plant_id: int | None = None, at: datetime | None = None) -> int:
+        """
+        Recalcule les agrégats depuis les rapports bruts: les seuls buckets contenant
+        `at`, ou tout l'historique si at est None. Retourne le nombre de lignes écrites.
+        """
+        rows = self._db.query("SELECT refresh_plant_metric_rollups(%s, %s);", (plant_id, at))
+        return rows[0][0]
 
+    def list_plant_metric_rollups(
+            self,
+            plant_id: int,
+            resolution: str,
+            start: datetime,
+            end: datetime,
+    ) -> List[MetricRollup]:
+        """Agrégats d'une plante à une résolution, buckets recouvrant [start, end), par date."""
+        rows = self._db.query(
+            """
+            SELECT bucket_start, metric, sample_count, value_sum / sample_count, value_min, value_max
+            FROM plant_metric_rollup
+            WHERE plant_id = %s
+              AND resolution = %s
+              AND bucket_start >= date_trunc(%s, %s::timestamptz, 'UTC')
+              AND bucket_start < %s
+            ORDER BY bucket_start, metric
+            """,
+            (plant_id, resolution, resolution, start, end),
+            statement_name="plant_metric_rollups"
+        )
+        return [MetricRollup(*row) for row in rows]
 
+    def ensure_report_partitions(self, months_ahead: int = 3) -> int:
+        """Crée les partitions mensuelles des rapports jusqu'à months_ahead mois. Retourne le nombre créé."""
+        rows = self._db.query("SELECT ensure_report_partitions(%s);", (months_ahead,))
+        return rows[0][0]
 
+    def drop_report_partitions_older_than(self, months: int) -> int:
+        """Rétention: supprime les partitions de plus de `months` mois. Retourne le nombre supprimé."""
+        rows = self._db.query("SELECT drop_report_partitions_older_than(%s);", (months,))
+        return rows[0][0]
 
-
-
+    def pack_legacy_report_series(self, table: str, limit: int = 500) -> int:
+        """
+        Convertit un lot de rapports encore en JSON texte (*_data) vers les colonnes
+        binaires (*_series) et vide le JSON. Retourne le nombre de rapports convertis.
+        """
+        columns = _LEGACY_SERIES_COLUMNS[table]
+        data_cols = ", ".join(data for data, _ in columns)
+        pending = " OR ".join(f"({data} IS NOT NULL AND {series} IS NULL)" for data, series in columns)
+        rows = self._db.query(
+            f"SELECT id, {data_cols} FROM {table} WHERE {pending} ORDER BY id LIMIT %s",
+            (limit,)
+        )
+        if not rows:
+            return 0
+        assignments = ", ".join(
+            f"{series} = COALESCE(t.{series}, v.{series}::bytea), {data} = NULL" for data, series in columns
+        )
+        self._db.query_values(
+            f"""
+            UPDATE {table} AS t SET {assignments}
+            FROM (VALUES %s) AS v (id, {", ".join(series for _, series in columns)})
+            WHERE t.id = v.id
+            RETURNING t.id
+            """,
+            [(row[0], *(_pack_series(value) for value in row[1:])) for row in rows]
+        )
+        return len(rows)
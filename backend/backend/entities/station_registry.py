@@ -0,0 +1,45 @@
+from dataclasses import replace
+from typing import Any, Callable, Optional
+
+from entities.models import Station
+from entities.repositories import Repository
+from infrastructure.station_cache import station_cache, station_key
+from utils.ttl_cache import MISSING, TTLCache
+
+
+class StationRegistry:
+    """
+    Lectures de stations à travers station_cache, par id, adresse MAC ou code de
+    jumelage; le Repository n'est interrogé qu'en cas d'absence du cache.
+    Les écritures restent sur le Repository, qui invalide le cache.
+    Les stations retournées sont des copies: les appelants les modifient avant
+    update_station.
+    """
+
+    def __init__(self, repository: Repository, cache: TTLCache = station_cache):
+        self._repository = repository
+        self._cache = cache
+
+    def get_station_by_id(self, id_: int) -> Optional[Station]:
+        return self._get(station_key("id", id_), lambda: self._repository.get_station_by_id(id_))
+
+    def get_station_by_mac_address(self, mac_adress: str) -> Optional[Station]:
+        return self._get(station_key("mac_adress", mac_adress),
+                         lambda: self._repository.get_station_by_mac_address(mac_adress))
+
+    def get_station_by_pairing_code(self, pairing_code: str) -> Optional[Station]:
+        return self._get(station_key("pairing_code", pairing_code),
+                         lambda: self._repository.get_station_by_pairing_code(pairing_code))
+
+    @staticmethod
+    def cached_station_by_mac_address(mac_adress: str, cache: TTLCache = station_cache) -> Any:
+        """Station en cache (ou None), MISSING si la base doit être consultée."""
+        station = cache.get(station_key("mac_adress", mac_adress))
+        return replace(station) if isinstance(station, Station) else station
+
+    def _get(self, key: tuple, load: Callable[[], Optional[Station]]) -> Optional[Station]:
+        station = self._cache.get(key)
+        if station is MISSING:
+            station = load()
+            self._cache.set(key, replace(station) if station else None)
+        return replace(station) if station else None
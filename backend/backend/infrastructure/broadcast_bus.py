@@ -0,0 +1,124 @@
+# infrastructure/broadcast_bus.py
+"""
+Bus de diffusion des événements station vers les WebSockets. Avec plusieurs
+workers uvicorn ou plusieurs réplicas, le message MQTT d'une station arrive dans
+un processus alors que le WebSocket de l'utilisateur peut vivre dans un autre:
+on publie sur le bus, et chaque processus livre à ses propres sockets (WebSocketFanout).
+
+- InProcessBroadcastBus: livraison directe au fan-out local (un seul processus, défaut).
+- MqttBroadcastBus: relais par le broker Mosquitto existant, topics
+  <prefix>/station/<station_id> et <prefix>/all. Chaque processus est abonné et ne
+  livre qu'aux sockets qu'il détient; l'émetteur reçoit son propre message par le
+  même chemin.
+"""
+import logging
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+from infrastructure.websocket_fanout import WebSocketFanout, serialize_message
+from utils.mqtt_client import MQTTClient
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOPIC_PREFIX = "backend/broadcast"
+
+
+class BroadcastBus(ABC):
+    """Interface: publish() vers les sockets d'une station, publish_all() vers toutes."""
+
+    def __init__(self, fanout: WebSocketFanout):
+        self.fanout = fanout
+        self._lock = threading.Lock()
+        self.published_total = 0
+        self.received_total = 0
+
+    @abstractmethod
+    def publish(self, station_id: str, message: Any) -> None:
+        ...
+
+    @abstractmethod
+    def publish_all(self, message: Any) -> None:
+        ...
+
+    def start(self) -> "BroadcastBus":
+        return self
+
+    def stop(self) -> None:
+        pass
+
+    def _count(self, published: int = 0, received: int = 0) -> None:
+        with self._lock:
+            self.published_total += published
+            self.received_total += received
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "type": type(self).__name__,
+                "published_total": self.published_total,
+                "received_total": self.received_total,
+            }
+
+
+class InProcessBroadcastBus(BroadcastBus):
+    def publish(self, station_id: str, message: Any) -> None:
+        self._count(published=1, received=1)
+        self.fanout.publish(station_id, message)
+
+    def publish_all(self, message: Any) -> None:
+        self._count(published=1, received=1)
+        self.fanout.publish_all(message)
+
+
+class MqttBroadcastBus(BroadcastBus):
+    """
+    Relais par MQTT (QoS 0, sans retain): un événement manqué pendant une
+    reconnexion n'est pas rejoué, comme pour un socket fermé.
+    """
+
+    def __init__(self, fanout: WebSocketFanout, mqtt: MQTTClient, topic_prefix: str = DEFAULT_TOPIC_PREFIX):
+        super().__init__(fanout)
+        self._mqtt = mqtt
+        self.topic_prefix = topic_prefix.rstrip("/")
+
+    def start(self) -> "MqttBroadcastBus":
+        self._mqtt.register_callback(f"{self.topic_prefix}/#", self._on_message)
+        return self
+
+    def publish(self, station_id: str, message: Any) -> None:
+        self._count(published=1)
+        self._mqtt.publish(f"{self.topic_prefix}/station/{station_id}", serialize_message(message))
+
+    def publish_all(self, message: Any) -> None:
+        self._count(published=1)
+        self._mqtt.publish(f"{self.topic_prefix}/all", serialize_message(message))
+
+    def _on_message(self, client, userdata, msg):
+        # thread réseau paho: le fan-out ne fait que planifier sur la boucle asyncio
+        self._count(received=1)
+        text = bytes(msg.payload).decode("utf-8", errors="replace")
+        route = msg.topic[len(self.topic_prefix) + 1:]
+        if route == "all":
+            self.fanout.publish_all(text)
+        elif route.startswith("station/"):
+            station_id = route[len("station/"):]
+            # seules les stations dont ce processus détient un socket
+            if self.fanout.connection_count(station_id):
+                self.fanout.publish(station_id, text)
+        else:
+            logger.warning("Unexpected broadcast topic: %s", msg.topic)
+
+
+def broadcast_bus_from_env(fanout: WebSocketFanout, mqtt: Optional[MQTTClient]) -> BroadcastBus:
+    """BROADCAST_BUS=mqtt pour plusieurs workers/réplicas (nécessite MQTT), sinon in-process."""
+    kind = os.getenv("BROADCAST_BUS", "inprocess").lower()
+    if kind == "mqtt":
+        if mqtt is not None:
+            return MqttBroadcastBus(
+                fanout, mqtt, os.getenv("BROADCAST_TOPIC_PREFIX", DEFAULT_TOPIC_PREFIX)).start()
+        logger.warning("BROADCAST_BUS=mqtt without MQTT broker, falling back to in-process bus")
+    elif kind != "inprocess":
+        raise ValueError(f"Unknown BROADCAST_BUS: {kind}")
+    return InProcessBroadcastBus(fanout).start()
@@ -1,15 +1,62 @@
+import logging
+from typing import Callable
+
+from psycopg2.extras import execute_values
+
+from infrastructure.prepared_statements import prepared_statements
+
+logger = logging.getLogger(__name__)
+
 
 
 class Database:
-    def __init__(self, conn, commit_on_execute=True):
+    def __init__(self, conn, commit_on_execute=True, defer_after_commit=False):
+        """
+        defer_after_commit: la transaction est commitée par commit()/finish(); les
+        callbacks after_commit attendent ce commit. Sinon (commit à chaque requête,
+        ou transaction gérée ailleurs, ex. tests) ils s'exécutent tout de suite.
+        """
         self.conn = conn
         self.commit_on_execute = commit_on_execute
         self._lock = threading.Lock()
+        self._defer_after_commit = defer_after_commit and not commit_on_execute
+        self._after_commit: list[Callable[[], None]] = []
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """
+        Exécute callback une fois la transaction en cours commitée, rien en cas de
+        rollback. Sert à invalider les caches: invalidés avant le commit, une requête
+        concurrente pourrait y remettre la ligne d'avant pour tout le TTL.
+        """
+        if self._defer_after_commit:
+            self._after_commit.append(callback)
+        else:
+            callback()
+
+    def commit(self) -> None:
+        self.conn.commit()
+        self._run_after_commit()
+
+    def rollback(self) -> None:
+        self._after_commit.clear()
+        self.conn.rollback()
+
+    def _run_after_commit(self) -> None:
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                logger.exception("after_commit callback failed")
 
-    def query(self, sql, params=None):
+    def query(self, sql, params=None, statement_name: str | None = None):
+        """
+        statement_name: si fourni, la requête passe par un statement serveur
+        (PREPARE une fois par connexion, puis EXECUTE par nom).
+        """
         cur = self.conn.cursor()
         try:
-            cur.execute(sql, params or ())
+            self._execute(cur, sql, params, statement_name)
             rows = cur.fetchall()
             if self.commit_on_execute:
                 self.conn.commit()
@@ -23,14 +70,14 @@ class Database:
         finally:
             cur.close()
 
-    def query_one_dict(self, sql: str, params: tuple | None = None) -> dict | None:
+    def query_one_dict(self, sql: str, params: tuple | None = None, statement_name: str | None = None) -> dict | None:
         """
         Execute la requête et retourne la première ligne comme dict {colname: value}
         ou None si aucune ligne.
         """
         cur = self.conn.cursor()
         try:
-            cur.execute(sql, params or ())
+            self._execute(cur, sql, params, statement_name)
             row = cur.fetchone()
             if row is None:
                 return None
@@ -45,6 +92,29 @@ class Database:
         finally:
             cur.close()
 
+    def query_values(self, sql: str, argslist: list, template: str | None = None):
+        """
+        INSERT multi-lignes: `VALUES %s` est remplacé par toutes les lignes de argslist,
+        en un seul statement (une seule page), et les lignes retournées sont renvoyées.
+        """
+        if not argslist:
+            return []
+        cur = self.conn.cursor()
+        try:
+            rows = execute_values(cur, sql, argslist, template=template,
+                                  page_size=len(argslist), fetch=True)
+            if self.commit_on_execute:
+                self.conn.commit()
+            return rows
+        except Exception:
+            try:
+                self.conn.rollback()
+            except Exception:
+                pass
+            raise
+        finally:
+            cur.close()
+
     def execute(self, sql, params=None):
         with self._lock:
             with self.conn.cursor() as cur:
@@ -53,6 +123,12 @@ class Database:
                     self.conn.commit()
                 return cur
 
+    def _execute(self, cur, sql, params, statement_name):
+        if statement_name is None:
+            cur.execute(sql, params or ())
+        else:
+            prepared_statements.execute(cur, self.conn, statement_name, sql, params)
+
     def current_db_info(self):
         cur = self.conn.cursor()
         cur.execute("SELECT current_database(), inet_server_addr(), inet_server_port();")
@@ -61,6 +137,65 @@ class Database:
         return {"db": result[0], "host": result[1], "port": result[2]}
 
 
+class LazyDatabase(Database):
+    """
+    Database dont la connexion n'est empruntée qu'au premier query/execute.
+    Les requêtes qui ne touchent pas la base (health, docs, fichiers statiques...)
+    n'occupent donc aucun slot du pool. finish() commit/rollback puis rend la
+    connexion, seulement si elle a été prise.
+    """
+
+    def __init__(self, acquire, release, commit_on_execute=False):
+        self._acquire = acquire
+        self._release = release
+        self._conn = None
+        self._acquire_lock = threading.Lock()
+        super().__init__(None, commit_on_execute=commit_on_execute, defer_after_commit=True)
+
+    @property
+    def conn(self):
+        if self._conn is None:
+            with self._acquire_lock:
+                if self._conn is None:
+                    self._conn = self._acquire()
+        return self._conn
+
+    @conn.setter
+    def conn(self, value):
+        self._conn = value
+
+    @property
+    def acquired(self) -> bool:
+        return self._conn is not None
+
+    def finish(self, commit: bool) -> None:
+        conn = self._conn
+        if conn is None:
+            self._after_commit.clear()
+            return
+        committed = False
+        try:
+            if commit:
+                conn.commit()
+                committed = True
+            else:
+                conn.rollback()
+        except Exception:
+            if commit:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+                raise
+        finally:
+            self._conn = None
+            self._release(conn)
+            if committed:
+                self._run_after_commit()
+            else:
+                self._after_commit.clear()
+
+
 # infrastructure/database.py
 from contextvars import ContextVar
 from typing import Optional
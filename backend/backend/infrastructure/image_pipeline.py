@@ -0,0 +1,121 @@
+# infrastructure/image_pipeline.py
+"""
+Ingestion des photos de plantes: décodage unique, redressement EXIF, suppression
+des métadonnées, réduction à une dimension maximale et miniatures de taille fixe.
+Le travail Pillow (CPU) tourne dans un ProcessPoolExecutor: le thread de la requête
+ne fait qu'attendre le résultat, sans tenir le GIL.
+"""
+import io
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+MAX_DIMENSION = int(os.getenv("PHOTO_MAX_DIMENSION", "1600"))
+# Miniatures carrées (recadrées au centre), servies par ?variant=small|medium
+THUMBNAIL_SIZES = {"small": 160, "medium": 480}
+JPEG_QUALITY = 85
+THUMBNAIL_QUALITY = 80
+# Garde-fou contre les "decompression bombs" (~50 Mpx, au-delà des capteurs de téléphone)
+MAX_PIXELS = 50_000_000
+
+
+class InvalidPhotoError(ValueError):
+    pass
+
+
+@dataclass
+class ProcessedImage:
+    content: bytes
+    content_type: str
+    width: int
+    height: int
+
+
+@dataclass
+class ProcessedPhoto:
+    original: ProcessedImage
+    variants: dict[str, ProcessedImage] = field(default_factory=dict)
+
+
+def _to_rgb(image: Image.Image) -> Image.Image:
+    if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+        # JPEG n'a pas de canal alpha: on aplatit sur fond blanc
+        rgba = image.convert("RGBA")
+        background = Image.new("RGB", rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        return background
+    return image.convert("RGB") if image.mode != "RGB" else image
+
+
+def _encode_jpeg(image: Image.Image, quality: int) -> ProcessedImage:
+    out = io.BytesIO()
+    # Ni exif ni icc_profile passés à save(): aucune métadonnée (GPS, appareil...) n'est conservée
+    image.save(out, format="JPEG", quality=quality, optimize=True, progressive=True)
+    return ProcessedImage(out.getvalue(), "image/jpeg", image.width, image.height)
+
+
+def process_photo(content: bytes) -> ProcessedPhoto:
+    """Traitement complet d'une photo. Fonction de module: exécutée dans un process du pool."""
+    try:
+        with Image.open(io.BytesIO(content)) as source:
+            if source.width * source.height > MAX_PIXELS:
+                raise InvalidPhotoError(f"Photo too large: {source.width}x{source.height}")
+            # draft(): le décodeur JPEG réduit directement à l'échelle utile (1/2, 1/4, 1/8)
+            source.draft("RGB", (MAX_DIMENSION, MAX_DIMENSION))
+            image = ImageOps.exif_transpose(source)
+            image = _to_rgb(image)
+    except InvalidPhotoError:
+        raise
+    except Exception as e:
+        raise InvalidPhotoError(f"Unreadable photo: {e}") from e
+
+    image.thumbnail((MAX_DIMENSION, MAX_DIMENSION), Image.Resampling.LANCZOS)
+    processed = ProcessedPhoto(original=_encode_jpeg(image, JPEG_QUALITY))
+
+    for name, size in THUMBNAIL_SIZES.items():
+        thumbnail = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        processed.variants[name] = _encode_jpeg(thumbnail, THUMBNAIL_QUALITY)
+    return processed
+
+
+# Pool de process partagé, créé au premier usage
+_executor: ProcessPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                # spawn: pas de fork d'un process qui a déjà des threads (uvicorn, paho, pool DB)
+                _executor = ProcessPoolExecutor(
+                    max_workers=int(os.getenv("PHOTO_WORKERS", "2")),
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _executor
+
+
+def ingest_photo(content: bytes, timeout: float | None = None) -> ProcessedPhoto:
+    """
+    Traite la photo dans le pool de process et attend le résultat.
+    Lève InvalidPhotoError si l'image est illisible ou trop grande.
+    """
+    if timeout is None:
+        timeout = float(os.getenv("PHOTO_PROCESSING_TIMEOUT", "30"))
+    return _get_executor().submit(process_photo, content).result(timeout=timeout)
+
+
+def shutdown_image_pool() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
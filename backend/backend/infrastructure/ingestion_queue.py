@@ -0,0 +1,250 @@
+# infrastructure/ingestion_queue.py
+"""
+File d'ingestion bornée entre le thread réseau paho (loop_start) et le traitement
+des messages. Le callback MQTT ne fait que submit(): validation, base de données et
+réponses aux stations tournent dans un pool de workers. Les keepalives et la
+réception restent fluides même quand les inserts ralentissent.
+"""
+import logging
+import os
+import threading
+import time
+import zlib
+from collections import deque
+from typing import Any, Callable, Optional
+
+from utils.metrics import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+# Politiques quand la file est pleine
+DROP_NEWEST = "drop_newest"   # le message entrant est rejeté
+DROP_OLDEST = "drop_oldest"   # le plus ancien message en attente est évincé
+BLOCK = "block"               # le thread paho attend une place (au plus block_timeout), puis rejette
+OVERFLOW_POLICIES = (DROP_NEWEST, DROP_OLDEST, BLOCK)
+
+
+class IngestionQueue:
+    """
+    Exécuteur borné: submit(task) met en file une fonction sans argument, exécutée
+    par l'un des `workers` threads. Jamais bloquant pour l'appelant sauf en
+    politique BLOCK.
+    """
+
+    def __init__(self, workers: int = 4, maxsize: int = 1000, overflow_policy: str = DROP_OLDEST,
+                 block_timeout: float = 1.0, name: str = "ingest"):
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow_policy must be one of {OVERFLOW_POLICIES}")
+
+        self.name = name
+        self.maxsize = maxsize
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+
+        self._items: deque = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._threads: list[threading.Thread] = []
+        self._workers = workers
+        self._busy = 0
+
+        # métriques (protégées par _cond)
+        self.enqueued_total = 0
+        self.processed_total = 0
+        self.failed_total = 0
+        self.dropped_total = 0
+        self.max_depth = 0
+        self._wait_latency = LatencyHistogram()
+        self._process_latency = LatencyHistogram()
+
+    # ---- cycle de vie ----
+
+    def start(self) -> "IngestionQueue":
+        with self._cond:
+            if self._threads:
+                return self
+            for i in range(self._workers):
+                t = threading.Thread(target=self._run, name=f"{self.name}-{i}", daemon=True)
+                self._threads.append(t)
+                t.start()
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Laisse les workers vider la file (au plus timeout secondes) puis les arrête."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        deadline = time.monotonic() + timeout
+        for t in self._threads:
+            t.join(max(0.0, deadline - time.monotonic()))
+        with self._cond:
+            if self._items:
+                logger.warning("%s stopped with %d pending message(s)", self.name, len(self._items))
+            self._threads = []
+
+    # ---- producteur ----
+
+    def submit(self, task: Callable[[], Any]) -> bool:
+        """Retourne False si la tâche (ou une plus ancienne, en DROP_OLDEST) a été abandonnée."""
+        with self._cond:
+            if self._closed:
+                self.dropped_total += 1
+                return False
+
+            if len(self._items) >= self.maxsize:
+                if self.overflow_policy == DROP_OLDEST:
+                    self._items.popleft()
+                    self.dropped_total += 1
+                    logger.warning("%s full (%d): dropped oldest message", self.name, self.maxsize)
+                elif self.overflow_policy == BLOCK:
+                    deadline = time.monotonic() + self.block_timeout
+                    while len(self._items) >= self.maxsize and not self._closed:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._cond.wait(remaining)
+                    if len(self._items) >= self.maxsize or self._closed:
+                        self.dropped_total += 1
+                        logger.warning("%s full (%d): dropped message after %.1fs",
+                                       self.name, self.maxsize, self.block_timeout)
+                        return False
+                else:
+                    self.dropped_total += 1
+                    logger.warning("%s full (%d): dropped incoming message", self.name, self.maxsize)
+                    return False
+
+            self._items.append((time.monotonic(), task))
+            self.enqueued_total += 1
+            self.max_depth = max(self.max_depth, len(self._items))
+            self._cond.notify()
+            return True
+
+    # ---- consommateurs ----
+
+    def _next(self) -> Optional[tuple]:
+        with self._cond:
+            while not self._items and not self._closed:
+                self._cond.wait()
+            if not self._items:
+                return None
+            item = self._items.popleft()
+            self._busy += 1
+            # une place s'est libérée pour un producteur en politique BLOCK
+            self._cond.notify_all()
+            return item
+
+    def _run(self) -> None:
+        while True:
+            item = self._next()
+            if item is None:
+                return
+            enqueued_at, task = item
+            started_at = time.monotonic()
+            ok = True
+            try:
+                task()
+            except Exception:
+                ok = False
+                logger.exception("%s: task failed", self.name)
+            finished_at = time.monotonic()
+            with self._cond:
+                self._busy -= 1
+                if ok:
+                    self.processed_total += 1
+                else:
+                    self.failed_total += 1
+                self._wait_latency.observe((started_at - enqueued_at) * 1000)
+                self._process_latency.observe((finished_at - started_at) * 1000)
+
+    # ---- observabilité ----
+
+    def metrics(self) -> dict:
+        with self._cond:
+            return {
+                "depth": len(self._items),
+                "maxsize": self.maxsize,
+                "max_depth": self.max_depth,
+                "workers": len(self._threads),
+                "busy": self._busy,
+                "overflow_policy": self.overflow_policy,
+                "enqueued_total": self.enqueued_total,
+                "processed_total": self.processed_total,
+                "failed_total": self.failed_total,
+                "dropped_total": self.dropped_total,
+                "wait_latency_ms": self._wait_latency.snapshot(),
+                "process_latency_ms": self._process_latency.snapshot(),
+            }
+
+
+class ShardedIngestionQueue:
+    """
+    N voies (lanes) d'une IngestionQueue à un seul worker. Une clé (l'id de station)
+    va toujours sur la même voie: les messages d'une station sont traités dans
+    l'ordre d'arrivée, les stations différentes en parallèle.
+    """
+
+    def __init__(self, lanes: int = 8, maxsize: int = 1000, overflow_policy: str = DROP_OLDEST,
+                 block_timeout: float = 1.0, name: str = "ingest"):
+        if lanes < 1:
+            raise ValueError("lanes must be >= 1")
+        self.name = name
+        self._lanes = [
+            IngestionQueue(workers=1, maxsize=max(1, maxsize // lanes), overflow_policy=overflow_policy,
+                           block_timeout=block_timeout, name=f"{name}-lane{i}")
+            for i in range(lanes)
+        ]
+
+    def lane_for(self, key: str) -> int:
+        # crc32 plutôt que hash(): stable entre process et redémarrages
+        return zlib.crc32(key.encode()) % len(self._lanes)
+
+    def start(self) -> "ShardedIngestionQueue":
+        for lane in self._lanes:
+            lane.start()
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        deadline = time.monotonic() + timeout
+        for lane in self._lanes:
+            lane.stop(max(0.0, deadline - time.monotonic()))
+
+    def submit(self, key: str, task: Callable[[], Any]) -> bool:
+        return self._lanes[self.lane_for(key)].submit(task)
+
+    def metrics(self) -> dict:
+        lanes = [lane.metrics() for lane in self._lanes]
+        totals = {
+            key: sum(m[key] for m in lanes)
+            for key in ("depth", "maxsize", "enqueued_total", "processed_total", "failed_total", "dropped_total")
+        }
+        return {
+            **totals,
+            "lanes": [
+                {
+                    "lane": i,
+                    "depth": m["depth"],
+                    "max_depth": m["max_depth"],
+                    "busy": m["busy"],
+                    "processed_total": m["processed_total"],
+                    "dropped_total": m["dropped_total"],
+                    "wait_latency_ms": m["wait_latency_ms"],
+                    "process_latency_ms": m["process_latency_ms"],
+                }
+                for i, m in enumerate(lanes)
+            ],
+        }
+
+
+def ingestion_queue_from_env(prefix: str = "MQTT", name: str = "mqtt-ingest") -> ShardedIngestionQueue:
+    """MQTT_LANES (une voie = un worker), MQTT_QUEUE_SIZE (total), MQTT_OVERFLOW_POLICY, MQTT_BLOCK_TIMEOUT."""
+    return ShardedIngestionQueue(
+        lanes=int(os.getenv(f"{prefix}_LANES", os.getenv(f"{prefix}_WORKERS", "8"))),
+        maxsize=int(os.getenv(f"{prefix}_QUEUE_SIZE", "1000")),
+        overflow_policy=os.getenv(f"{prefix}_OVERFLOW_POLICY", DROP_OLDEST),
+        block_timeout=float(os.getenv(f"{prefix}_BLOCK_TIMEOUT", "1.0")),
+        name=name,
+    )
@@ -0,0 +1,74 @@
+# infrastructure/maintenance_schedule_cache.py
+"""
+Cache du planning d'entretien (/maintenance-schedule) par utilisateur (LRU + TTL),
+lu par GetCachedMaintenanceScheduleAction. Chaque entrée porte la version des
+données (fiches + plant_latest_state) dont elle est calculée; la version est
+relue à chaque requête, une écriture d'un autre processus est donc vue tout de
+suite. Les écritures du Repository (rapports, fiches) invalident aussi les
+entrées locales pour libérer la mémoire sans attendre le TTL.
+Le TTL d'une entrée est l'échéance du prochain changement des jours/heures
+écoulés qu'elle contient.
+"""
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Iterable
+
+from utils.ttl_cache import MISSING, TTLCache
+
+
+@dataclass(frozen=True)
+class CachedSchedule:
+    version: str
+    etag: str
+    items: list[dict[str, Any]]
+    expires_at: datetime | None
+
+
+class MaintenanceScheduleCache:
+    """
+    Entrées par user_id, plus un index plant_id -> user_id pour les invalidations
+    qui ne connaissent que la plante (rapports station).
+    """
+
+    def __init__(self, cache: TTLCache):
+        self._cache = cache
+        self._lock = threading.Lock()
+        self._owners: dict[int, int] = {}
+
+    def get(self, user_id: int) -> CachedSchedule | None:
+        entry = self._cache.get(user_id)
+        return None if entry is MISSING else entry
+
+    def set(self, user_id: int, entry: CachedSchedule, ttl: float | None = None) -> None:
+        """ttl est borné par le TTL du cache."""
+        ttl = self._cache.ttl if ttl is None else min(ttl, self._cache.ttl)
+        with self._lock:
+            for item in entry.items:
+                self._owners[item["plant_id"]] = user_id
+        self._cache.set(user_id, entry, ttl)
+
+    def invalidate_users(self, user_ids: Iterable[int]) -> None:
+        self._cache.invalidate(*[u for u in user_ids if u is not None])
+
+    def invalidate_plants(self, plant_ids: Iterable[int]) -> None:
+        with self._lock:
+            user_ids = {self._owners.pop(p, None) for p in plant_ids}
+        self.invalidate_users(user_ids)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._owners.clear()
+        self._cache.clear()
+
+    def metrics(self) -> dict:
+        with self._lock:
+            plants = len(self._owners)
+        return {**self._cache.metrics(), "plants": plants}
+
+
+maintenance_schedule_cache = MaintenanceScheduleCache(TTLCache(
+    maxsize=int(os.getenv("MAINTENANCE_SCHEDULE_CACHE_SIZE", "10000")),
+    ttl=float(os.getenv("MAINTENANCE_SCHEDULE_CACHE_TTL", "3600")),
+))
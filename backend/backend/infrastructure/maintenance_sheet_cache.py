@@ -0,0 +1,16 @@
+# infrastructure/maintenance_sheet_cache.py
+"""
+Cache des projections MaintenanceSheetOwnership par id de fiche (LRU + TTL), lu par
+MaintenanceSheetRegistry (entities/maintenance_sheet_registry.py). Le propriétaire et
+les cibles d'une fiche ne changent pas après création: le Repository invalide après
+le commit de la création et de la suppression; une suppression faite par un autre processus reste
+visible au plus TTL secondes.
+"""
+import os
+
+from utils.ttl_cache import TTLCache
+
+maintenance_sheet_cache = TTLCache(
+    maxsize=int(os.getenv("MAINTENANCE_SHEET_CACHE_SIZE", "10000")),
+    ttl=float(os.getenv("MAINTENANCE_SHEET_CACHE_TTL", "300")),
+)
@@ -1,31 +1,320 @@
-from typing import Optional
-from psycopg2.pool import SimpleConnectionPool
-from infrastructure.database import get_db
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Optional
 
-_pg_pool: Optional[SimpleConnectionPool] = None
+import psycopg2
+from psycopg2 import extensions
+from psycopg2.pool import PoolError
+from starlette.concurrency import run_in_threadpool
 
-def init_pool(minconn: int, maxconn: int, dsn: str) -> None:
+from infrastructure.database import get_db, LazyDatabase
+from infrastructure.prepared_statements import prepared_statements
+from utils.metrics import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeoutError(PoolError):
+    """Aucune connexion libérée avant l'expiration du délai d'acquisition."""
+
+
+class PoolOverflowError(PoolError):
+    """La file d'attente du pool est pleine, la demande est refusée immédiatement."""
+
+
+@dataclass
+class _ConnectionInfo:
+    created_at: float
+    last_used_at: float
+
+
+class BoundedConnectionPool:
     """
-    Initialise le pool si nécessaire. Si un pool existant est fermé, le recrée.
+    Pool de connexions psycopg2 thread-safe et borné.
+    - getconn() attend qu'une connexion se libère (au plus acquire_timeout secondes)
+      au lieu de lever PoolError dès que maxconn est atteint.
+    - La file d'attente est bornée par max_waiting (PoolOverflowError au-delà).
+    - Les connexions sont recyclées selon leur âge (max_lifetime) et leur inactivité
+      (max_idle_time); celles restées inactives plus de validate_after_idle secondes
+      sont validées par un SELECT 1 avant d'être rendues.
     """
-    global _pg_pool
-    if _pg_pool is None:
-        _pg_pool = SimpleConnectionPool(minconn, maxconn, dsn)
-        return
 
-    # Si l'objet pool existe mais a été fermé, recréer
+    def __init__(
+            self,
+            minconn: int,
+            maxconn: int,
+            dsn: str,
+            *,
+            acquire_timeout: float = 5.0,
+            max_waiting: int = 100,
+            max_lifetime: float = 1800.0,
+            max_idle_time: float = 300.0,
+            validate_after_idle: float = 30.0,
+            connect: Callable[[str], "extensions.connection"] = psycopg2.connect,
+    ):
+        if minconn < 0 or maxconn < 1 or minconn > maxconn:
+            raise ValueError("Invalid pool bounds: require 0 <= minconn <= maxconn and maxconn >= 1")
+
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.acquire_timeout = acquire_timeout
+        self.max_waiting = max_waiting
+        self.max_lifetime = max_lifetime
+        self.max_idle_time = max_idle_time
+        self.validate_after_idle = validate_after_idle
+        self._dsn = dsn
+        self._connect_fn = connect
+
+        self._cond = threading.Condition()
+        self._idle: deque = deque()          # connexions libres, la plus récente à droite
+        self._info: dict[int, _ConnectionInfo] = {}
+        self._in_use: dict[int, object] = {}
+        self._size = 0                       # connexions ouvertes + ouvertures en cours
+        self._waiting = 0
+        self.closed = False
+
+        self._acquired_total = 0
+        self._timeouts_total = 0
+        self._overflows_total = 0
+        self._recycled_total = 0
+        self._latency = LatencyHistogram()
+
+        for _ in range(minconn):
+            with self._cond:
+                self._size += 1
+            conn = self._open()
+            with self._cond:
+                self._idle.append(conn)
+
+    # Public API (compatible avec psycopg2.pool.SimpleConnectionPool)
+
+    def getconn(self, timeout: Optional[float] = None):
+        started = time.monotonic()
+        deadline = started + (self.acquire_timeout if timeout is None else timeout)
+
+        while True:
+            conn = self._checkout(deadline)
+            if conn is None:
+                # Slot réservé: ouvrir une nouvelle connexion hors du verrou
+                conn = self._open()
+                break
+            if self._is_usable(conn):
+                break
+            self._discard(conn)
+
+        with self._cond:
+            self._in_use[id(conn)] = conn
+            self._acquired_total += 1
+            self._latency.observe((time.monotonic() - started) * 1000.0)
+        return conn
+
+    def putconn(self, conn, close: bool = False) -> None:
+        with self._cond:
+            known = self._in_use.pop(id(conn), None) is not None
+            info = self._info.get(id(conn))
+
+        if not known or info is None:
+            logger.warning("Connection returned to the pool was not checked out from it, closing it")
+            _close_quietly(conn)
+            return
+
+        now = time.monotonic()
+        if close or self.closed or conn.closed or now - info.created_at > self.max_lifetime:
+            self._discard(conn, recycled=not close and not self.closed and not conn.closed)
+            return
+
+        if not self._reset(conn):
+            self._discard(conn)
+            return
+
+        with self._cond:
+            info.last_used_at = now
+            self._idle.append(conn)
+            self._cond.notify()
+
+    def closeall(self) -> None:
+        with self._cond:
+            self.closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for conn in idle:
+            self._discard(conn)
+
+    def metrics(self) -> dict:
+        with self._cond:
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": len(self._in_use),
+                "waiting": self._waiting,
+                "minconn": self.minconn,
+                "maxconn": self.maxconn,
+                "max_waiting": self.max_waiting,
+                "acquired_total": self._acquired_total,
+                "timeouts_total": self._timeouts_total,
+                "overflows_total": self._overflows_total,
+                "recycled_total": self._recycled_total,
+                "acquire_latency_ms": self._latency.snapshot(),
+            }
+
+    # Internals
+
+    def _checkout(self, deadline: float):
+        """
+        Retourne une connexion libre, ou None si un slot a été réservé pour en
+        ouvrir une nouvelle. Attend (borné) si le pool est plein.
+        """
+        expired = []
+        try:
+            with self._cond:
+                while True:
+                    if self.closed:
+                        raise PoolError("connection pool is closed")
+
+                    now = time.monotonic()
+                    expired.extend(self._pop_expired_idle_locked(now))
+
+                    if self._idle:
+                        return self._idle.pop()
+
+                    if self._size < self.maxconn:
+                        self._size += 1
+                        return None
+
+                    if self._waiting >= self.max_waiting:
+                        self._overflows_total += 1
+                        raise PoolOverflowError(
+                            f"connection pool wait queue is full ({self.max_waiting} waiting)")
+
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        self._timeouts_total += 1
+                        raise PoolTimeoutError(
+                            f"no connection available after {self.acquire_timeout:.1f}s "
+                            f"(maxconn={self.maxconn})")
+
+                    self._waiting += 1
+                    try:
+                        self._cond.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+        finally:
+            for conn in expired:
+                _close_quietly(conn)
+
+    def _pop_expired_idle_locked(self, now: float) -> list:
+        """
+        Retire les connexions trop vieilles ou inactives depuis trop longtemps (les
+        plus anciennes sont à gauche). Leur slot est libéré immédiatement, il ne
+        reste qu'à les fermer hors du verrou.
+        """
+        expired = []
+        keep = deque()
+        while self._idle:
+            conn = self._idle.popleft()
+            info = self._info.get(id(conn))
+            too_old = info is None or now - info.created_at > self.max_lifetime
+            too_idle = info is not None and now - info.last_used_at > self.max_idle_time
+            if too_old or (too_idle and self._size > self.minconn):
+                expired.append(conn)
+                if self._info.pop(id(conn), None) is not None:
+                    self._size -= 1
+                self._recycled_total += 1
+            else:
+                keep.append(conn)
+        self._idle = keep
+        return expired
+
+    def _open(self):
+        try:
+            conn = self._connect_fn(self._dsn)
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        now = time.monotonic()
+        with self._cond:
+            self._info[id(conn)] = _ConnectionInfo(created_at=now, last_used_at=now)
+        return conn
+
+    def _discard(self, conn, recycled: bool = False) -> None:
+        _close_quietly(conn)
+        with self._cond:
+            if self._info.pop(id(conn), None) is not None:
+                self._size -= 1
+            if recycled:
+                self._recycled_total += 1
+            self._cond.notify()
+
+    def _is_usable(self, conn) -> bool:
+        if conn.closed:
+            return False
+        if conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+            return False
+
+        info = self._info.get(id(conn))
+        if info is None or time.monotonic() - info.last_used_at <= self.validate_after_idle:
+            return True
+
+        # Connexion restée longtemps inactive: un aller-retour léger pour détecter un socket mort
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1;")
+            conn.rollback()
+            return True
+        except Exception:
+            logger.info("Discarding stale pooled connection")
+            return False
+
+    @staticmethod
+    def _reset(conn) -> bool:
+        try:
+            status = conn.get_transaction_status()
+            if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+                return False
+            if status != extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+            return True
+        except Exception:
+            return False
+
+
+def _close_quietly(conn) -> None:
+    # Les statements préparés meurent avec la connexion
+    prepared_statements.forget(conn)
     try:
-        if getattr(_pg_pool, "closed", False):
-            _pg_pool = SimpleConnectionPool(minconn, maxconn, dsn)
+        conn.close()
     except Exception:
-        # En cas d'API différente ou d'erreur, recréer le pool
-        _pg_pool = SimpleConnectionPool(minconn, maxconn, dsn)
+        pass
+
 
-def get_pool() -> SimpleConnectionPool:
+_pg_pool: Optional[BoundedConnectionPool] = None
+
+def init_pool(minconn: int, maxconn: int, dsn: str, **options) -> None:
+    """
+    Initialise le pool si nécessaire. Si un pool existant est fermé, le recrée.
+    Les options (acquire_timeout, max_waiting, max_lifetime, max_idle_time,
+    validate_after_idle) sont transmises à BoundedConnectionPool.
+    """
+    global _pg_pool
+    if _pg_pool is None or _pg_pool.closed:
+        _pg_pool = BoundedConnectionPool(minconn, maxconn, dsn, **options)
+
+def get_pool() -> BoundedConnectionPool:
     if _pg_pool is None:
         raise RuntimeError("Connection pool non initialisé. Appeler init_pool(...) au startup.")
     return _pg_pool
 
+def get_pool_metrics() -> Optional[dict]:
+    if _pg_pool is None:
+        return None
+    return _pg_pool.metrics()
+
 def close_pool() -> None:
     """
     Ferme le pool et met la référence globale à None pour permettre une réinitialisation.
@@ -43,9 +332,8 @@ def obtain_connection_from_pool():
     Retourne (conn, from_pool_flag).
     from_pool_flag == True  => il faut appeler release_connection(conn, True)
     from_pool_flag == False => connexion fournie par la fixture/tests (ne pas putconn ni close)
+    Lève PoolTimeoutError / PoolOverflowError si le pool reste saturé.
     """
-
-
     db = get_db()
     if db is not None:
         return db.conn, False
@@ -54,6 +342,14 @@ def obtain_connection_from_pool():
 
     raise RuntimeError("No pool and no test db available; init_pool(...) must be called.")
 
+def create_lazy_database() -> LazyDatabase:
+    """
+    Database dont la connexion ne sera empruntée au pool qu'au premier accès.
+    Lève RuntimeError si le pool n'est pas initialisé.
+    """
+    pool = get_pool()
+    return LazyDatabase(acquire=pool.getconn, release=pool.putconn, commit_on_execute=False)
+
 def release_connection(conn, from_pool: bool):
     if from_pool:
         try:
@@ -65,4 +361,13 @@ def release_connection(conn, from_pool: bool):
                 pass
     else:
         # connexion fournie par tests_database : ne rien faire
-        return
\ No newline at end of file
+        return
+
+
+async def obtain_connection_async():
+    """obtain_connection_from_pool() sans bloquer la boucle quand le pool est saturé."""
+    return await run_in_threadpool(obtain_connection_from_pool)
+
+async def release_connection_async(conn, from_pool: bool) -> None:
+    # putconn peut faire un rollback (aller-retour réseau)
+    await run_in_threadpool(release_connection, conn, from_pool)
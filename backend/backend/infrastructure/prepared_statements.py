@@ -0,0 +1,89 @@
+# infrastructure/prepared_statements.py
+import re
+import threading
+import weakref
+from functools import lru_cache
+
+import psycopg2.errors
+
+_PLACEHOLDER = re.compile(r"%(s|%)")
+_NAME = re.compile(r"^[a-z_][a-z0-9_]*$")
+
+
+@lru_cache(maxsize=256)
+def to_server_side_sql(sql: str) -> tuple[str, int]:
+    """
+    Convertit les placeholders psycopg2 (%s) en paramètres Postgres ($1, $2...).
+    Retourne (sql, nombre de paramètres).
+    """
+    count = 0
+
+    def _replace(match):
+        nonlocal count
+        if match.group(1) == "%":
+            return "%"
+        count += 1
+        return f"${count}"
+
+    return _PLACEHOLDER.sub(_replace, sql.strip().rstrip(";")), count
+
+
+class PreparedStatementRegistry:
+    """
+    Statements serveur (PREPARE) déjà créés, par connexion.
+    Les connexions sont référencées faiblement: une connexion recyclée par le
+    pool (ou simplement collectée) emporte son registre avec elle.
+    """
+
+    def __init__(self):
+        self._prepared: "weakref.WeakKeyDictionary[object, set[str]]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.prepares_total = 0
+        self.executions_total = 0
+
+    def is_prepared(self, conn, name: str) -> bool:
+        with self._lock:
+            return name in self._prepared.get(conn, ())
+
+    def mark_prepared(self, conn, name: str) -> None:
+        with self._lock:
+            self._prepared.setdefault(conn, set()).add(name)
+            self.prepares_total += 1
+
+    def forget(self, conn) -> None:
+        with self._lock:
+            self._prepared.pop(conn, None)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "connections": len(self._prepared),
+                "prepares_total": self.prepares_total,
+                "executions_total": self.executions_total,
+            }
+
+    def execute(self, cur, conn, name: str, sql: str, params) -> None:
+        """
+        Exécute sql sur cur via le statement nommé name, en le préparant au
+        premier usage sur cette connexion.
+        """
+        if not _NAME.match(name):
+            raise ValueError(f"Invalid prepared statement name: {name}")
+
+        server_sql, count = to_server_side_sql(sql)
+        if not self.is_prepared(conn, name):
+            cur.execute(f"PREPARE {name} AS {server_sql}")
+            self.mark_prepared(conn, name)
+
+        args = ", ".join(["%s"] * count)
+        try:
+            cur.execute(f"EXECUTE {name} ({args})" if count else f"EXECUTE {name}", tuple(params or ()))
+        except psycopg2.errors.InvalidSqlStatementName:
+            # Statement perdu côté serveur (DISCARD/DEALLOCATE): il sera re-préparé au prochain appel
+            self.forget(conn)
+            raise
+        with self._lock:
+            self.executions_total += 1
+
+
+prepared_statements = PreparedStatementRegistry()
@@ -0,0 +1,192 @@
+# infrastructure/report_batch_writer.py
+"""
+Micro-batching des rapports station. Les rapports qui arrivent dans une petite
+fenêtre (max_delay) sont insérés par un seul INSERT multi-lignes par type, dans une
+seule transaction: un commit (un fsync) au lieu d'un par message quand des
+centaines de stations rapportent en même temps. Chaque submit_* retourne un
+Future qui reçoit l'id du rapport pour la réponse present_report.
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable
+
+from entities.repositories import Repository
+from infrastructure.database import Database
+from utils.metrics import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+EXPRESS = "express"
+WATERING = "watering"
+
+# Type de rapport -> méthode batch du Repository
+_BATCH_INSERTS: dict[str, Callable[[Repository, list[dict]], list[int]]] = {
+    EXPRESS: Repository.create_express_analysis_reports,
+    WATERING: Repository.create_watering_reports,
+}
+
+# Tailles de lot observées (même histogramme que les latences, en nombre de lignes)
+BATCH_SIZE_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+class ReportBatchWriter:
+    """
+    transaction: fonction qui exécute callback(db) dans une transaction et la commit
+    (with_db_connection en production).
+    """
+
+    def __init__(self, transaction: Callable[[Callable[[Database], Any]], Any],
+                 max_batch: int = 100, max_delay: float = 0.02, name: str = "report-batch"):
+        if max_batch < 1:
+            raise ValueError("max_batch must be >= 1")
+        self._transaction = transaction
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.name = name
+
+        self._pending: list[tuple[str, dict, Future]] = []
+        self._first_at: float | None = None
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread: threading.Thread | None = None
+
+        # métriques (protégées par _cond)
+        self.batches_total = 0
+        self.rows_total = 0
+        self.failed_batches_total = 0
+        self.failed_rows_total = 0
+        self._batch_sizes = LatencyHistogram(BATCH_SIZE_BUCKETS)
+        self._flush_latency = LatencyHistogram()
+
+    # ---- cycle de vie ----
+
+    def start(self) -> "ReportBatchWriter":
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Écrit les rapports en attente puis arrête le thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    # ---- producteurs ----
+
+    def submit_express_analysis(self, report: dict) -> Future:
+        return self._submit(EXPRESS, report)
+
+    def submit_watering(self, report: dict) -> Future:
+        return self._submit(WATERING, report)
+
+    def _submit(self, kind: str, report: dict) -> Future:
+        future: Future = Future()
+        with self._cond:
+            if self._closed:
+                future.set_exception(RuntimeError(f"{self.name} is stopped"))
+                return future
+            if not self._pending:
+                self._first_at = time.monotonic()
+            self._pending.append((kind, report, future))
+            if len(self._pending) >= self.max_batch or len(self._pending) == 1:
+                self._cond.notify()
+        return future
+
+    # ---- écriture ----
+
+    def _take_batch(self) -> list[tuple[str, dict, Future]] | None:
+        with self._cond:
+            while True:
+                if self._pending:
+                    waited = time.monotonic() - self._first_at
+                    if len(self._pending) >= self.max_batch or waited >= self.max_delay or self._closed:
+                        batch = self._pending[:self.max_batch]
+                        self._pending = self._pending[self.max_batch:]
+                        self._first_at = time.monotonic() if self._pending else None
+                        return batch
+                    self._cond.wait(self.max_delay - waited)
+                elif self._closed:
+                    return None
+                else:
+                    self._cond.wait()
+
+    def _run(self) -> None:
+        while True:
+            batch = self._take_batch()
+            if batch is None:
+                return
+            self.flush(batch)
+
+    def flush(self, batch: list[tuple[str, dict, Future]]) -> None:
+        started_at = time.monotonic()
+        by_kind: dict[str, list[tuple[dict, Future]]] = {}
+        for kind, report, future in batch:
+            by_kind.setdefault(kind, []).append((report, future))
+
+        def _insert_all(db: Database) -> dict[str, list[int]]:
+            repo = Repository(db)
+            return {kind: _BATCH_INSERTS[kind](repo, [r for r, _ in items]) for kind, items in by_kind.items()}
+
+        try:
+            ids_by_kind = self._transaction(_insert_all)
+        except Exception:
+            # Une ligne invalide (plante supprimée, contrainte...) fait échouer tout le lot:
+            # on rejoue ligne par ligne pour n'échouer que celle-là
+            logger.exception("%s: batch of %d report(s) failed, retrying one by one", self.name, len(batch))
+            with self._cond:
+                self.failed_batches_total += 1
+            self._flush_one_by_one(batch)
+        else:
+            for kind, items in by_kind.items():
+                for (_, future), report_id in zip(items, ids_by_kind[kind]):
+                    future.set_result(report_id)
+
+        with self._cond:
+            self.batches_total += 1
+            self.rows_total += len(batch)
+            self._batch_sizes.observe(len(batch))
+            self._flush_latency.observe((time.monotonic() - started_at) * 1000)
+
+    def _flush_one_by_one(self, batch: list[tuple[str, dict, Future]]) -> None:
+        for kind, report, future in batch:
+            try:
+                report_id = self._transaction(lambda db: _BATCH_INSERTS[kind](Repository(db), [report])[0])
+            except Exception as e:
+                with self._cond:
+                    self.failed_rows_total += 1
+                future.set_exception(e)
+            else:
+                future.set_result(report_id)
+
+    # ---- observabilité ----
+
+    def metrics(self) -> dict:
+        with self._cond:
+            return {
+                "pending": len(self._pending),
+                "max_batch": self.max_batch,
+                "max_delay_ms": self.max_delay * 1000,
+                "batches_total": self.batches_total,
+                "rows_total": self.rows_total,
+                "failed_batches_total": self.failed_batches_total,
+                "failed_rows_total": self.failed_rows_total,
+                "batch_size": self._batch_sizes.snapshot(),
+                "flush_latency_ms": self._flush_latency.snapshot(),
+            }
+
+
+def report_batch_writer_from_env(transaction: Callable[[Callable[[Database], Any]], Any]) -> ReportBatchWriter:
+    """REPORT_BATCH_MAX_SIZE, REPORT_BATCH_MAX_DELAY_MS."""
+    return ReportBatchWriter(
+        transaction,
+        max_batch=int(os.getenv("REPORT_BATCH_MAX_SIZE", "100")),
+        max_delay=float(os.getenv("REPORT_BATCH_MAX_DELAY_MS", "20")) / 1000,
+    )
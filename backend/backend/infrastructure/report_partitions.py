@@ -0,0 +1,29 @@
+# infrastructure/report_partitions.py
+"""
+Maintenance des partitions mensuelles de express_analysis_report / watering_report
+(cf. database/init/11-report-partitions.sql): création des mois à venir et,
+si REPORT_RETENTION_MONTHS est défini, suppression des mois expirés.
+"""
+import logging
+import os
+from typing import Optional
+
+from entities.repositories import Repository
+from infrastructure.database import Database
+
+logger = logging.getLogger(__name__)
+
+MONTHS_AHEAD = int(os.getenv("REPORT_PARTITIONS_MONTHS_AHEAD", "3"))
+# Vide: historique conservé sans limite
+RETENTION_MONTHS: Optional[int] = int(os.environ["REPORT_RETENTION_MONTHS"]) if os.getenv("REPORT_RETENTION_MONTHS") else None
+MAINTENANCE_INTERVAL = float(os.getenv("REPORT_PARTITION_MAINTENANCE_INTERVAL", "86400"))
+
+
+def maintain_report_partitions(db: Database, months_ahead: int = MONTHS_AHEAD,
+                               retention_months: Optional[int] = RETENTION_MONTHS) -> dict:
+    repository = Repository(db)
+    created = repository.ensure_report_partitions(months_ahead)
+    dropped = repository.drop_report_partitions_older_than(retention_months) if retention_months is not None else 0
+    if created or dropped:
+        logger.info("report partitions: %d created, %d dropped", created, dropped)
+    return {"created": created, "dropped": dropped}
@@ -0,0 +1,110 @@
+# infrastructure/station_cache.py
+"""
+Cache des stations (LRU + TTL) par id, adresse MAC et code de jumelage, lu par
+StationRegistry (entities/station_registry.py). Une absence (None) est aussi mise
+en cache. Les écritures du Repository sur station invalident les clés touchées
+(avant et après modification) une fois la transaction commitée
+(Database.after_commit); les écritures des autres processus sont
+invalidées par StationCacheListener (LISTEN station_changed) quand il tourne,
+sinon le TTL borne l'écart.
+"""
+import json
+import logging
+import os
+import select
+import threading
+from typing import Any, Iterable, Optional
+
+import psycopg2
+
+from utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+STATION_CHANGED_CHANNEL = "station_changed"
+
+station_cache = TTLCache(
+    maxsize=int(os.getenv("STATION_CACHE_SIZE", "10000")),
+    ttl=float(os.getenv("STATION_CACHE_TTL", "60")),
+)
+
+
+def station_key(kind: str, value: Any) -> tuple:
+    """kind: 'id', 'mac_adress' ou 'pairing_code'."""
+    return kind, value
+
+
+def invalidate_stations(ids: Iterable = (), mac_adresses: Iterable = (), pairing_codes: Iterable = ()) -> None:
+    keys = [station_key("id", v) for v in ids if v is not None]
+    keys += [station_key("mac_adress", v) for v in mac_adresses if v is not None]
+    keys += [station_key("pairing_code", v) for v in pairing_codes if v is not None]
+    station_cache.invalidate(*keys)
+
+
+class StationCacheListener:
+    """
+    Thread qui écoute les notifications du trigger station_changed
+    (database/init/13-station-registry.sql) sur une connexion dédiée, hors pool,
+    et invalide les clés reçues. Après une coupure, le cache est vidé: des
+    notifications ont pu être manquées.
+    """
+
+    def __init__(self, dsn: str, reconnect_delay: float = 5.0, poll_timeout: float = 1.0):
+        self._dsn = dsn
+        self._reconnect_delay = reconnect_delay
+        self._poll_timeout = poll_timeout
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.received_total = 0
+        self.reconnects_total = 0
+
+    def start(self) -> "StationCacheListener":
+        self._thread = threading.Thread(target=self._run, name="station-cache-listener", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = psycopg2.connect(self._dsn)
+                conn.autocommit = True
+                with conn.cursor() as cur:
+                    cur.execute(f"LISTEN {STATION_CHANGED_CHANNEL};")
+                # les changements pendant la coupure sont inconnus
+                station_cache.clear()
+                self._listen(conn)
+            except Exception:
+                logger.exception("Station cache listener failed, reconnecting")
+                self.reconnects_total += 1
+                self._stop.wait(self._reconnect_delay)
+            finally:
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+
+    def _listen(self, conn) -> None:
+        while not self._stop.is_set():
+            if select.select([conn], [], [], self._poll_timeout) == ([], [], []):
+                continue
+            conn.poll()
+            while conn.notifies:
+                notify = conn.notifies.pop(0)
+                self.received_total += 1
+                self.handle(notify.payload)
+
+    @staticmethod
+    def handle(payload: str) -> None:
+        try:
+            keys = json.loads(payload)
+        except ValueError:
+            logger.warning("Invalid %s payload: %s", STATION_CHANGED_CHANNEL, payload)
+            return
+        invalidate_stations(keys.get("id", ()), keys.get("mac_adress", ()), keys.get("pairing_code", ()))
@@ -1,12 +1,19 @@
 import json
 import logging
+import os
+
+from functools import partial
 
 from infrastructure.database import Database
+from infrastructure.ingestion_queue import ShardedIngestionQueue
 from infrastructure.pgpool import obtain_connection_from_pool, \
     release_connection
-from usecases.ManageReports.ExpressAnalysis.CreateExpressAnalysisRepport.Handler import handle_express_analysis
+from infrastructure.report_batch_writer import ReportBatchWriter
+from infrastructure.broadcast_bus import BroadcastBus
+from usecases.ManageReports.ExpressAnalysis.CreateExpressAnalysisRepport.Handler import handle_express_analysis, \
+    build_express_analysis_report
 from usecases.ManageReports.Watering.CreateWateringReport.Handler import \
-    handle_watering_analysis
+    handle_watering_analysis, build_watering_report
 from usecases.ManageStations.PairStationToUser.Handler import pair_station_to_user
 from utils.logging_config import setup_logging
 from pydash import get
@@ -16,6 +23,9 @@ from typing import Callable, Any
 
 
 
+# Attente max (s) du commit d'un rapport par la voie de la station
+REPORT_WRITE_TIMEOUT = float(os.getenv("REPORT_WRITE_TIMEOUT", "10"))
+
 # Logging
 setup_logging()
 logger = logging.getLogger(__name__)
@@ -28,55 +38,67 @@ def parse_json_dict(payload_str: str) -> Optional[dict]:
         return None
 
 
-def station_listener(active_by_station, _main_loop, _safe_task):
+def station_listener(broadcast: BroadcastBus, ingestion: Optional[ShardedIngestionQueue] = None,
+                     report_writer: Optional[ReportBatchWriter] = None):
+    """
+    Callback paho pour l'abonnement partagé $share/<groupe>/stations/#: un seul réplica
+    traite chaque message. Avec une file d'ingestion, le thread réseau paho ne
+    fait que copier topic/payload et les mettre en file; validation, base de données
+    et réponses tournent dans les workers de la file. Sans file: traitement inline.
+    La file est découpée en voies par station: ordre garanti pour une station,
+    stations différentes en parallèle.
+    Avec un ReportBatchWriter, les rapports sont insérés par lots (un commit par lot).
+    Les réponses (present_report) passent par le bus de diffusion, qui route vers le
+    processus détenant le socket. Les messages bruts des stations sont relayés aux
+    WebSockets par les abonnements de notification (station_notifications.py).
+    """
 
     def handle_cmd(client, userdata, msg):
-        station_id = extract_station_id(msg)
-        payload_str = extract_payload_string(msg)
-        
+        # paho réutilise msg: on copie ce dont le worker a besoin
+        topic = msg.topic
+        payload = bytes(msg.payload) if msg.payload is not None else b""
+        if ingestion is None:
+            process_message(topic, payload)
+            return
+        # sans id de station (topic inattendu), le topic sert de clé de voie
+        lane_key = extract_station_id(topic) or topic
+        if not ingestion.submit(lane_key, partial(process_message, topic, payload)):
+            logger.warning("MQTT ingestion queue full, message dropped: topic=%s", topic)
+
+    def process_message(topic: str, payload: bytes):
+        station_id = extract_station_id(topic)
+        payload_str = extract_payload_string(payload)
+
         message: Optional[dict] = parse_json_dict(payload_str)
         if message is None:
             logger.warning("Non-JSON message received: %s", payload_str)
             return
 
-        logger.info("📥 MQTT message: topic=%s type=%s", msg.topic, message.get('type', 'unknown'))
+        logger.info("📥 MQTT message: topic=%s type=%s", topic, message.get('type', 'unknown'))
 
         if is_message_is_compute_express_analysis(message):
             try:
                 data = get(message, "data")
-                report_id = with_db_connection(
-                    lambda db: handle_express_analysis(data, db))
-
-                payload = {
-                    "type": "command",
-                    "activity": "express_analysis",
-                    "action": "present_report",
-                    "data": {"report_id": report_id}
-                }
-                send_message_to_station(
-                    station_id,
-                    json.dumps(payload, separators=(",", ":"),
-                                     ensure_ascii=False))
+                if report_writer is None:
+                    report_id = with_db_connection(
+                        lambda db: handle_express_analysis(data, db))
+                    send_present_report(station_id, "express_analysis", report_id)
+                else:
+                    submit_report(station_id, "express_analysis", data,
+                                  build_express_analysis_report, report_writer.submit_express_analysis)
             except Exception:
                 logger.exception("Failed processing message")
 
         elif is_message_is_compute_watering(message):
             try:
                 data = get(message, "data")
-                report_id = with_db_connection(
-                    lambda db: handle_watering_analysis(data, db))
-
-                # @TODO (PLM) factorise this
-                payload = {
-                    "type": "command",
-                    "activity": "watering",
-                    "action": "present_report",
-                    "data": {"report_id": report_id}
-                }
-                send_message_to_station(
-                    station_id,
-                    json.dumps(payload, separators=(",", ":"),
-                                     ensure_ascii=False))
+                if report_writer is None:
+                    report_id = with_db_connection(
+                        lambda db: handle_watering_analysis(data, db))
+                    send_present_report(station_id, "watering", report_id)
+                else:
+                    submit_report(station_id, "watering", data,
+                                  build_watering_report, report_writer.submit_watering)
             except Exception:
                 logger.exception("Failed processing message")
         elif is_message_is_start_pair_user(message):
@@ -91,18 +113,36 @@ def station_listener(active_by_station, _main_loop, _safe_task):
             except Exception:
                 logger.exception("Failed processing message")
 
-
-
-        if _main_loop is None:
-            logger.warning("Main loop not set, dropping MQTT message")
+    def submit_report(station_id, activity, data, build, submit):
+        # La voie de la station attend le commit du lot avant son message suivant:
+        # present_report part avant tout message ultérieur de la même station.
+        # Le lot regroupe les rapports arrivés en même temps sur les autres voies.
+        try:
+            report = build(data)
+        except ValueError as e:
+            logger.info("Erreur de validation: %s", e)
+            # comme les handlers: la station reçoit toujours une réponse (report_id null)
+            send_present_report(station_id, activity, None)
             return
 
-        text = json.dumps(message)
-        if station_id:
-            send_message_to_station(station_id, text)
-        else:
-            for station_id in list(active_by_station.keys()):
-                send_message_to_station(station_id, text)
+        try:
+            report_id = submit(report).result(timeout=REPORT_WRITE_TIMEOUT)
+        except Exception:
+            logger.exception("Failed writing %s report", activity)
+            report_id = None
+        send_present_report(station_id, activity, report_id)
+
+    def send_present_report(station_id, activity, report_id):
+        payload = {
+            "type": "command",
+            "activity": activity,
+            "action": "present_report",
+            "data": {"report_id": report_id}
+        }
+        send_message_to_station(
+            station_id,
+            json.dumps(payload, separators=(",", ":"),
+                       ensure_ascii=False))
 
     def is_message_is_compute_express_analysis(message):
         return (get(message, "type") == "command"
@@ -120,29 +160,18 @@ def station_listener(active_by_station, _main_loop, _safe_task):
                 and get(message, "action") == "register_code")
 
     def send_message_to_station(station_id, text):
-        async def _notify_station(st_id: str, text_to_send: str):
-            for ws in list(active_by_station.get(st_id, set())):
-                try:
-                    await ws.send_text(text_to_send)
-                except Exception:
-                    try:
-                        active_by_station[st_id].discard(ws)
-                    except Exception:
-                        pass
-                    logger.info("Removed closed websocket for station %s", st_id)
-        _main_loop.call_soon_threadsafe(_safe_task,
-                                        _notify_station(station_id, text))
-
-    def extract_payload_string(msg):
+        broadcast.publish(station_id, text)
+
+    def extract_payload_string(payload: bytes):
         try:
-            payload = msg.payload.decode()
+            payload_str = payload.decode()
         except Exception:
-            payload = str(msg.payload)
-        return payload
+            payload_str = str(payload)
+        return payload_str
 
-    def extract_station_id(msg):
+    def extract_station_id(topic: str):
         station_id = None
-        parts = msg.topic.split("/")
+        parts = topic.split("/")
         if len(parts) >= 2 and parts[0] in ("station", "stations"):
             station_id = parts[1]
         return station_id
@@ -152,22 +181,23 @@ def station_listener(active_by_station, _main_loop, _safe_task):
 
 def with_db_connection(callback: Callable[[Database], Any]) -> Any:
     conn, from_pool = obtain_connection_from_pool()
-    db = Database(conn, commit_on_execute=False)
+    # connexion de test (from_pool False): pas de commit ici, les caches sont invalidés tout de suite
+    db = Database(conn, commit_on_execute=False, defer_after_commit=from_pool)
     try:
         result = callback(db)
         if from_pool:
             try:
-                conn.commit()
+                db.commit()
             except Exception:
                 try:
-                    conn.rollback()
+                    db.rollback()
                 except Exception:
                     pass
                 raise
         return result
     except Exception:
         try:
-            conn.rollback()
+            db.rollback()
         except Exception:
             pass
         raise
@@ -0,0 +1,85 @@
+# infrastructure/station_notifications.py
+"""
+Abonnements MQTT de notification, limités aux stations ayant un WebSocket ouvert
+dans ce processus. Le traitement des commandes passe par l'abonnement partagé
+$share/<groupe>/stations/# (un seul réplica traite chaque message); ici chaque
+processus relaie seulement les messages bruts des stations qu'il sert à ses
+propres sockets.
+
+Connexion MQTT distincte de celle du traitement: paho (MQTT 3.1.1) ne sait pas par
+quel abonnement un message est arrivé, un message de notification déclencherait
+sinon aussi le callback de traitement.
+"""
+import logging
+import threading
+from typing import Optional
+
+from infrastructure.websocket_fanout import WebSocketFanout
+from utils.mqtt_client import MQTTClient
+
+logger = logging.getLogger(__name__)
+
+
+class StationNotificationSubscriptions:
+    """
+    acquire(station_id) à l'ouverture d'un socket, release(station_id) à sa fermeture:
+    stations/<station_id>/# est souscrit au premier socket et désabonné au dernier.
+    """
+
+    def __init__(self, mqtt: MQTTClient, fanout: WebSocketFanout):
+        self._mqtt = mqtt
+        self._fanout = fanout
+        self._lock = threading.Lock()
+        self._refs: dict[str, int] = {}
+        self.forwarded_total = 0
+        self.skipped_total = 0
+
+    @staticmethod
+    def topic_for(station_id: str) -> str:
+        return f"stations/{station_id}/#"
+
+    def acquire(self, station_id: str) -> None:
+        with self._lock:
+            count = self._refs.get(station_id, 0)
+            self._refs[station_id] = count + 1
+            if count:
+                return
+            self._mqtt.register_callback(self.topic_for(station_id), self._on_message)
+        logger.info("Subscribed notifications for station %s", station_id)
+
+    def release(self, station_id: str) -> None:
+        with self._lock:
+            count = self._refs.get(station_id, 0)
+            if count > 1:
+                self._refs[station_id] = count - 1
+                return
+            self._refs.pop(station_id, None)
+            if not count:
+                return
+            self._mqtt.unregister_callback(self.topic_for(station_id))
+        logger.info("Unsubscribed notifications for station %s", station_id)
+
+    def _on_message(self, client, userdata, msg):
+        station_id = _station_id(msg.topic)
+        text = bytes(msg.payload).decode("utf-8", errors="replace") if msg.payload is not None else ""
+        # comme avant: seuls les messages JSON sont relayés aux sockets
+        if station_id is None or not text.lstrip().startswith("{"):
+            with self._lock:
+                self.skipped_total += 1
+            return
+        with self._lock:
+            self.forwarded_total += 1
+        self._fanout.publish(station_id, text)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "stations": len(self._refs),
+                "forwarded_total": self.forwarded_total,
+                "skipped_total": self.skipped_total,
+            }
+
+
+def _station_id(topic: str) -> Optional[str]:
+    parts = topic.split("/")
+    return parts[1] if len(parts) >= 2 and parts[1] else None
@@ -0,0 +1,233 @@
+# infrastructure/websocket_fanout.py
+"""
+Diffusion des messages vers les WebSockets des stations. Chaque socket a sa file
+sortante bornée et sa tâche d'écriture: un client mobile lent ne retarde plus
+les autres clients de la station. Un message est sérialisé une seule fois pour
+tous ses destinataires. Quand la file d'un socket est pleine, la politique
+slow_consumer_policy s'applique: évincer le plus ancien message en attente,
+rejeter le nouveau, ou déconnecter le client.
+
+publish()/publish_all() peuvent être appelés depuis n'importe quel thread (workers
+MQTT, threadpool FastAPI); la distribution se fait sur la boucle asyncio liée par
+bind(). register()/unregister() s'appellent depuis cette boucle.
+"""
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Optional
+
+from starlette.websockets import WebSocket
+
+from utils.metrics import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+# Politiques quand la file d'un socket est pleine
+DROP_OLDEST = "drop_oldest"   # le plus ancien message en attente est évincé
+DROP_NEWEST = "drop_newest"   # le message entrant est rejeté pour ce socket
+DISCONNECT = "disconnect"     # le client est fermé (il se reconnectera)
+SLOW_CONSUMER_POLICIES = (DROP_OLDEST, DROP_NEWEST, DISCONNECT)
+
+# 1008 (policy violation): fermeture d'un client trop lent
+SLOW_CONSUMER_CLOSE_CODE = 1008
+
+
+def serialize_message(message: Any) -> str:
+    """Texte envoyé aux sockets: str tel quel, bytes décodés, le reste en JSON."""
+    if isinstance(message, str):
+        return message
+    if isinstance(message, (bytes, bytearray)):
+        return bytes(message).decode("utf-8", errors="replace")
+    return json.dumps(message)
+
+
+class _Subscriber:
+    __slots__ = ("ws", "station_id", "queue", "task", "dropped")
+
+    def __init__(self, ws: WebSocket, station_id: str, queue_size: int):
+        self.ws = ws
+        self.station_id = station_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.task: Optional[asyncio.Task] = None
+        self.dropped = 0
+
+
+class WebSocketFanout:
+    """
+    Registre station -> sockets avec une file et une tâche d'écriture par socket.
+    send_timeout borne un send_text bloqué (client qui ne lit plus): le client est
+    alors traité comme trop lent et fermé, quelle que soit la politique.
+    """
+
+    def __init__(self, queue_size: int = 64, slow_consumer_policy: str = DROP_OLDEST,
+                 send_timeout: float = 10.0):
+        if queue_size < 1:
+            raise ValueError("queue_size must be >= 1")
+        if slow_consumer_policy not in SLOW_CONSUMER_POLICIES:
+            raise ValueError(f"slow_consumer_policy must be one of {SLOW_CONSUMER_POLICIES}")
+
+        self.queue_size = queue_size
+        self.slow_consumer_policy = slow_consumer_policy
+        self.send_timeout = send_timeout
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # modifié uniquement sur la boucle; lu ailleurs via des copies
+        self._by_station: dict[str, dict[WebSocket, _Subscriber]] = {}
+
+        # métriques (protégées par _lock: lues depuis le threadpool)
+        self._lock = threading.Lock()
+        self.published_total = 0
+        self.delivered_total = 0
+        self.dropped_total = 0
+        self.disconnected_total = 0
+        self.failed_total = 0
+        self._lag = LatencyHistogram()
+
+    def bind(self, loop: asyncio.AbstractEventLoop) -> "WebSocketFanout":
+        self._loop = loop
+        return self
+
+    # --- Abonnements (boucle asyncio) ---
+
+    def register(self, station_id: str, ws: WebSocket) -> None:
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        sub = _Subscriber(ws, station_id, self.queue_size)
+        sub.task = asyncio.create_task(self._writer(sub))
+        self._by_station.setdefault(station_id, {})[ws] = sub
+
+    def unregister(self, ws: WebSocket) -> None:
+        for station_id, subs in list(self._by_station.items()):
+            sub = subs.pop(ws, None)
+            if sub is None:
+                continue
+            if not subs:
+                del self._by_station[station_id]
+            if sub.task is not None and sub.task is not asyncio.current_task():
+                sub.task.cancel()
+
+    def stations(self) -> list[str]:
+        return list(self._by_station)
+
+    def connection_count(self, station_id: Optional[str] = None) -> int:
+        if station_id is not None:
+            return len(self._by_station.get(station_id, ()))
+        return sum(len(subs) for subs in list(self._by_station.values()))
+
+    # --- Publication (tout thread) ---
+
+    def publish(self, station_id: str, message: Any) -> bool:
+        """Met le message en file pour chaque socket de la station. False si aucune boucle liée."""
+        return self._schedule([station_id], serialize_message(message))
+
+    def publish_all(self, message: Any) -> bool:
+        """Met le message en file pour chaque socket de toutes les stations."""
+        return self._schedule(None, serialize_message(message))
+
+    def _schedule(self, station_ids: Optional[list[str]], text: str) -> bool:
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            logger.warning("WebSocket fan-out has no event loop, message dropped")
+            return False
+        with self._lock:
+            self.published_total += 1
+        loop.call_soon_threadsafe(self._dispatch, station_ids, text, time.monotonic())
+        return True
+
+    def _dispatch(self, station_ids: Optional[list[str]], text: str, published_at: float) -> None:
+        if station_ids is None:
+            station_ids = list(self._by_station)
+        for station_id in station_ids:
+            for sub in list(self._by_station.get(station_id, {}).values()):
+                self._enqueue(sub, text, published_at)
+
+    def _enqueue(self, sub: _Subscriber, text: str, published_at: float) -> None:
+        try:
+            sub.queue.put_nowait((text, published_at))
+            return
+        except asyncio.QueueFull:
+            pass
+
+        if self.slow_consumer_policy == DISCONNECT:
+            logger.info("Slow WebSocket client disconnected for station %s", sub.station_id)
+            self._disconnect(sub)
+            return
+
+        with self._lock:
+            self.dropped_total += 1
+        sub.dropped += 1
+        if self.slow_consumer_policy == DROP_OLDEST:
+            sub.queue.get_nowait()
+            sub.queue.put_nowait((text, published_at))
+
+    async def _writer(self, sub: _Subscriber) -> None:
+        while True:
+            text, published_at = await sub.queue.get()
+            try:
+                await asyncio.wait_for(sub.ws.send_text(text), timeout=self.send_timeout)
+            except asyncio.CancelledError:
+                raise
+            except asyncio.TimeoutError:
+                logger.info("WebSocket send timed out for station %s, closing", sub.station_id)
+                self._disconnect(sub)
+                return
+            except Exception:
+                with self._lock:
+                    self.failed_total += 1
+                # socket fermé: on le retire, le endpoint fera le reste
+                self.unregister(sub.ws)
+                logger.info("Removed closed websocket for station %s", sub.station_id)
+                return
+            with self._lock:
+                self.delivered_total += 1
+                self._lag.observe((time.monotonic() - published_at) * 1000.0)
+
+    def _disconnect(self, sub: _Subscriber) -> None:
+        with self._lock:
+            self.disconnected_total += 1
+        self.unregister(sub.ws)
+
+        async def _close():
+            try:
+                await sub.ws.close(code=SLOW_CONSUMER_CLOSE_CODE, reason="Slow consumer")
+            except Exception:
+                pass
+
+        asyncio.get_running_loop().create_task(_close())
+
+    async def close(self) -> None:
+        """Arrête toutes les tâches d'écriture (arrêt du serveur)."""
+        tasks = [sub.task for subs in self._by_station.values() for sub in subs.values() if sub.task]
+        self._by_station.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def metrics(self) -> dict:
+        by_station = {station_id: list(subs.values()) for station_id, subs in list(self._by_station.items())}
+        depths = [sub.queue.qsize() for subs in by_station.values() for sub in subs]
+        with self._lock:
+            return {
+                "stations": len(by_station),
+                "connections": len(depths),
+                "queue_size": self.queue_size,
+                "slow_consumer_policy": self.slow_consumer_policy,
+                "max_queue_depth": max(depths, default=0),
+                "published_total": self.published_total,
+                "delivered_total": self.delivered_total,
+                "dropped_total": self.dropped_total,
+                "disconnected_total": self.disconnected_total,
+                "failed_total": self.failed_total,
+                "delivery_lag_ms": self._lag.snapshot(),
+            }
+
+
+def websocket_fanout_from_env() -> WebSocketFanout:
+    return WebSocketFanout(
+        queue_size=int(os.getenv("WS_SEND_QUEUE_SIZE", "64")),
+        slow_consumer_policy=os.getenv("WS_SLOW_CONSUMER_POLICY", DROP_OLDEST),
+        send_timeout=float(os.getenv("WS_SEND_TIMEOUT", "10")),
+    )
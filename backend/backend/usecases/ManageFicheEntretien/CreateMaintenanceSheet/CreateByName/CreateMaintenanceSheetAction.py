@@ -2,6 +2,7 @@ from entities.models import MaintenanceSheet
 from infrastructure.database import get_db
 
 from entities.repositories import Repository
+from infrastructure.image_pipeline import ingest_photo, InvalidPhotoError
 
 from typing import Optional, Union
 from pydantic import BaseModel, Field, constr
@@ -177,13 +178,23 @@ class CreateMaintenanceSheetAction:
 
         maintenance_sheet_params = _extract_maintenance_sheet(response, params)
         maintenance_sheet_params.user_id = user_id
+        self._store_photo(maintenance_sheet_params)
         maintenance_sheet_id = self.repo.create_maintenance_sheet(maintenance_sheet_params)
 
         return self.repo.get_maintenance_sheet_by_id(maintenance_sheet_id)
 
-
-
-
-
-
-
+    def _store_photo(self, sheet: MaintenanceSheet) -> None:
+        """
+        Photo redressée, sans métadonnées, réduite, avec ses miniatures (pool de process).
+        Comme pour un base64 invalide, une image illisible est ignorée.
+        """
+        if not sheet.photo:
+            return
+        try:
+            processed = ingest_photo(sheet.photo)
+        except InvalidPhotoError as e:
+            logger.warning("Photo ignored: %s", e)
+            sheet.photo = None
+            return
+        sheet.photo_id = self.repo.store_photo(processed.original.content, variants=processed.variants)
+        sheet.photo = None
@@ -1,7 +1,6 @@
 from typing import Optional
 from pydantic import BaseModel, Field, ConfigDict, field_validator, conint, computed_field
 from datetime import datetime
-import base64
 
 # types contraints
 Percent = conint(ge=0, le=100)
@@ -43,18 +42,7 @@ class MaintenanceSheet(BaseModel):
     ideal_lumens: Optional[NonNegInt] = None
     ideal_temperature: Optional[TempC] = None
     ideal_watering_days_frequency: Optional[NonNegInt] = None
-    
-    photo: Optional[bytes] = Field(default=None, exclude=True)
 
-    @field_validator("photo", mode="before")
-    @classmethod
-    def convert_memoryview_to_bytes(cls, v):
-        """Convertit memoryview (retourné par PostgreSQL) en bytes"""
-        if v is None:
-            return None
-        if isinstance(v, memoryview):
-            return bytes(v)
-        return v
 
     @field_validator("identification_source")
     @classmethod
@@ -99,11 +87,17 @@ class MaintenanceSheetOut(MaintenanceSheet):
     id: int
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
-    
+    photo_hash: Optional[str] = None
+
     @computed_field
     @property
-    def photo_base64(self) -> Optional[str]:
-        """Convertit les bytes de la photo en base64 pour l'API"""
-        if self.photo:
-            return base64.b64encode(self.photo).decode('utf-8')
+    def photo_url(self) -> Optional[str]:
+        """URL de la photo (octets servis à part, cachables); ?variant=small|medium pour une miniature"""
+        if self.photo_hash:
+            return photo_url(self.id, self.photo_hash)
         return None
+
+
+def photo_url(sheet_id: int, photo_hash: str) -> str:
+    # Le hash dans l'URL rend la réponse immuable pour le cache HTTP
+    return f"/api/maintenance-sheets/{sheet_id}/photo?v={photo_hash}"
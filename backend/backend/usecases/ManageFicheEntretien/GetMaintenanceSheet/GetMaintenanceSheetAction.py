@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
 
-from entities.models import MaintenanceSheet
+from entities.maintenance_sheet_registry import MaintenanceSheetRegistry
+from entities.models import MaintenanceSheet, MaintenanceSheetOwnership
 from entities.repositories import Repository
 from entities.exceptions import NotFoundException, IllegalArgumentException, DatabaseConflictError
 
@@ -31,6 +32,23 @@ class GetMaintenanceSheetByIdAction:
             raise NotFoundException(f"Maintenance sheet with id: {sheet_id} not found.")
         return maintenance_sheet
 
-def _check_maintenance_sheet_belong_to_user(maintenance_sheet: MaintenanceSheet, user_id:int):
+class GetMaintenanceSheetOwnershipAction:
+    """
+    Mêmes vérifications que GetMaintenanceSheetByIdAction, sur la projection en cache
+    (propriétaire et cibles d'humidité): sans accès base sur le chemin chaud.
+    """
+    def __init__(self, repository: Repository):
+        self._repository = repository
+
+    def execute(self, params: GetMaintenanceSheetParams) -> MaintenanceSheetOwnership:
+        ownership = MaintenanceSheetRegistry(self._repository).get_ownership(params.sheet_id)
+        if not ownership:
+            raise NotFoundException(f"Maintenance sheet with id: {params.sheet_id} not found.")
+
+        _check_maintenance_sheet_belong_to_user(ownership, params.user_id)
+
+        return ownership
+
+def _check_maintenance_sheet_belong_to_user(maintenance_sheet: MaintenanceSheet | MaintenanceSheetOwnership, user_id:int):
     if maintenance_sheet.user_id != user_id:
         raise IllegalArgumentException("The maintenance sheet dont belong to the user")
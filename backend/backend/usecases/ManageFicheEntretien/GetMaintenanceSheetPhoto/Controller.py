@@ -0,0 +1,68 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+
+from entities.exceptions import NotFoundException, IllegalArgumentException
+from entities.repositories import Repository
+from infrastructure.database import Database, get_db
+from usecases.ManageFicheEntretien.GetMaintenanceSheetPhoto.GetMaintenanceSheetPhotoAction import \
+    GetMaintenanceSheetPhotoAction, GetMaintenanceSheetPhotoParams, PhotoVariantName
+from usecases.ManageUsers.AuthUser.guard import get_current_user_from_bearer
+from utils.http_cache import etag_matches, parse_byte_range
+
+router = APIRouter()
+
+import logging
+logger = logging.getLogger(__name__)
+
+# L'URL publiée dans le JSON contient le hash (?v=...): le contenu d'une URL ne change jamais
+IMMUTABLE = "private, max-age=31536000, immutable"
+# Miniature pas encore générée: on sert l'original mais le client doit revalider
+REVALIDATE = "private, no-cache"
+
+
+@router.get("/maintenance-sheets/{fiche_id}/photo")
+def get_maintenance_sheet_photo(
+        fiche_id: int,
+        request: Request,
+        variant: PhotoVariantName = Query("original"),
+        db: Database = Depends(get_db),
+        current = Depends(get_current_user_from_bearer)
+    ):
+    repository = Repository(db)
+    try:
+        params = GetMaintenanceSheetPhotoParams(sheet_id=fiche_id, user_id=current.user_id, variant=variant)
+        photo = GetMaintenanceSheetPhotoAction(repository).execute(params)
+    except (NotFoundException, IllegalArgumentException) as e:
+        logger.info("%s: %s", type(e).__name__, e)
+        raise HTTPException(
+            status_code=404,
+            detail=f"the photo of maintenance sheet with id {fiche_id} cant be found"
+        )
+
+    etag = f'"{photo.content_hash}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": IMMUTABLE if photo.variant == variant else REVALIDATE,
+        "Accept-Ranges": "bytes",
+    }
+
+    # 304 sans lire un seul octet de l'image
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    try:
+        byte_range = parse_byte_range(request.headers.get("range"), photo.byte_size)
+    except ValueError:
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{photo.byte_size}"})
+
+    if byte_range is None:
+        content = repository.read_photo_variant_content(photo)
+        return Response(content=content, media_type=photo.content_type, headers=headers)
+
+    start, end = byte_range
+    content = repository.read_photo_variant_content(photo, offset=start, length=end - start + 1)
+    return Response(
+        content=content,
+        status_code=206,
+        media_type=photo.content_type,
+        headers={**headers, "Content-Range": f"bytes {start}-{end}/{photo.byte_size}"},
+    )
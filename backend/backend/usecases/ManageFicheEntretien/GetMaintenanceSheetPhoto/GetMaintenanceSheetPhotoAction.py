@@ -0,0 +1,39 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+from entities.models import PhotoVariant
+from entities.repositories import Repository
+from entities.exceptions import NotFoundException
+from usecases.ManageFicheEntretien.GetMaintenanceSheet.GetMaintenanceSheetAction import GetMaintenanceSheetByIdAction, \
+    GetMaintenanceSheetParams
+
+import logging
+logger = logging.getLogger(__name__)
+
+PhotoVariantName = Literal["original", "small", "medium"]
+
+
+class GetMaintenanceSheetPhotoParams(BaseModel):
+    sheet_id: int = Field(..., ge=1)
+    user_id: int = Field(..., ge=1)
+    variant: PhotoVariantName = "original"
+
+
+class GetMaintenanceSheetPhotoAction:
+    def __init__(self, repository: Repository):
+        self._repository = repository
+
+    def execute(self, params: GetMaintenanceSheetPhotoParams) -> PhotoVariant:
+        """Métadonnées de la photo à servir; les octets sont lus par le controller selon Range/ETag."""
+        sheet = GetMaintenanceSheetByIdAction(self._repository).execute(GetMaintenanceSheetParams(
+            sheet_id=params.sheet_id,
+            user_id=params.user_id,
+        ))
+        if sheet.photo_id is None:
+            raise NotFoundException(f"Maintenance sheet with id: {params.sheet_id} has no photo.")
+
+        photo = self._repository.get_photo_variant(sheet.photo_id, params.variant)
+        if photo is None:
+            raise NotFoundException(f"Photo with id: {sheet.photo_id} not found.")
+        return photo
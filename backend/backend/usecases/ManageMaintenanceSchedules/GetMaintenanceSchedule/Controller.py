@@ -1,13 +1,15 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
+from fastapi.responses import JSONResponse
 from entities.repositories import Repository
 from infrastructure.database import Database, get_db
 from typing import List
 from entities.exceptions import NotFoundException, IllegalArgumentException
 
 from usecases.ManageMaintenanceSchedules.GetMaintenanceSchedule.GetMaintenanceSheetAction import \
-    GetMaintenanceSchedulesAction
+    GetCachedMaintenanceScheduleAction
 from usecases.ManageMaintenanceSchedules.GetMaintenanceSchedule.MaintenanceScheduleOutModel import MaintenanceScheduleOut
 from usecases.ManageUsers.AuthUser.guard import get_current_user_from_bearer
+from utils.http_cache import etag_matches
 
 router = APIRouter()
 
@@ -15,19 +17,25 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+# Le planning change avec les rapports et l'heure: le client revalide à chaque ouverture
+REVALIDATE = "private, no-cache"
+
+
 @router.get("/maintenance-schedule", response_model=List[MaintenanceScheduleOut])
 def get_maintenance_sheet(
+        request: Request,
         db: Database = Depends(get_db),
         current = Depends(get_current_user_from_bearer)
     ):
     repository = Repository(db)
     try:
-        schedule = GetMaintenanceSchedulesAction(repository).execute(current.user_id)
-        return [MaintenanceScheduleOut.model_validate(item) for item in schedule]
-
+        schedule = GetCachedMaintenanceScheduleAction(repository).execute(current.user_id)
     except (NotFoundException, IllegalArgumentException) as e:
         logger.info("%s: %s", type(e).__name__, e)
+        return []
 
-
-
-
+    headers = {"ETag": schedule.etag, "Cache-Control": REVALIDATE}
+    if etag_matches(request.headers.get("if-none-match"), schedule.etag):
+        return Response(status_code=304, headers=headers)
+    # items est déjà validé par MaintenanceScheduleOut et sérialisé en JSON
+    return JSONResponse(schedule.items, headers=headers)
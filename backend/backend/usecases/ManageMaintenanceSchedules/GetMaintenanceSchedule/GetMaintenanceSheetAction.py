@@ -1,7 +1,13 @@
 from entities.repositories import Repository
-from typing import Tuple
-from datetime import datetime
+from infrastructure.maintenance_schedule_cache import CachedSchedule, MaintenanceScheduleCache, \
+    maintenance_schedule_cache
+from usecases.ManageMaintenanceSchedules.GetMaintenanceSchedule.MaintenanceScheduleOutModel import \
+    MaintenanceScheduleOut
+from typing import Iterable, List, Tuple
+from datetime import datetime, timedelta
 from typing import Optional, TypeVar
+import hashlib
+import json
 
 import logging
 logger = logging.getLogger(__name__)
@@ -88,10 +94,13 @@ class GetMaintenanceSchedulesAction:
         self._repository = repository
 
     def execute(self, user_id):
-        mapped = []
-
         logger.info("Getting maintenance schedules for user %s", user_id)
         results = self._repository.get_last_feeled_humidity(user_id)
+        return self.map_rows(results)
+
+    @staticmethod
+    def map_rows(results) -> List[dict]:
+        mapped = []
 
         for row in results:
             # Extraire le rapport le plus récent (watering vs express)
@@ -199,7 +208,8 @@ class GetMaintenanceSchedulesAction:
             mapped.append({
                 "plant_id": row.plant_id,
                 "plant_name": row.plant_name,
-                "photo": row.photo,
+                "photo_id": row.photo_id,
+                "photo_hash": row.photo_hash,
                 "watering_advices": {
                     **watering_advices,
                     "details": {
@@ -240,3 +250,65 @@ class GetMaintenanceSchedulesAction:
             })
 
         return mapped
+
+
+def next_change_at(results: Iterable) -> Optional[datetime]:
+    """
+    Prochaine date à laquelle un des jours/heures écoulés du planning change.
+    Les jours et les heures sont comptés depuis la date du rapport (pas depuis
+    minuit) et hours_since_* est affiché: les deux changent sur un multiple d'une
+    heure après chaque date, une expiration à minuit servirait des valeurs périmées.
+    None sans aucun rapport.
+    """
+    one_hour = timedelta(hours=1)
+    candidates = []
+    for row in results:
+        for date in (row.last_watering_above_target_date, row.last_express_above_target_date,
+                     row.last_watering_date, row.last_express_date):
+            if date is None:
+                continue
+            now = datetime.now(date.tzinfo) if date.tzinfo else datetime.now()
+            candidates.append(date + ((now - date) // one_hour + 1) * one_hour)
+    return min(candidates, default=None)
+
+
+class GetCachedMaintenanceScheduleAction:
+    """
+    Planning servi depuis maintenance_schedule_cache tant que la version des données
+    (Repository.get_maintenance_schedule_version) est la même et que les jours/heures
+    écoulés n'ont pas changé. L'ETag est l'empreinte du JSON servi.
+    """
+
+    def __init__(self, repository: Repository, cache: MaintenanceScheduleCache = maintenance_schedule_cache):
+        self._repository = repository
+        self._cache = cache
+
+    def execute(self, user_id) -> CachedSchedule:
+        user_id = int(user_id)
+        # la version est lue avant les données: une écriture entre les deux donne
+        # une entrée marquée avec l'ancienne version, recalculée à la requête suivante
+        version = self._repository.get_maintenance_schedule_version(user_id)
+        cached = self._cache.get(user_id)
+        if cached is not None and cached.version == version:
+            return cached
+
+        logger.info("Computing maintenance schedule for user %s", user_id)
+        results = self._repository.get_last_feeled_humidity(user_id)
+        items = [
+            MaintenanceScheduleOut.model_validate(item).model_dump(mode="json")
+            for item in GetMaintenanceSchedulesAction.map_rows(results)
+        ]
+        body = json.dumps(items, sort_keys=True, separators=(",", ":"))
+        entry = CachedSchedule(
+            version=version,
+            etag=f'"{hashlib.sha256(body.encode()).hexdigest()[:32]}"',
+            items=items,
+            expires_at=next_change_at(results),
+        )
+
+        ttl = None
+        if entry.expires_at is not None:
+            now = datetime.now(entry.expires_at.tzinfo) if entry.expires_at.tzinfo else datetime.now()
+            ttl = max((entry.expires_at - now).total_seconds(), 0.0)
+        self._cache.set(user_id, entry, ttl)
+        return entry
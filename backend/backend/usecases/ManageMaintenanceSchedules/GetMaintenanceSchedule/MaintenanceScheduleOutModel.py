@@ -1,6 +1,7 @@
 from typing import Optional, Dict, Any
-from pydantic import BaseModel, computed_field, field_validator, Field
-import base64
+from pydantic import BaseModel, computed_field
+
+from usecases.ManageFicheEntretien.CreateMaintenanceSheet.CreateByName.MaintenanceSheetOutModel import photo_url
 
 
 class MaintenanceScheduleOut(BaseModel):
@@ -9,25 +10,15 @@ class MaintenanceScheduleOut(BaseModel):
     watering_advices: Dict[str, Any]
     humidity_advices: Dict[str, Any]
     temperature_advices: Dict[str, Any]
-    photo: Optional[bytes] = Field(default=None, exclude=True)
-    
-    @field_validator("photo", mode="before")
-    @classmethod
-    def convert_memoryview(cls, v):
-        """Convertit memoryview en bytes si nécessaire"""
-        if v is None:
-            return None
-        if isinstance(v, memoryview):
-            return bytes(v)
-        return v
-    
+    photo_hash: Optional[str] = None
+
     @computed_field
     @property
-    def photo_base64(self) -> Optional[str]:
-        """Convertit les bytes de la photo en base64 pour l'API"""
-        if self.photo:
-            return base64.b64encode(self.photo).decode('utf-8')
+    def photo_url(self) -> Optional[str]:
+        """URL de la photo de la plante; les cartes utilisent ?variant=medium"""
+        if self.photo_hash:
+            return photo_url(self.plant_id, self.photo_hash)
         return None
-    
+
     class Config:
         from_attributes = True
@@ -1,11 +1,11 @@
 from typing import Annotated, List, Optional
 from pydantic import BaseModel, Field
-import statistics
-import json
+from pydash import get
 
 
 from entities.repositories import Repository
 from infrastructure.database import Database
+from utils.series_stats import compute_series_stats
 
 import logging
 logger = logging.getLogger(__name__)
@@ -14,9 +14,9 @@ logger = logging.getLogger(__name__)
 Percent = Annotated[float, Field(ge=0.0, le=100.0)]
 Temp = Annotated[float, Field(ge=-100.0, le=200.0)]
 
-ListPct = Annotated[List[Optional[Percent]], Field(min_items=0, max_items=60)]
-ListTemp = Annotated[List[Optional[Temp]], Field(min_items=0, max_items=60)]
-ListFloat = Annotated[List[Optional[float]], Field(min_items=0, max_items=60)]
+ListPct = Annotated[List[Optional[Percent]], Field(min_items=0, max_items=600)]
+ListTemp = Annotated[List[Optional[Temp]], Field(min_items=0, max_items=600)]
+ListFloat = Annotated[List[Optional[float]], Field(min_items=0, max_items=600)]
 
 
 class ExpressAnalysisPayload(BaseModel):
@@ -25,41 +25,44 @@ class ExpressAnalysisPayload(BaseModel):
     temperature: ListTemp
     air_humidity: ListFloat
 
-def remove_none(values):
-    return [v for v in values if v is not None]
+def build_express_analysis_report(data: dict) -> dict:
+    """
+    Valide le payload station et calcule les statistiques des séries. Retourne les arguments de
+    Repository.create_express_analysis_report (utilisé aussi par le ReportBatchWriter).
+    Lève ValueError (pydantic.ValidationError) si le payload est invalide.
+    """
+    payload = ExpressAnalysisPayload(**data)
+
+    soil = payload.humidity
+    temp = payload.temperature
+    air = payload.air_humidity
+
+    # une seule passe vectorisée pour toutes les séries; absentes si vides
+    stats = compute_series_stats({"soil_humidity": soil, "temperature": temp, "air_humidity": air})
+
+    soil_mean = get(stats, "soil_humidity.mean")
+    temp_mean = get(stats, "temperature.mean")
+    air_mean = get(stats, "air_humidity.mean")
+
+    return dict(
+        plant_id=payload.plant_id,
+        soil_humidity_mean=soil_mean,
+        temperature_mean=temp_mean,
+        air_humidity_mean=air_mean,
+        lumens_mean=None,
+        # séries brutes: encodées en binaire compact par le Repository
+        soil_humidity_data=soil,
+        temperature_data=temp,
+        air_humidity_data=air,
+        lumens_data=None,
+        stats=stats,
+    )
+
 
 def handle_express_analysis(data: dict, db: Database):
     repo = Repository(db)
     try:
-        payload = ExpressAnalysisPayload(**data)
-
-        soil = payload.humidity
-        temp = payload.temperature
-        air = payload.air_humidity
-
-        soil_vals = remove_none(soil)
-        temp_vals = remove_none(temp)
-        air_vals = remove_none(air)
-
-        soil_mean = statistics.mean(soil_vals) if soil_vals else None
-        temp_mean = statistics.mean(temp_vals) if temp_vals else None
-        air_mean = statistics.mean(air_vals) if air_vals else None
-
-        soil_json = json.dumps(soil, separators=(",", ":"))
-        temp_json = json.dumps(temp, separators=(",", ":"))
-        air_json = json.dumps(air, separators=(",", ":"))
-
-        report_id = repo.create_express_analysis_report(
-            plant_id=payload.plant_id,
-            soil_humidity_mean=soil_mean,
-            temperature_mean=temp_mean,
-            air_humidity_mean=air_mean,
-            lumens_mean=None,
-            soil_humidity_data=soil_json,
-            temperature_data=temp_json,
-            air_humidity_data=air_json,
-            lumens_data=None,
-        )
+        report_id = repo.create_express_analysis_report(**build_express_analysis_report(data))
 
         logger.info(f"Report ID: {report_id}")
         return report_id
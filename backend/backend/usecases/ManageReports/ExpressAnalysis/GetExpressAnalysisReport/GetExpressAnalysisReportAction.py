@@ -1,4 +1,4 @@
-from entities.exceptions import NotFoundException, UnauthorizedError
+from entities.exceptions import NotFoundException
 from entities.models import ExpressAnalysisReport
 from infrastructure.database import get_db
 from entities.repositories import Repository
@@ -22,16 +22,11 @@ class GetExpressAnalysisReportAction:
 
     # TODO (PLM) use a pydantic model for params
     def execute(self, report_id, user_id) -> ExpressAnalysisReport:
-        report_analysis = self.repo.get_express_analysis_report_by_id(
-            report_id)
+        # TODO (PLM) make not needing a cast
+        # Une seule requête jointe à la fiche: le rapport d'un autre utilisateur est introuvable
+        report_analysis = self.repo.get_express_analysis_report_for_user(report_id, int(user_id))
 
         if report_analysis is None:
             raise NotFoundException(f"The report with id {report_id} not found")
 
-        plant = self.repo.get_maintenance_sheet_by_id(report_analysis.plant_id)
-        
-        # TODO (PLM) make not needing a cast
-        if plant is None or plant.user_id != int(user_id):
-            raise UnauthorizedError(f"The user {user_id} cannot access to report {report_id}")
-
-        return report_analysis
\ No newline at end of file
+        return report_analysis
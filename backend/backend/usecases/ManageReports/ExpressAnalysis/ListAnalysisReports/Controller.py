@@ -28,6 +28,7 @@ class ExpressAnalysisReportOut(BaseModel):
     temperature_data: Optional[str] = None
 
     created_at: Optional[datetime] = None
+    stats: Optional[dict] = None
 
     class Config:
         orm_mode = True
@@ -0,0 +1,72 @@
+from fastapi import APIRouter, HTTPException, Depends, Query
+from pydantic import BaseModel, ValidationError
+from datetime import datetime
+
+from entities.exceptions import IllegalArgumentException, NotFoundException
+from entities.repositories import Repository
+from infrastructure.database import Database, get_db
+from typing import List, Optional
+
+from usecases.ManageReports.GetPlantHistory.GetPlantHistoryAction import GetPlantHistoryAction, \
+    GetPlantHistoryParams
+from usecases.ManageUsers.AuthUser.guard import get_current_user_from_bearer
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+class MetricRollupOut(BaseModel):
+    bucket_start: datetime
+    metric: str  # soil_humidity, air_humidity, temperature, lumens, watering_soil_humidity
+    count: int
+    mean: float
+    min: float
+    max: float
+
+    class Config:
+        orm_mode = True
+
+
+class PlantHistoryOut(BaseModel):
+    plant_id: int
+    resolution: str  # résolution réellement servie
+    start: datetime
+    end: datetime
+    points: List[MetricRollupOut]
+
+    class Config:
+        orm_mode = True
+
+
+router = APIRouter()
+@router.get(
+    "/plants/{plant_id}/history",
+    response_model=PlantHistoryOut
+)
+def get_plant_history(
+        plant_id: int,
+        resolution: str = Query("auto", description="auto, hour, day ou week"),
+        start: Optional[datetime] = Query(None, alias="from", description="défaut: 30 jours avant `to`"),
+        end: Optional[datetime] = Query(None, alias="to", description="défaut: maintenant"),
+        db: Database = Depends(get_db),
+        current = Depends(get_current_user_from_bearer),
+):
+    repository = Repository(db)
+    try:
+        params = GetPlantHistoryParams(sheet_id=plant_id, user_id=current.user_id,
+                                       resolution=resolution, start=start, end=end)
+    except ValidationError as e:
+        # detail en texte: les erreurs pydantic contiennent les datetime reçus, non sérialisables
+        raise HTTPException(status_code=400,
+                            detail="; ".join(err["msg"] for err in e.errors(include_url=False)))
+
+    try:
+        return GetPlantHistoryAction(repository).execute(params)
+    except NotFoundException:
+        raise HTTPException(status_code=404, detail="Plant not found")
+    except IllegalArgumentException:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    except Exception as e:
+        logger.exception(e)
+        raise HTTPException(status_code=500,
+                            detail="Une erreure interne s'est produite!")
@@ -0,0 +1,87 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Literal, Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+from entities.exceptions import IllegalArgumentException
+from entities.models import MetricRollup
+from entities.repositories import Repository
+
+from usecases.ManageFicheEntretien.GetMaintenanceSheet.GetMaintenanceSheetAction import GetMaintenanceSheetOwnershipAction, \
+    GetMaintenanceSheetParams
+
+import logging
+logger = logging.getLogger(__name__)
+
+# Durée d'un bucket par résolution, de la plus fine à la plus grossière
+RESOLUTIONS = {
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+}
+# Nombre de points par métrique au-delà duquel on passe à la résolution suivante
+MAX_POINTS = 400
+DEFAULT_WINDOW = timedelta(days=30)
+
+
+class GetPlantHistoryParams(BaseModel):
+    sheet_id: int = Field(..., ge=1)
+    user_id: int = Field(..., ge=1)
+    resolution: Literal["auto", "hour", "day", "week"] = "auto"
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+
+    @model_validator(mode="after")
+    def _check_window(self):
+        if self.start and self.end and self.start >= self.end:
+            raise ValueError("start must be before end")
+        return self
+
+
+@dataclass
+class PlantHistory:
+    plant_id: int
+    resolution: str
+    start: datetime
+    end: datetime
+    points: list[MetricRollup] = field(default_factory=list)
+
+
+def pick_resolution(requested: str, window: timedelta) -> str:
+    """
+    Résolution servie pour la fenêtre: la demandée (la plus fine qui tienne en
+    MAX_POINTS points pour 'auto'), élargie tant qu'elle dépasserait MAX_POINTS.
+    """
+    names = list(RESOLUTIONS)
+    index = 0 if requested == "auto" else names.index(requested)
+    while index < len(names) - 1 and window / RESOLUTIONS[names[index]] > MAX_POINTS:
+        index += 1
+    return names[index]
+
+
+class GetPlantHistoryAction:
+    def __init__(self, repository: Repository):
+        self._repository = repository
+
+    def execute(self, params: GetPlantHistoryParams) -> PlantHistory:
+        end = _as_utc(params.end) if params.end else datetime.now(timezone.utc)
+        start = _as_utc(params.start) if params.start else end - DEFAULT_WINDOW
+        resolution = pick_resolution(params.resolution, end - start)
+
+        self._check_maintenance_sheet_belong_to_user(params)
+
+        points = self._repository.list_plant_metric_rollups(params.sheet_id, resolution, start, end)
+        return PlantHistory(plant_id=params.sheet_id, resolution=resolution, start=start, end=end, points=points)
+
+    def _check_maintenance_sheet_belong_to_user(self, params: GetPlantHistoryParams):
+        res = GetMaintenanceSheetOwnershipAction(self._repository).execute(GetMaintenanceSheetParams(
+            sheet_id=params.sheet_id,
+            user_id=params.user_id,
+        ))
+        if not res:
+            raise IllegalArgumentException("User dont own the plant")
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
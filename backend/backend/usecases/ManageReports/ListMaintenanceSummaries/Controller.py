@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
 from pydantic import BaseModel
 from datetime import datetime
 
@@ -40,11 +40,23 @@ router = APIRouter()
     response_model=List[MaintenanceSummaryOut]
 
 )
-def list_plant_reports_resumes(plant_id: int, db: Database = Depends(get_db), current = Depends(get_current_user_from_bearer)):
+def list_plant_reports_resumes(
+        plant_id: int,
+        response: Response,
+        limit: int = Query(20, ge=1, le=100),
+        cursor: Optional[str] = Query(None, description="X-Next-Cursor de la page précédente"),
+        db: Database = Depends(get_db),
+        current = Depends(get_current_user_from_bearer),
+):
     repository = Repository(db)
     try:
-        params = ListMaintenanceSummariesParams(sheet_id=plant_id, user_id=current.user_id)
-        return ListMaintenanceSummariesAction(repository).execute(params)
+        params = ListMaintenanceSummariesParams(sheet_id=plant_id, user_id=current.user_id, limit=limit, cursor=cursor)
+        page = ListMaintenanceSummariesAction(repository).execute(params)
+
+        # Le corps reste une liste; la page suivante est annoncée dans un header
+        if page.next_cursor:
+            response.headers["X-Next-Cursor"] = page.next_cursor
+        return page.items
 
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -1,12 +1,16 @@
+from dataclasses import dataclass
+from typing import Optional
+
 from pydantic import BaseModel, Field
 
 from entities.models import MaintenanceSummary
 from entities.repositories import Repository
 from entities.exceptions import IllegalArgumentException
+from utils.cursor import encode_summary_cursor, decode_summary_cursor
 
 import logging
 
-from usecases.ManageFicheEntretien.GetMaintenanceSheet.GetMaintenanceSheetAction import GetMaintenanceSheetByIdAction, \
+from usecases.ManageFicheEntretien.GetMaintenanceSheet.GetMaintenanceSheetAction import GetMaintenanceSheetOwnershipAction, \
     GetMaintenanceSheetParams
 
 logger = logging.getLogger(__name__)
@@ -14,21 +18,41 @@ logger = logging.getLogger(__name__)
 class ListMaintenanceSummariesParams(BaseModel):
     sheet_id: int = Field(..., ge=1)
     user_id: int = Field(..., ge=1)
+    limit: int = Field(20, ge=1, le=100)
+    cursor: Optional[str] = None
+
+
+@dataclass
+class MaintenanceSummaryPage:
+    items: list[MaintenanceSummary]
+    next_cursor: Optional[str] = None
 
 
 class ListMaintenanceSummariesAction:
     def __init__(self, repository: Repository):
         self._repository = repository
 
-    def execute(self, params: ListMaintenanceSummariesParams) -> list[MaintenanceSummary]:
+    def execute(self, params: ListMaintenanceSummariesParams) -> MaintenanceSummaryPage:
         repository = self._repository
 
+        # curseur invalide -> ValueError avant toute requête
+        before = decode_summary_cursor(params.cursor) if params.cursor else None
+
         self._check_maintenance_sheet_belong_to_user(params)
 
-        return repository.list_maintenance_summaries(params.sheet_id, params.user_id)
+        # une ligne de plus que demandé: indique s'il reste une page
+        rows = repository.list_maintenance_summaries(
+            params.sheet_id, params.user_id, limit=params.limit + 1, before=before
+        )
+        items = rows[:params.limit]
+        next_cursor = None
+        if len(rows) > params.limit:
+            last = items[-1]
+            next_cursor = encode_summary_cursor(last.created_at, last.type, last.id)
+        return MaintenanceSummaryPage(items=items, next_cursor=next_cursor)
 
     def _check_maintenance_sheet_belong_to_user(self, params: ListMaintenanceSummariesParams):
-        res = GetMaintenanceSheetByIdAction(self._repository).execute(GetMaintenanceSheetParams(
+        res = GetMaintenanceSheetOwnershipAction(self._repository).execute(GetMaintenanceSheetParams(
             sheet_id=params.sheet_id,
             user_id=params.user_id,
         ))
@@ -1,10 +1,10 @@
 from typing import Annotated, List, Optional
 from pydantic import BaseModel, Field
-import json
 
 
 from entities.repositories import Repository
 from infrastructure.database import Database
+from utils.series_stats import compute_series_stats
 
 import logging
 
@@ -28,19 +28,39 @@ class WateringReportPayload(BaseModel):
 
 
 
+def build_watering_report(data: dict) -> dict:
+    """
+    Valide le payload station. Retourne les arguments de Repository.create_watering_report.
+    Lève ValueError (pydantic.ValidationError) si le payload est invalide.
+    """
+    payload = WateringReportPayload(**data)
+    stats = compute_series_stats({"soil_humidity": payload.humidity, "pump": payload.pump})
+
+    # Les statistiques serveur font foi; mean/sigma3 de la station ne servent que
+    # si la courbe est vide. sigma3 est borné par la contrainte de la table (<= 100).
+    soil_stats = stats.get("soil_humidity")
+    mean = soil_stats["mean"] if soil_stats else payload.mean
+    sigma3 = min(soil_stats["sigma3"], 100.0) if soil_stats else payload.sigma3
+    if soil_stats and abs(mean - payload.mean) > 1.0:
+        logger.info("Station mean %.2f differs from computed mean %.2f (plant %s)",
+                    payload.mean, mean, payload.plant_id)
+
+    return dict(
+        plant_id=payload.plant_id,
+        soil_humidity_mean=mean,
+        # séries brutes: encodées en binaire compact par le Repository
+        soil_humidity_data=payload.humidity,
+        pump_data=payload.pump,
+        sigma3=sigma3,
+        target_humidity=payload.target_humidity,
+        stats=stats,
+    )
+
+
 def handle_watering_analysis(data: dict, db: Database):
     repo = Repository(db)
     try:
-        payload = WateringReportPayload(**data)
-
-        report_id = repo.create_watering_report(
-            plant_id=payload.plant_id,
-            soil_humidity_mean=payload.mean,
-            soil_humidity_data=json.dumps(payload.humidity, separators=(",", ":")),
-            pump_data=json.dumps(payload.pump, separators=(",", ":")),
-            sigma3= payload.sigma3,
-            target_humidity= payload.target_humidity,
-        )
+        report_id = repo.create_watering_report(**build_watering_report(data))
 
         logger.info(f"Report ID: {report_id}")
         return report_id
@@ -30,6 +30,7 @@ class WateringReportOut(BaseModel):
     pump_data: Optional[str] = None
 
     created_at: Optional[datetime] = None
+    stats: Optional[dict] = None
 
     class Config:
         orm_mode = True
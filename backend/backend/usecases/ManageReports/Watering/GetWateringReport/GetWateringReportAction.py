@@ -1,4 +1,4 @@
-from entities.exceptions import NotFoundException, UnauthorizedError
+from entities.exceptions import NotFoundException
 from entities.models import WateringReport
 from infrastructure.database import get_db
 from entities.repositories import Repository
@@ -16,15 +16,11 @@ class GetWateringReportAction:
 
 
     def execute(self, report_id, user_id) -> WateringReport:
-        watering_report = self.repo.get_watering_report_by_id(report_id)
+        # TODO (PLM) make not needing a cast
+        # Une seule requête jointe à la fiche: le rapport d'un autre utilisateur est introuvable
+        watering_report = self.repo.get_watering_report_for_user(report_id, int(user_id))
 
         if watering_report is None:
             raise NotFoundException(f"The report with id {report_id} not found")
 
-        plant = self.repo.get_maintenance_sheet_by_id(watering_report.plant_id)
-
-        # TODO (PLM) make not needing a cast
-        if plant is None or plant.user_id != int(user_id):
-            raise UnauthorizedError(f"The user {user_id} cannot access to report {report_id}")
-
-        return watering_report
\ No newline at end of file
+        return watering_report
@@ -3,6 +3,7 @@ from pydantic import BaseModel, Field
 
 
 from entities.repositories import Repository
+from entities.station_registry import StationRegistry
 from infrastructure.database import Database
 
 import logging
@@ -44,7 +45,7 @@ def pair_station_to_user(data: dict, db: Database):
 
         logger.info(f"Pairing request - Payload: {payload}")
 
-        station = repo.get_station_by_mac_address(payload.station_id)
+        station = StationRegistry(repo).get_station_by_mac_address(payload.station_id)
         pairing_timeout = datetime.now(timezone.utc) + timedelta(seconds=120)
         # TODO (PLM) check usecases when station is created not sure it exist
         if station:
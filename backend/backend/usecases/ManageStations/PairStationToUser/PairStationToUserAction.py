@@ -4,6 +4,7 @@ from pydantic import BaseModel, Field
 from datetime import datetime, timezone
 import logging
 from entities.repositories import Repository
+from entities.station_registry import StationRegistry
 from utils.logging_config import setup_logging
 from utils.mqtt_wrapper import MQTTWrapper
 
@@ -53,7 +54,7 @@ class PairStationToUserAction:
         self.queue.publish_json(f"stations/{station.mac_adress}", payload)
 
     def _try_get_station_by_pairing_code(self, pairing_code:str) -> Station:
-        maintenance_sheet = self.repo.get_station_by_pairing_code(pairing_code)
+        maintenance_sheet = StationRegistry(self.repo).get_station_by_pairing_code(pairing_code)
         if not maintenance_sheet:
             raise NotFoundException(f"Station with pairing code: {pairing_code} not found.")
         return maintenance_sheet
@@ -5,7 +5,8 @@ from pydantic import BaseModel, ConfigDict
 import logging
 
 from entities.repositories import Repository
-from usecases.ManageFicheEntretien.GetMaintenanceSheet.GetMaintenanceSheetAction import GetMaintenanceSheetByIdAction, \
+from entities.station_registry import StationRegistry
+from usecases.ManageFicheEntretien.GetMaintenanceSheet.GetMaintenanceSheetAction import GetMaintenanceSheetOwnershipAction, \
     GetMaintenanceSheetParams
 from utils.mqtt_wrapper import MQTTWrapper
 from entities.exceptions import NotFoundException, IllegalArgumentException
@@ -55,7 +56,7 @@ class SendCommandAction:
             payload["duration"] = params.duration
 
         # @TODO (PLM) add error management at the top level
-        plant = GetMaintenanceSheetByIdAction(self._repository).execute(
+        plant = GetMaintenanceSheetOwnershipAction(self._repository).execute(
             GetMaintenanceSheetParams(
                 sheet_id=params.plant_id,
                 user_id=params.user_id
@@ -76,7 +77,7 @@ class SendCommandAction:
         }
 
     def _check_station_belong_to_user(self, params):
-        station = self._repository.get_station_by_mac_address(params.station_id)
+        station = StationRegistry(self._repository).get_station_by_mac_address(params.station_id)
         if station is None or station.user_id != params.user_id:
             # reduce enumeration attack risks
             raise NotFoundException(f"Station with id {params.station_id} not found")
@@ -66,7 +66,7 @@ def decode_access_token(token: str) -> Dict[str, Any]:
 
 
 @router.post("/auth/google", status_code=200)
-async def auth_google(request: Request, response: Response, db: Database = Depends(get_db)):
+def auth_google(request: Request, response: Response, db: Database = Depends(get_db)):
     repository = Repository(db)
     auth = request.headers.get("Authorization")
     if not auth or not auth.startswith("Bearer "):
@@ -131,7 +131,7 @@ async def auth_google(request: Request, response: Response, db: Database = Depen
 
 
 @router.post("/auth/refresh", status_code=200)
-async def refresh(request: Request, response: Response, db: Database = Depends(get_db)):
+def refresh(request: Request, response: Response, db: Database = Depends(get_db)):
     repository = Repository(db)
     refresh_id = request.cookies.get("refresh_id")
     if not refresh_id:
@@ -178,7 +178,7 @@ async def refresh(request: Request, response: Response, db: Database = Depends(g
 
 
 @router.post("/auth/logout", status_code=200)
-async def logout(request: Request, response: Response, db: Database = Depends(get_db)):
+def logout(request: Request, response: Response, db: Database = Depends(get_db)):
     repository = Repository(db)
     refresh_id = request.cookies.get("refresh_id")
     if refresh_id:
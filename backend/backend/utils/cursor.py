@@ -0,0 +1,27 @@
+import base64
+import json
+from datetime import datetime
+
+SUMMARY_TYPES = ("express", "watering")
+
+
+def encode_summary_cursor(created_at: datetime, type_: str, id_: int) -> str:
+    """
+    Curseur opaque (base64url) désignant la dernière ligne d'une page de résumés.
+    La clé (created_at, type, id) est totalement ordonnée, même à horodatage égal.
+    """
+    raw = json.dumps([created_at.isoformat(), type_, id_], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_summary_cursor(cursor: str) -> tuple[datetime, str, int]:
+    """Inverse de encode_summary_cursor. Lève ValueError si le curseur est invalide."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, type_, id_ = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        created_at = datetime.fromisoformat(created_at)
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+    if type_ not in SUMMARY_TYPES or not isinstance(id_, int) or created_at.tzinfo is None:
+        raise ValueError("Invalid cursor")
+    return created_at, type_, id_
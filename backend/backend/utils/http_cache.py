@@ -0,0 +1,47 @@
+import re
+from typing import Optional
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match (comparaison faible, RFC 9110 §13.1.2): liste d'ETags ou '*'."""
+    if not if_none_match:
+        return False
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    if "*" in candidates:
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(c.removeprefix("W/") == opaque for c in candidates)
+
+
+def parse_byte_range(range_header: Optional[str], size: int) -> Optional[tuple[int, int]]:
+    """
+    Interprète un header Range à plage unique ('bytes=a-b', 'bytes=a-', 'bytes=-n').
+    Retourne (start, end) inclusifs, ou None si le header est absent, mal formé ou
+    multi-plages (on sert alors la ressource entière, ce que permet la RFC).
+    Lève ValueError si la plage n'est pas satisfiable (-> 416).
+    """
+    if not range_header:
+        return None
+    match = _RANGE.match(range_header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+
+    if not first:
+        # suffixe: les n derniers octets
+        length = int(last)
+        if length == 0 or size == 0:
+            raise ValueError("Unsatisfiable range")
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    end = int(last) if last else size - 1
+    if last and end < start:
+        return None
+    if start >= size:
+        raise ValueError("Unsatisfiable range")
+    return start, min(end, size - 1)
@@ -0,0 +1,27 @@
+# Bornes (ms) par défaut des histogrammes de latence
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class LatencyHistogram:
+    """Histogramme cumulatif simple; la synchronisation est à la charge de l'appelant."""
+
+    def __init__(self, buckets_ms=LATENCY_BUCKETS_MS):
+        self._buckets = tuple(buckets_ms)
+        self._counts = [0] * (len(self._buckets) + 1)
+        self._count = 0
+        self._sum_ms = 0.0
+
+    def observe(self, value_ms: float) -> None:
+        idx = len(self._buckets)
+        for i, bound in enumerate(self._buckets):
+            if value_ms <= bound:
+                idx = i
+                break
+        self._counts[idx] += 1
+        self._count += 1
+        self._sum_ms += value_ms
+
+    def snapshot(self) -> dict:
+        buckets = {f"le_{bound}": self._counts[i] for i, bound in enumerate(self._buckets)}
+        buckets["le_inf"] = self._counts[-1]
+        return {"buckets": buckets, "count": self._count, "sum_ms": round(self._sum_ms, 3)}
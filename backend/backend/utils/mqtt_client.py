@@ -25,18 +25,32 @@ class MQTTClient:
         else:
             logger.error("❌ MQTT connection failed (rc=%s)", rc)
         
-        for topic in self.topic_callbacks:
-            client.subscribe(topic)
-            client.message_callback_add(topic, self.topic_callbacks[topic])
+        # copie: les abonnements par station changent depuis la boucle asyncio
+        for topic, (subscription, callback) in list(self.topic_callbacks.items()):
+            client.subscribe(subscription)
+            client.message_callback_add(topic, callback)
 
     def _on_message(self, client, userdata, msg):
         logger.info("📦 Unhandled MQTT message received: topic=%s payload=%s", msg.topic, msg.payload.decode())
 
-    def register_callback(self, topic, callback):
-        self.topic_callbacks[topic] = callback
-        self.client.subscribe(topic)
+    def register_callback(self, topic, callback, subscription=None):
+        """
+        topic: filtre qui route les messages reçus vers callback.
+        subscription: filtre envoyé au broker si différent, ex. abonnement partagé
+        $share/<groupe>/<topic> (les messages arrivent sur le topic sans préfixe).
+        """
+        subscription = subscription or topic
+        self.topic_callbacks[topic] = (subscription, callback)
+        self.client.subscribe(subscription)
         self.client.message_callback_add(topic, callback)
 
+    def unregister_callback(self, topic):
+        entry = self.topic_callbacks.pop(topic, None)
+        if entry is None:
+            return
+        self.client.unsubscribe(entry[0])
+        self.client.message_callback_remove(topic)
+
     def publish(self, topic, payload, retain=False):
         if isinstance(payload, (str, bytes)):
             raw = payload if isinstance(payload, str) else payload.decode("utf-8")
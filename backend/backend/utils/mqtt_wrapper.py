@@ -1,8 +1,7 @@
-import asyncio
 import logging
-from typing import Dict, Set, Optional
-from starlette.websockets import WebSocket as StarletteWebSocket
+from typing import Optional
 
+from infrastructure.broadcast_bus import BroadcastBus
 from utils.mqtt_client import MQTTClient
 
 logger = logging.getLogger(__name__)
@@ -11,13 +10,12 @@ class MQTTWrapper:
     """
     Wrapper around raw MQTTClient.
     - Delegates payload serialization to MQTTClient.publish (no json.dumps here).
-    - active_ws_map is a Dict[station_id, Set[WebSocket]].
+    - websockets are notified through the BroadcastBus, which routes to the worker holding them.
     - publish_and_notify can notify a specific station or all stations.
     """
-    def __init__(self, raw_client: MQTTClient, loop: asyncio.AbstractEventLoop, active_ws_map: Dict[str, Set[StarletteWebSocket]]):
+    def __init__(self, raw_client: MQTTClient, broadcast: BroadcastBus):
         self._client = raw_client
-        self._loop = loop
-        self._active_ws_map = active_ws_map
+        self._broadcast = broadcast
         self._logger = logging.getLogger(__name__)
 
     def publish_json(self, topic: str, obj):
@@ -55,36 +53,8 @@ class MQTTWrapper:
         if not notify_text:
             return
 
-        async def _notify_station(st_id: str, text: str):
-            for ws in list(self._active_ws_map.get(st_id, set())):
-                try:
-                    await ws.send_text(text)
-                except Exception:
-                    try:
-                        self._active_ws_map[st_id].discard(ws)
-                    except Exception:
-                        pass
-                    self._logger.info("Removed closed websocket during publish notify for station %s", st_id)
-
-        async def _notify_all(text: str):
-            for st_id in list(self._active_ws_map.keys()):
-                await _notify_station(st_id, text)
-
-        def _safe_task(coro):
-            task = asyncio.create_task(coro)
-            def _swallow_done(t):
-                try:
-                    t.result()
-                except Exception as e:
-                    logger.warning("Unhandled exception in notify task: %s", e)
-            task.add_done_callback(_swallow_done)
-            return task
-
-        try:
-            if notify_station:
-                self._loop.call_soon_threadsafe(_safe_task, _notify_station(notify_station, notify_text))
-            else:
-                self._loop.call_soon_threadsafe(_safe_task, _notify_all(notify_text))
-        except Exception:
-            self._logger.exception("Failed to schedule websocket notify task")
-            raise
\ No newline at end of file
+        # non-blocking: text is queued per socket (possibly in another worker)
+        if notify_station:
+            self._broadcast.publish(notify_station, notify_text)
+        else:
+            self._broadcast.publish_all(notify_text)
@@ -0,0 +1,111 @@
+# utils/series.py
+"""
+Encodage compact des séries capteurs (humidité, température, pompe...).
+
+Format (little-endian):
+  en-tête  <BBbI : version, flags, décimales (virgule fixe), nombre d'échantillons
+  bitmap   ceil(n/8) octets, bit à 1 = échantillon absent (None)   [si FLAG_NULLS]
+  valeurs  échantillons présents en entiers virgule fixe (round(v * 10^décimales)):
+           - FLAG_DELTA: deltas successifs, zigzag + varint (1 octet pour |delta| < 64)
+           - sinon: int32 packés
+Une courbe d'arrosage de 600 points à 0.01 près tient en ~700 octets au lieu de ~3 Ko de JSON.
+"""
+import struct
+from typing import Iterable, List, Optional
+
+SERIES_VERSION = 1
+FLAG_DELTA = 0x01
+FLAG_NULLS = 0x02
+
+DEFAULT_DECIMALS = 2
+
+_HEADER = struct.Struct("<BBbI")
+_INT32_MIN, _INT32_MAX = -(2 ** 31), 2 ** 31 - 1
+
+
+def _zigzag(n: int) -> int:
+    return (n << 1) ^ (n >> 63)
+
+
+def _unzigzag(n: int) -> int:
+    return (n >> 1) ^ -(n & 1)
+
+
+def _write_varint(out: bytearray, n: int) -> None:
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def encode_series(values: Iterable[Optional[float]], decimals: int = DEFAULT_DECIMALS, delta: bool = True) -> bytes:
+    values = list(values)
+    scale = 10 ** decimals
+    present = [v for v in values if v is not None]
+    fixed = [int(round(float(v) * scale)) for v in present]
+    if any(f < _INT32_MIN or f > _INT32_MAX for f in fixed):
+        raise ValueError("Series value out of range for fixed-point encoding")
+
+    flags = FLAG_DELTA if delta else 0
+    if len(present) != len(values):
+        flags |= FLAG_NULLS
+
+    out = bytearray(_HEADER.pack(SERIES_VERSION, flags, decimals, len(values)))
+    if flags & FLAG_NULLS:
+        bitmap = bytearray((len(values) + 7) // 8)
+        for i, v in enumerate(values):
+            if v is None:
+                bitmap[i >> 3] |= 1 << (i & 7)
+        out += bitmap
+
+    if delta:
+        previous = 0
+        for f in fixed:
+            _write_varint(out, _zigzag(f - previous))
+            previous = f
+    else:
+        out += struct.pack(f"<{len(fixed)}i", *fixed)
+    return bytes(out)
+
+
+def decode_series(blob: bytes | memoryview) -> List[Optional[float]]:
+    blob = bytes(blob)
+    if len(blob) < _HEADER.size:
+        raise ValueError("Truncated series header")
+    version, flags, decimals, count = _HEADER.unpack_from(blob)
+    if version != SERIES_VERSION:
+        raise ValueError(f"Unsupported series version {version}")
+    pos = _HEADER.size
+
+    missing = set()
+    if flags & FLAG_NULLS:
+        size = (count + 7) // 8
+        bitmap = blob[pos:pos + size]
+        pos += size
+        missing = {i for i in range(count) if bitmap[i >> 3] & (1 << (i & 7))}
+
+    n_present = count - len(missing)
+    if flags & FLAG_DELTA:
+        fixed = []
+        previous = 0
+        for _ in range(n_present):
+            n = shift = 0
+            while True:
+                if pos >= len(blob):
+                    raise ValueError("Truncated series data")
+                byte = blob[pos]
+                pos += 1
+                n |= (byte & 0x7F) << shift
+                shift += 7
+                if not byte & 0x80:
+                    break
+            previous += _unzigzag(n)
+            fixed.append(previous)
+    else:
+        if len(blob) < pos + 4 * n_present:
+            raise ValueError("Truncated series data")
+        fixed = list(struct.unpack_from(f"<{n_present}i", blob, pos))
+
+    scale = 10 ** decimals
+    present = iter(fixed)
+    return [None if i in missing else next(present) / scale for i in range(count)]
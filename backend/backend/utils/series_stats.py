@@ -0,0 +1,69 @@
+# utils/series_stats.py
+"""
+Statistiques des séries capteurs calculées côté serveur, en une passe NumPy pour
+toutes les séries d'un rapport: les séries sont empilées dans une matrice
+(séries x échantillons) complétée par NaN, puis chaque statistique est une
+réduction sur l'axe des échantillons. Les échantillons absents (None) sont ignorés.
+"""
+from typing import Mapping, Optional, Sequence
+
+import numpy as np
+
+# Un échantillon est aberrant au-delà de OUTLIER_SIGMAS écarts-types de la moyenne
+OUTLIER_SIGMAS = 3.0
+
+
+def _rounded(value) -> Optional[float]:
+    return None if value is None or not np.isfinite(value) else round(float(value), 4)
+
+
+def compute_series_stats(series: Mapping[str, Sequence[Optional[float]]]) -> dict[str, dict]:
+    """
+    series: {"soil_humidity": [...], "temperature": [...], ...}
+    Retourne par série: count, mean, std, sigma3, min, max, slope (unités par
+    échantillon, moindres carrés sur l'index) et outliers. Séries vides omises.
+    """
+    names = [name for name, values in series.items() if values and any(v is not None for v in values)]
+    if not names:
+        return {}
+
+    width = max(len(series[name]) for name in names)
+    matrix = np.full((len(names), width), np.nan)
+    for row, name in enumerate(names):
+        values = series[name]
+        matrix[row, :len(values)] = [np.nan if v is None else v for v in values]
+
+    present = ~np.isnan(matrix)
+    count = present.sum(axis=1)
+    filled = np.where(present, matrix, 0.0)
+
+    mean = filled.sum(axis=1) / count
+    centered = np.where(present, matrix - mean[:, None], 0.0)
+    std = np.sqrt((centered ** 2).sum(axis=1) / count)
+    minimum = np.where(present, matrix, np.inf).min(axis=1)
+    maximum = np.where(present, matrix, -np.inf).max(axis=1)
+
+    # pente: cov(index, valeur) / var(index), sur les seuls échantillons présents
+    index = np.broadcast_to(np.arange(width, dtype=float), matrix.shape)
+    index_mean = np.where(present, index, 0.0).sum(axis=1) / count
+    index_centered = np.where(present, index - index_mean[:, None], 0.0)
+    index_var = (index_centered ** 2).sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = np.where(index_var > 0, (index_centered * centered).sum(axis=1) / index_var, 0.0)
+
+    outliers = (np.abs(centered) > OUTLIER_SIGMAS * std[:, None]) & present & (std[:, None] > 0)
+    outlier_count = outliers.sum(axis=1)
+
+    return {
+        name: {
+            "count": int(count[row]),
+            "mean": _rounded(mean[row]),
+            "std": _rounded(std[row]),
+            "sigma3": _rounded(3 * std[row]),
+            "min": _rounded(minimum[row]),
+            "max": _rounded(maximum[row]),
+            "slope": _rounded(slope[row]),
+            "outliers": int(outlier_count[row]),
+        }
+        for row, name in enumerate(names)
+    }
@@ -287,15 +287,25 @@ def db_conn():
 
 from infrastructure.database import Database, set_db
 from infrastructure.pgpool import init_pool, close_pool
+from infrastructure.station_cache import station_cache
+from infrastructure.maintenance_sheet_cache import maintenance_sheet_cache
+from infrastructure.maintenance_schedule_cache import maintenance_schedule_cache
 
 @pytest.fixture(scope="function")
 def tests_database(db_conn):
     db = Database(conn=db_conn, commit_on_execute=False)
     set_db(db, global_fallback=True)
+    # les entrées en cache viendraient d'une transaction annulée
+    station_cache.clear()
+    maintenance_sheet_cache.clear()
+    maintenance_schedule_cache.clear()
     try:
         yield db
     finally:
         set_db(None, global_fallback=True)
+        station_cache.clear()
+        maintenance_sheet_cache.clear()
+        maintenance_schedule_cache.clear()
 
 @pytest.fixture(scope="session", autouse=True)
 def pg_pool_session():
@@ -0,0 +1,62 @@
+import pytest
+
+from entities.maintenance_sheet_registry import MaintenanceSheetRegistry
+from entities.models import MaintenanceSheet, User
+from entities.repositories import Repository
+
+
+@pytest.fixture(scope="function")
+def repo(tests_database) -> Repository:
+    return Repository(tests_database)
+
+
+@pytest.fixture(scope="function")
+def plant_id(repo) -> int:
+    user: User = repo.get_or_create_user(email="test@example.com", google_sub="test")
+    return repo.create_maintenance_sheet(MaintenanceSheet(
+        id=None, user_id=user.id, name="Fiche Monstera", scientific_name="Monstera Deliciosa",
+        common_name=None, taxonkey=None, taxon_rank=None, gbif_id=None, identification_source="Other",
+        confidence_score=None, min_soil_humidity=20, max_soil_humidity=60, min_lumens=None, max_lumens=None,
+        lumens_unit="lux", min_air_humidity=None, max_air_humidity=None, min_temperature=None,
+        max_temperature=None, min_watering_days_frequency=None, max_watering_days_frequency=None,
+        ideal_soil_humidity_after_watering=45,
+    ))
+
+
+class CountingRepository:
+    def __init__(self, repository: Repository):
+        self._repository = repository
+        self.calls = 0
+
+    def get_maintenance_sheet_ownership(self, id_):
+        self.calls += 1
+        return self._repository.get_maintenance_sheet_ownership(id_)
+
+
+class TestMaintenanceSheetRegistry:
+    class TestWhenOwnershipIsReadTwice:
+        def test_should_query_database_once(self, repo: Repository, plant_id: int):
+            # Arrange
+            counting = CountingRepository(repo)
+            registry = MaintenanceSheetRegistry(counting)
+
+            # Act
+            first = registry.get_ownership(plant_id)
+            second = registry.get_ownership(plant_id)
+
+            # Assert
+            assert counting.calls == 1
+            assert first == second
+            assert (first.min_soil_humidity, first.max_soil_humidity, first.ideal_soil_humidity_after_watering) == (20, 60, 45)
+
+    class TestWhenSheetIsDeleted:
+        def test_should_forget_cached_ownership(self, repo: Repository, plant_id: int):
+            # Arrange
+            registry = MaintenanceSheetRegistry(repo)
+            assert registry.get_ownership(plant_id) is not None
+
+            # Act
+            repo.delete_maintenance_sheet_for_user(plant_id)
+
+            # Assert
+            assert registry.get_ownership(plant_id) is None
@@ -0,0 +1,91 @@
+import hashlib
+from types import SimpleNamespace
+
+import pytest
+
+from entities.models import MaintenanceSheet, User
+from entities.repositories import Repository
+
+JPEG = b"\xff\xd8\xff\xe0" + b"fake jpeg payload" * 64
+
+
+@pytest.fixture(scope="function")
+def repo(tests_database) -> Repository:
+    return Repository(tests_database)
+
+
+@pytest.fixture(scope="function")
+def user(repo) -> User:
+    return repo.get_or_create_user(email="test@example.com", google_sub="test")
+
+
+def _sheet(user_id, name, photo=None) -> MaintenanceSheet:
+    return MaintenanceSheet(
+        id=None, user_id=user_id, name=name, scientific_name="Monstera Deliciosa", common_name=None,
+        taxonkey=None, taxon_rank=None, gbif_id=None, identification_source="Other", confidence_score=None,
+        min_soil_humidity=20, max_soil_humidity=60, min_lumens=None, max_lumens=None, lumens_unit="lux",
+        min_air_humidity=None, max_air_humidity=None, min_temperature=None, max_temperature=None,
+        min_watering_days_frequency=None, max_watering_days_frequency=None, photo=photo,
+    )
+
+
+class TestPhotoBlob:
+    class TestWhenTheSamePhotoIsStoredTwice:
+        def test_should_reference_a_single_blob(self, repo: Repository, user: User, tests_database):
+            # Arrange
+            first = repo.create_maintenance_sheet(_sheet(user.id, "Fiche 1", JPEG))
+            second = repo.create_maintenance_sheet(_sheet(user.id, "Fiche 2", JPEG))
+
+            # Act
+            sheets = {s.id: s for s in repo.list_all_maintenance_sheets_by_user_id(user.id)}
+            blobs = tests_database.query("SELECT count(*) FROM photo_blob WHERE content_hash = %s;",
+                                         (hashlib.sha256(JPEG).hexdigest(),))
+
+            # Assert
+            assert sheets[first].photo_id == sheets[second].photo_id
+            assert blobs[0][0] == 1
+
+    class TestWhenReadingSheets:
+        def test_should_expose_the_hash_but_never_the_bytes(self, repo: Repository, user: User):
+            # Arrange
+            sheet_id = repo.create_maintenance_sheet(_sheet(user.id, "Fiche", JPEG))
+
+            # Act
+            sheet = repo.get_maintenance_sheet_by_id(sheet_id)
+            blob = repo.get_photo_blob(sheet.photo_id)
+
+            # Assert
+            assert sheet.photo is None
+            assert sheet.photo_hash == hashlib.sha256(JPEG).hexdigest()
+            assert blob.content_type == "image/jpeg"
+            assert repo.get_photo_contents([sheet.photo_id]) == {sheet.photo_id: JPEG}
+
+    class TestWhenAKnownPhotoComesWithThumbnails:
+        def test_should_add_the_missing_thumbnails(self, repo: Repository):
+            # Arrange
+            photo_id = repo.store_photo(JPEG)
+            small = SimpleNamespace(content=b"small", content_type="image/webp", width=64, height=64)
+
+            # Act
+            same_id = repo.store_photo(JPEG, variants={"small": small})
+
+            # Assert
+            assert same_id == photo_id
+            assert repo.get_photo_variant(photo_id, "small").variant == "small"
+
+    class TestWhenSheetsAreDeleted:
+        def test_should_delete_the_photo_with_its_last_sheet(self, repo: Repository, user: User):
+            # Arrange
+            first = repo.create_maintenance_sheet(_sheet(user.id, "Fiche 1", JPEG))
+            second = repo.create_maintenance_sheet(_sheet(user.id, "Fiche 2", JPEG))
+            photo_id = repo.get_maintenance_sheet_by_id(first).photo_id
+
+            # Act
+            repo.delete_maintenance_sheet_for_user(first)
+            still_shared = repo.get_photo_blob(photo_id)
+            repo.delete_maintenance_sheet_for_user(second)
+
+            # Assert
+            assert still_shared is not None
+            assert repo.get_photo_blob(photo_id) is None
+            assert photo_id not in repo.list_unreferenced_photo_ids()
@@ -0,0 +1,115 @@
+import pytest
+
+from entities.models import MaintenanceSheet, User
+from entities.repositories import Repository
+
+
+@pytest.fixture(scope="function")
+def repo(tests_database) -> Repository:
+    return Repository(tests_database)
+
+
+@pytest.fixture(scope="function")
+def user(repo) -> User:
+    return repo.get_or_create_user(email="test@example.com", google_sub="test")
+
+
+@pytest.fixture(scope="function")
+def plant_id(repo, user) -> int:
+    sheet = MaintenanceSheet(
+        id=None,
+        user_id=user.id,
+        name="Fiche Monstera",
+        scientific_name="Monstera Deliciosa",
+        common_name="Plante gruyère",
+        taxonkey=123,
+        taxon_rank="species",
+        gbif_id=456,
+        identification_source="Other",
+        confidence_score=90,
+        min_soil_humidity=20,
+        max_soil_humidity=60,
+        min_lumens=1000,
+        max_lumens=5000,
+        lumens_unit="lux",
+        min_air_humidity=40,
+        max_air_humidity=80,
+        min_temperature=18,
+        max_temperature=28,
+        min_watering_days_frequency=3,
+        max_watering_days_frequency=7,
+        created_at=None,
+        updated_at=None,
+    )
+    return repo.create_maintenance_sheet(sheet)
+
+
+def _watering(repo, plant_id, humidity):
+    return repo.create_watering_report(plant_id, humidity, 1.0, 40.0, None, None)
+
+
+class TestPlantLatestState:
+    class TestWhenReportsAreCreated:
+        def test_should_keep_last_report_and_last_report_above_target(self, repo: Repository, user: User, plant_id: int):
+            # Arrange (cible = (20 + 60) / 2 = 40)
+            above_id = _watering(repo, plant_id, 55.0)
+            below_id = _watering(repo, plant_id, 30.0)
+            express_id = repo.create_express_analysis_report(plant_id, 45.0, 21.0, 50.0, 800.0, None, None, None, None)
+
+            # Act
+            [state] = repo.get_last_feeled_humidity(user.id)
+
+            # Assert
+            assert state.last_watering_id == below_id
+            assert state.last_watering_above_target_id == above_id
+            assert state.last_express_id == express_id
+            assert state.last_express_above_target_id == express_id
+            assert state.last_express_air_humidity == 50.0
+
+    class TestWhenLastReportIsDeleted:
+        def test_should_fall_back_to_previous_report(self, repo: Repository, user: User, plant_id: int):
+            # Arrange
+            first_id = _watering(repo, plant_id, 55.0)
+            last_id = _watering(repo, plant_id, 56.0)
+
+            # Act
+            repo.delete_watering_report_by_id(last_id)
+            [state] = repo.get_last_feeled_humidity(user.id)
+
+            # Assert
+            assert state.last_watering_id == first_id
+            assert state.last_watering_above_target_id == first_id
+
+    class TestWhenRebuilt:
+        def test_should_match_incrementally_maintained_state(self, repo: Repository, user: User, plant_id: int, tests_database):
+            # Arrange
+            _watering(repo, plant_id, 55.0)
+            _watering(repo, plant_id, 30.0)
+            [expected] = repo.get_last_feeled_humidity(user.id)
+            tests_database.execute("DELETE FROM plant_latest_state WHERE plant_id = %s;", (plant_id,))
+
+            # Act
+            refreshed = repo.rebuild_plant_latest_state(plant_id)
+            [state] = repo.get_last_feeled_humidity(user.id)
+
+            # Assert
+            assert refreshed == 1
+            assert state == expected
+
+    class TestWhenReportsAreInsertedInBatch:
+        def test_should_return_ids_in_order_and_keep_latest_per_plant(self, repo: Repository, user: User, plant_id: int):
+            # Arrange (cible = 40)
+            reports = [
+                dict(plant_id=plant_id, soil_humidity_mean=55.0, sigma3=1.0, target_humidity=40.0),
+                dict(plant_id=plant_id, soil_humidity_mean=30.0, sigma3=1.0, target_humidity=40.0),
+            ]
+
+            # Act
+            ids = repo.create_watering_reports(reports)
+            [state] = repo.get_last_feeled_humidity(user.id)
+
+            # Assert
+            assert ids == sorted(ids)
+            assert repo.get_watering_report_by_id(ids[0]).soil_humidity_mean == 55.0
+            assert state.last_watering_id == ids[1]
+            assert state.last_watering_above_target_id == ids[0]
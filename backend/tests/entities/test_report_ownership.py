@@ -0,0 +1,64 @@
+import pytest
+
+from entities.models import MaintenanceSheet, User
+from entities.repositories import Repository
+
+
+@pytest.fixture(scope="function")
+def repo(tests_database) -> Repository:
+    return Repository(tests_database)
+
+
+@pytest.fixture(scope="function")
+def owner(repo) -> User:
+    return repo.get_or_create_user(email="owner@example.com", google_sub="owner")
+
+
+@pytest.fixture(scope="function")
+def plant_id(repo, owner) -> int:
+    sheet = MaintenanceSheet(
+        id=None, user_id=owner.id, name="Fiche Monstera", scientific_name="Monstera Deliciosa",
+        common_name="Plante gruyère", taxonkey=123, taxon_rank="species", gbif_id=456,
+        identification_source="Other", confidence_score=90,
+        min_soil_humidity=20, max_soil_humidity=60, min_lumens=1000, max_lumens=5000, lumens_unit="lux",
+        min_air_humidity=40, max_air_humidity=80, min_temperature=18, max_temperature=28,
+        min_watering_days_frequency=3, max_watering_days_frequency=7,
+    )
+    return repo.create_maintenance_sheet(sheet)
+
+
+class TestReportForUser:
+    class TestWhenTheUserOwnsTheSheet:
+        def test_should_return_the_reports(self, repo: Repository, owner: User, plant_id: int):
+            # Arrange
+            watering_id = repo.create_watering_report(plant_id, 45.0, 1.0, 40.0, [30.0, 31.0], [None, 100.0])
+            express_id = repo.create_express_analysis_report(
+                plant_id, soil_humidity_mean=40.0, temperature_mean=21.0, air_humidity_mean=50.0,
+                lumens_mean=1200.0, soil_humidity_data=[40.0], temperature_data=[21.0],
+                air_humidity_data=[50.0], lumens_data=[1200.0],
+            )
+
+            # Act
+            watering = repo.get_watering_report_for_user(watering_id, owner.id)
+            express = repo.get_express_analysis_report_for_user(express_id, owner.id)
+
+            # Assert
+            assert watering.id == watering_id
+            assert watering.pump_data == repo.get_watering_report_by_id(watering_id).pump_data
+            assert express.id == express_id
+            assert express.soil_humidity_data == repo.get_express_analysis_report_by_id(express_id).soil_humidity_data
+
+    class TestWhenTheSheetBelongsToAnotherUser:
+        def test_should_return_none(self, repo: Repository, plant_id: int):
+            # Arrange
+            other: User = repo.get_or_create_user(email="other@example.com", google_sub="other")
+            watering_id = repo.create_watering_report(plant_id, 45.0, 1.0, 40.0, [30.0], [None])
+            express_id = repo.create_express_analysis_report(
+                plant_id, soil_humidity_mean=40.0, temperature_mean=21.0, air_humidity_mean=50.0,
+                lumens_mean=1200.0, soil_humidity_data=[40.0], temperature_data=[21.0],
+                air_humidity_data=[50.0], lumens_data=[1200.0],
+            )
+
+            # Act / Assert
+            assert repo.get_watering_report_for_user(watering_id, other.id) is None
+            assert repo.get_express_analysis_report_for_user(express_id, other.id) is None
@@ -0,0 +1,95 @@
+import pytest
+
+from entities.models import MaintenanceSheet, User
+from entities.repositories import Repository
+
+
+@pytest.fixture(scope="function")
+def repo(tests_database) -> Repository:
+    return Repository(tests_database)
+
+
+@pytest.fixture(scope="function")
+def plant_id(repo) -> int:
+    user: User = repo.get_or_create_user(email="test@example.com", google_sub="test")
+    sheet = MaintenanceSheet(
+        id=None, user_id=user.id, name="Fiche Monstera", scientific_name="Monstera Deliciosa",
+        common_name="Plante gruyère", taxonkey=123, taxon_rank="species", gbif_id=456,
+        identification_source="Other", confidence_score=90,
+        min_soil_humidity=20, max_soil_humidity=60, min_lumens=1000, max_lumens=5000, lumens_unit="lux",
+        min_air_humidity=40, max_air_humidity=80, min_temperature=18, max_temperature=28,
+        min_watering_days_frequency=3, max_watering_days_frequency=7,
+    )
+    return repo.create_maintenance_sheet(sheet)
+
+
+def _partition_of(tests_database, table, report_id):
+    return tests_database.query(f"SELECT tableoid::regclass::text FROM {table} WHERE id = %s", (report_id,))[0][0]
+
+
+class TestReportPartitions:
+    class TestWhenAReportIsCreated:
+        def test_should_land_in_the_current_month_partition(self, repo: Repository, plant_id: int, tests_database):
+            # Arrange
+            repo.ensure_report_partitions()
+            current = tests_database.query("SELECT to_char(now() AT TIME ZONE 'UTC', 'YYYY_MM')")[0][0]
+
+            # Act
+            report_id = repo.create_watering_report(plant_id, 45.0, 1.0, 40.0, None, None)
+
+            # Assert
+            assert _partition_of(tests_database, "watering_report", report_id) == f"watering_report_p{current}"
+
+        def test_should_create_partitions_ahead_only_once(self, repo: Repository):
+            # Arrange
+            repo.ensure_report_partitions(months_ahead=4)
+
+            # Act / Assert
+            assert repo.ensure_report_partitions(months_ahead=4) == 0
+
+    class TestWhenRetentionIsApplied:
+        def test_should_drop_expired_months_and_keep_latest_state_consistent(self, repo: Repository, plant_id: int, tests_database):
+            # Arrange
+            tests_database.query("SELECT ensure_report_partitions(0, (now() - interval '30 months')::date)")
+            [(old_id,)] = tests_database.query(
+                """
+                INSERT INTO watering_report (plant_id, soil_humidity_mean, sigma3, target_humidity, created_at)
+                VALUES (%s, 55, 1, 40, now() - interval '30 months') RETURNING id
+                """,
+                (plant_id,)
+            )
+            repo.rebuild_plant_latest_state(plant_id)
+            recent_id = repo.create_watering_report(plant_id, 45.0, 1.0, 40.0, None, None)
+
+            # Act
+            dropped = repo.drop_report_partitions_older_than(24)
+
+            # Assert
+            assert dropped >= 2
+            assert repo.get_watering_report_by_id(old_id) is None
+            assert repo.get_watering_report_by_id(recent_id) is not None
+            [state] = tests_database.query(
+                "SELECT last_watering_id, last_watering_above_target_id FROM plant_latest_state WHERE plant_id = %s",
+                (plant_id,)
+            )
+            assert state == (recent_id, None)
+
+    class TestWhenRowsWaitInTheDefaultPartition:
+        def test_should_move_them_into_the_new_month(self, repo: Repository, plant_id: int, tests_database):
+            # Arrange: aucun mois créé si loin, la ligne tombe dans la partition par défaut
+            [(future_id,)] = tests_database.query(
+                """
+                INSERT INTO watering_report (plant_id, soil_humidity_mean, sigma3, target_humidity, created_at)
+                VALUES (%s, 55, 1, 40, now() + interval '20 months') RETURNING id
+                """,
+                (plant_id,)
+            )
+            assert _partition_of(tests_database, "watering_report", future_id) == "watering_report_default"
+
+            # Act
+            repo.ensure_report_partitions(months_ahead=21)
+
+            # Assert
+            month = tests_database.query(
+                "SELECT to_char((now() + interval '20 months') AT TIME ZONE 'UTC', 'YYYY_MM')")[0][0]
+            assert _partition_of(tests_database, "watering_report", future_id) == f"watering_report_p{month}"
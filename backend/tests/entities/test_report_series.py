@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+from entities.models import MaintenanceSheet, User
+from entities.repositories import Repository
+
+
+@pytest.fixture(scope="function")
+def repo(tests_database) -> Repository:
+    return Repository(tests_database)
+
+
+@pytest.fixture(scope="function")
+def plant_id(repo) -> int:
+    user: User = repo.get_or_create_user(email="test@example.com", google_sub="test")
+    sheet = MaintenanceSheet(
+        id=None, user_id=user.id, name="Fiche Monstera", scientific_name="Monstera Deliciosa",
+        common_name="Plante gruyère", taxonkey=123, taxon_rank="species", gbif_id=456,
+        identification_source="Other", confidence_score=90,
+        min_soil_humidity=20, max_soil_humidity=60, min_lumens=1000, max_lumens=5000, lumens_unit="lux",
+        min_air_humidity=40, max_air_humidity=80, min_temperature=18, max_temperature=28,
+        min_watering_days_frequency=3, max_watering_days_frequency=7,
+    )
+    return repo.create_maintenance_sheet(sheet)
+
+
+class TestReportSeries:
+    class TestWhenAWateringCurveHas600Samples:
+        def test_should_store_it_and_return_it_as_json(self, repo: Repository, plant_id: int):
+            # Arrange
+            humidity = [round(30 + i * 0.05, 2) for i in range(600)]
+            pump = [None] * 10 + [100.0] * 590
+
+            # Act
+            report_id = repo.create_watering_report(plant_id, 45.0, 1.0, 40.0, humidity, pump,
+                                                    stats={"soil_humidity": {"count": 600}})
+            report = repo.get_watering_report_by_id(report_id)
+
+            # Assert
+            assert json.loads(report.soil_humidity_data) == humidity
+            assert json.loads(report.pump_data) == pump
+            assert report.stats == {"soil_humidity": {"count": 600}}
+
+    class TestWhenAReportStillHasLegacyJson:
+        def test_should_pack_it_and_keep_the_same_api_value(self, repo: Repository, plant_id: int, tests_database):
+            # Arrange
+            rows = tests_database.query(
+                """
+                INSERT INTO express_analysis_report (plant_id, analysis_type, soil_humidity_data, temperature_data)
+                VALUES (%s, 'express', '[40.5,null,41]', '[21.5]') RETURNING id
+                """,
+                (plant_id,)
+            )
+            report_id = rows[0][0]
+            before = repo.get_express_analysis_report_by_id(report_id)
+
+            # Act
+            packed = repo.pack_legacy_report_series("express_analysis_report")
+            after = repo.get_express_analysis_report_by_id(report_id)
+
+            # Assert
+            assert packed == 1
+            assert json.loads(after.soil_humidity_data) == json.loads(before.soil_humidity_data)
+            assert json.loads(after.temperature_data) == [21.5]
+            assert repo.pack_legacy_report_series("express_analysis_report") == 0
@@ -0,0 +1,119 @@
+import pytest
+
+from entities.models import User
+from entities.repositories import Repository
+from infrastructure.database import Database
+
+PLANTS = 40
+REPORTS_PER_PLANT = 500
+
+
+class ExplainingDatabase(Database):
+    """Database qui remplace chaque requête par son EXPLAIN et garde les plans."""
+
+    def __init__(self, conn):
+        super().__init__(conn, commit_on_execute=False)
+        self.plans = []
+
+    def query(self, sql, params=None, statement_name=None):
+        cur = self.conn.cursor()
+        try:
+            cur.execute("EXPLAIN (FORMAT JSON) " + sql.strip().rstrip(";"), params or ())
+            self.plans.append(cur.fetchone()[0][0]["Plan"])
+        finally:
+            cur.close()
+        return []
+
+
+def _nodes(plan):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _nodes(child)
+
+
+def _scans_on(plan, relation, only=None):
+    # tables partitionnées: les scans portent sur les partitions (<table>_p2025_03, <table>_default)
+    return {
+        node["Node Type"] for node in _nodes(plan)
+        if (node.get("Relation Name") == relation or node.get("Relation Name", "").startswith(relation + "_"))
+        and (only is None or node["Relation Name"] in only)
+    }
+
+
+def _populated_partitions(db, relation):
+    # le planner parcourt séquentiellement les partitions vides (mois à venir, défaut): sans coût
+    return {row[0] for row in db.query(f"SELECT DISTINCT tableoid::regclass::text FROM {relation};")}
+
+
+@pytest.fixture(scope="function")
+def user(tests_database) -> User:
+    return Repository(tests_database).get_or_create_user(email="test@example.com", google_sub="test")
+
+
+@pytest.fixture(scope="function")
+def plant_id(tests_database, user) -> int:
+    # Jeu de données volumineux: plusieurs utilisateurs, historique long par plante
+    other = Repository(tests_database).get_or_create_user(email="other@example.com", google_sub="other")
+    tests_database.execute(
+        """
+        INSERT INTO maintenance_sheet (user_id, name, scientific_name, min_soil_humidity, max_soil_humidity)
+        SELECT CASE WHEN g = 1 THEN %s ELSE %s END, 'Plante ' || g, 'Monstera Deliciosa', 20, 60
+        FROM generate_series(1, %s) g;
+        """,
+        (user.id, other.id, PLANTS)
+    )
+    tests_database.execute(
+        """
+        INSERT INTO express_analysis_report (plant_id, analysis_type, soil_humidity_mean, lumens_mean,
+                                             air_humidity_mean, temperature_mean, created_at)
+        SELECT ms.id, 'express', random() * 100, random() * 5000, random() * 100, 20,
+               now() - g * interval '1 hour'
+        FROM maintenance_sheet ms, generate_series(1, %s) g
+        WHERE ms.user_id IN (%s, %s);
+        """,
+        (REPORTS_PER_PLANT, user.id, other.id)
+    )
+    tests_database.execute(
+        """
+        INSERT INTO watering_report (plant_id, soil_humidity_mean, sigma3, target_humidity, created_at)
+        SELECT ms.id, random() * 100, 1, 40, now() - g * interval '1 hour'
+        FROM maintenance_sheet ms, generate_series(1, %s) g
+        WHERE ms.user_id IN (%s, %s);
+        """,
+        (REPORTS_PER_PLANT, user.id, other.id)
+    )
+    tests_database.execute("ANALYZE maintenance_sheet;")
+    tests_database.execute("ANALYZE express_analysis_report;")
+    tests_database.execute("ANALYZE watering_report;")
+    return tests_database.query("SELECT id FROM maintenance_sheet WHERE user_id = %s;", (user.id,))[0][0]
+
+
+class TestReportTimelineIndexes:
+    class TestWhenListingMaintenanceSummaries:
+        def test_should_scan_report_indexes_instead_of_tables(self, tests_database, user: User, plant_id: int):
+            # Arrange
+            db = ExplainingDatabase(tests_database.conn)
+
+            # Act
+            Repository(db).list_maintenance_summaries(plant_id=plant_id, user_id=user.id, limit=20)
+
+            # Assert
+            [plan] = db.plans
+            assert _scans_on(plan, "express_analysis_report") <= {"Index Scan", "Index Only Scan"}
+            assert _scans_on(plan, "watering_report") <= {"Index Scan", "Index Only Scan"}
+            assert _scans_on(plan, "express_analysis_report")
+            assert _scans_on(plan, "watering_report")
+
+    class TestWhenListingExpressReportsOfAUser:
+        def test_should_not_scan_the_whole_report_table(self, tests_database, user: User, plant_id: int):
+            # Arrange
+            db = ExplainingDatabase(tests_database.conn)
+
+            # Act
+            Repository(db).list_all_express_reports(user.id)
+
+            # Assert
+            [plan] = db.plans
+            populated = _populated_partitions(tests_database, "express_analysis_report")
+            assert "Seq Scan" not in _scans_on(plan, "express_analysis_report", only=populated)
+            assert _scans_on(plan, "express_analysis_report", only=populated)
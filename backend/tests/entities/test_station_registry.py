@@ -0,0 +1,90 @@
+import pytest
+
+from entities.models import Station
+from entities.repositories import Repository
+from entities.station_registry import StationRegistry
+from infrastructure.station_cache import station_cache, station_key, StationCacheListener
+from utils.ttl_cache import MISSING
+
+
+@pytest.fixture(scope="function")
+def repo(tests_database) -> Repository:
+    return Repository(tests_database)
+
+
+@pytest.fixture(scope="function")
+def registry(repo) -> StationRegistry:
+    return StationRegistry(repo)
+
+
+class CountingRepository:
+    def __init__(self, repository: Repository):
+        self._repository = repository
+        self.calls = 0
+
+    def get_station_by_mac_address(self, mac_adress):
+        self.calls += 1
+        return self._repository.get_station_by_mac_address(mac_adress)
+
+
+class TestStationRegistry:
+    class TestWhenStationIsReadTwice:
+        def test_should_query_database_once(self, repo: Repository):
+            # Arrange
+            repo.create_station(Station(id=None, user_id=None, name="Station", location="loc", mac_adress="AABBCCDDEEFF"))
+            counting = CountingRepository(repo)
+            registry = StationRegistry(counting)
+
+            # Act
+            first = registry.get_station_by_mac_address("AABBCCDDEEFF")
+            second = registry.get_station_by_mac_address("AABBCCDDEEFF")
+
+            # Assert
+            assert counting.calls == 1
+            assert first == second
+            assert first is not second
+
+    class TestWhenStationIsUpdated:
+        def test_should_invalidate_old_and_new_keys(self, repo: Repository, registry: StationRegistry):
+            # Arrange
+            station = Station(id=None, user_id=None, name="Station", location="loc",
+                              mac_adress="AABBCCDDEEFF", pairing_code="Aurore")
+            repo.create_station(station)
+            registry.get_station_by_mac_address("AABBCCDDEEFF")
+            registry.get_station_by_pairing_code("Aurore")
+            registry.get_station_by_pairing_code("Boreal")
+
+            # Act
+            station.pairing_code = "Boreal"
+            updated = repo.update_station(station)
+
+            # Assert
+            assert updated
+            assert station_cache.get(station_key("mac_adress", "AABBCCDDEEFF")) is MISSING
+            assert station_cache.get(station_key("pairing_code", "Aurore")) is MISSING
+            assert registry.get_station_by_pairing_code("Boreal").id == station.id
+
+    class TestWhenStationIsCreated:
+        def test_should_forget_cached_absence(self, repo: Repository, registry: StationRegistry):
+            # Arrange
+            assert registry.get_station_by_mac_address("AABBCCDDEEFF") is None
+
+            # Act
+            repo.create_station(Station(id=None, user_id=None, name="Station", location="loc", mac_adress="AABBCCDDEEFF"))
+
+            # Assert
+            assert registry.get_station_by_mac_address("AABBCCDDEEFF") is not None
+
+
+class TestStationCacheListener:
+    def test_should_invalidate_keys_from_notification(self):
+        # Arrange
+        station_cache.set(station_key("mac_adress", "AABBCCDDEEFF"), None)
+        station_cache.set(station_key("id", 42), None)
+
+        # Act
+        StationCacheListener.handle('{"id": [null, 42], "mac_adress": [null, "AABBCCDDEEFF"], "pairing_code": [null, null]}')
+
+        # Assert
+        assert station_cache.get(station_key("mac_adress", "AABBCCDDEEFF")) is MISSING
+        assert station_cache.get(station_key("id", 42)) is MISSING
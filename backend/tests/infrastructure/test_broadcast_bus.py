@@ -0,0 +1,89 @@
+import fnmatch
+from types import SimpleNamespace
+
+from infrastructure.broadcast_bus import InProcessBroadcastBus, MqttBroadcastBus
+
+
+class FakeBroker:
+    """Broker partagé par plusieurs FakeMqttClient (un par worker)."""
+
+    def __init__(self):
+        self.subscriptions = []
+
+    def deliver(self, topic, payload):
+        for pattern, callback in list(self.subscriptions):
+            if fnmatch.fnmatch(topic, pattern.replace("#", "*")):
+                callback(None, None, SimpleNamespace(topic=topic, payload=payload.encode()))
+
+
+class FakeMqttClient:
+    def __init__(self, broker: FakeBroker):
+        self._broker = broker
+
+    def register_callback(self, topic, callback):
+        self._broker.subscriptions.append((topic, callback))
+
+    def publish(self, topic, payload, retain=False):
+        self._broker.deliver(topic, payload)
+
+
+class FakeFanout:
+    def __init__(self, stations=()):
+        self.stations = set(stations)
+        self.published = []
+
+    def connection_count(self, station_id=None):
+        return 1 if station_id in self.stations else 0
+
+    def publish(self, station_id, message):
+        self.published.append((station_id, message))
+
+    def publish_all(self, message):
+        self.published.append((None, message))
+
+
+class TestMqttBroadcastBus:
+    class TestWhenSocketLivesInAnotherWorker:
+        def test_should_deliver_only_in_the_worker_holding_it(self):
+            # Arrange
+            broker = FakeBroker()
+            worker_a, worker_b = FakeFanout(), FakeFanout(stations={"aa:bb"})
+            bus_a = MqttBroadcastBus(worker_a, FakeMqttClient(broker)).start()
+            MqttBroadcastBus(worker_b, FakeMqttClient(broker)).start()
+
+            # Act
+            bus_a.publish("aa:bb", {"type": "command"})
+
+            # Assert
+            assert worker_a.published == []
+            assert worker_b.published == [("aa:bb", '{"type": "command"}')]
+
+    class TestWhenPublishingToAll:
+        def test_should_deliver_in_every_worker(self):
+            # Arrange
+            broker = FakeBroker()
+            worker_a, worker_b = FakeFanout(), FakeFanout()
+            bus_a = MqttBroadcastBus(worker_a, FakeMqttClient(broker)).start()
+            bus_b = MqttBroadcastBus(worker_b, FakeMqttClient(broker)).start()
+
+            # Act
+            bus_a.publish_all("hello")
+
+            # Assert
+            assert worker_a.published == [(None, "hello")]
+            assert worker_b.published == [(None, "hello")]
+            assert bus_a.metrics()["published_total"] == 1
+            assert bus_b.metrics()["received_total"] == 1
+
+
+class TestInProcessBroadcastBus:
+    def test_should_deliver_to_local_fanout(self):
+        # Arrange
+        fanout = FakeFanout()
+        bus = InProcessBroadcastBus(fanout).start()
+
+        # Act
+        bus.publish("aa:bb", "hello")
+
+        # Assert
+        assert fanout.published == [("aa:bb", "hello")]
@@ -0,0 +1,68 @@
+import io
+
+import pytest
+from PIL import Image
+
+from infrastructure.image_pipeline import process_photo, ingest_photo, shutdown_image_pool, InvalidPhotoError, \
+    MAX_DIMENSION, THUMBNAIL_SIZES
+
+EXIF_ORIENTATION = 0x0112
+EXIF_GPS = 0x8825
+
+
+def _camera_jpeg(width, height, orientation=1) -> bytes:
+    image = Image.new("RGB", (width, height), (40, 120, 40))
+    exif = Image.Exif()
+    exif[EXIF_ORIENTATION] = orientation
+    exif[EXIF_GPS] = {1: "N"}
+    out = io.BytesIO()
+    image.save(out, format="JPEG", exif=exif)
+    return out.getvalue()
+
+
+class TestProcessPhoto:
+    class TestWhenPhotoComesFromACamera:
+        def test_should_rotate_downsize_and_strip_metadata(self):
+            # Arrange: capteur paysage, téléphone tenu en portrait (orientation 6 = 90°)
+            content = _camera_jpeg(4000, 3000, orientation=6)
+
+            # Act
+            processed = process_photo(content)
+
+            # Assert
+            original = Image.open(io.BytesIO(processed.original.content))
+            assert (original.width, original.height) == (MAX_DIMENSION * 3 // 4, MAX_DIMENSION)
+            assert not original.getexif()
+            assert processed.original.content_type == "image/jpeg"
+
+        def test_should_produce_fixed_size_thumbnails(self):
+            # Act
+            processed = process_photo(_camera_jpeg(1200, 800))
+
+            # Assert
+            for name, size in THUMBNAIL_SIZES.items():
+                thumbnail = processed.variants[name]
+                assert (thumbnail.width, thumbnail.height) == (size, size)
+                assert Image.open(io.BytesIO(thumbnail.content)).size == (size, size)
+
+    class TestWhenContentIsNotAnImage:
+        def test_should_raise_invalid_photo(self):
+            # Act / Assert
+            with pytest.raises(InvalidPhotoError):
+                process_photo(b"not an image")
+
+
+class TestIngestPhoto:
+    def test_should_process_in_the_process_pool(self):
+        # Arrange
+        content = _camera_jpeg(600, 400)
+
+        # Act
+        try:
+            processed = ingest_photo(content, timeout=60)
+        finally:
+            shutdown_image_pool()
+
+        # Assert
+        assert (processed.original.width, processed.original.height) == (600, 400)
+        assert set(processed.variants) == set(THUMBNAIL_SIZES)
@@ -0,0 +1,180 @@
+import threading
+
+import pytest
+
+from infrastructure.ingestion_queue import IngestionQueue, ShardedIngestionQueue, DROP_NEWEST, DROP_OLDEST, BLOCK
+
+
+@pytest.fixture(scope="function")
+def gate():
+    # Bloque le worker unique tant que le test ne l'a pas relâché
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+def _blocked_queue(gate, **options):
+    queue = IngestionQueue(workers=1, **options).start()
+    started = threading.Event()
+
+    def _blocker():
+        started.set()
+        gate.wait(2)
+
+    queue.submit(_blocker)
+    started.wait(2)
+    return queue
+
+
+class TestIngestionQueue:
+    class TestWhenWorkersAreIdle:
+        def test_should_run_every_submitted_task(self):
+            # Arrange
+            queue = IngestionQueue(workers=3, maxsize=10).start()
+            done = []
+            lock = threading.Lock()
+
+            def _task(i):
+                with lock:
+                    done.append(i)
+
+            # Act
+            for i in range(10):
+                assert queue.submit(lambda i=i: _task(i))
+            queue.stop(timeout=2)
+
+            # Assert
+            assert sorted(done) == list(range(10))
+            metrics = queue.metrics()
+            assert metrics["processed_total"] == 10
+            assert metrics["wait_latency_ms"]["count"] == 10
+
+        def test_should_count_failed_tasks_without_killing_the_worker(self):
+            # Arrange
+            queue = IngestionQueue(workers=1, maxsize=10).start()
+            done = threading.Event()
+
+            def _boom():
+                raise RuntimeError("insert failed")
+
+            # Act
+            queue.submit(_boom)
+            queue.submit(done.set)
+
+            # Assert
+            assert done.wait(2)
+            queue.stop(timeout=2)
+            assert queue.metrics()["failed_total"] == 1
+            assert queue.metrics()["processed_total"] == 1
+
+    class TestWhenQueueIsFull:
+        def test_should_reject_incoming_task_with_drop_newest(self, gate):
+            # Arrange
+            queue = _blocked_queue(gate, maxsize=1, overflow_policy=DROP_NEWEST)
+            ran = []
+            queue.submit(lambda: ran.append("first"))
+
+            # Act
+            accepted = queue.submit(lambda: ran.append("second"))
+            gate.set()
+            queue.stop(timeout=2)
+
+            # Assert
+            assert accepted is False
+            assert ran == ["first"]
+            assert queue.metrics()["dropped_total"] == 1
+
+        def test_should_evict_oldest_task_with_drop_oldest(self, gate):
+            # Arrange
+            queue = _blocked_queue(gate, maxsize=1, overflow_policy=DROP_OLDEST)
+            ran = []
+            queue.submit(lambda: ran.append("first"))
+
+            # Act
+            accepted = queue.submit(lambda: ran.append("second"))
+            gate.set()
+            queue.stop(timeout=2)
+
+            # Assert
+            assert accepted is True
+            assert ran == ["second"]
+            assert queue.metrics()["max_depth"] == 1
+
+        def test_should_give_up_after_block_timeout_with_block(self, gate):
+            # Arrange
+            queue = _blocked_queue(gate, maxsize=1, overflow_policy=BLOCK, block_timeout=0.05)
+            queue.submit(lambda: None)
+
+            # Act
+            accepted = queue.submit(lambda: None)
+
+            # Assert
+            assert accepted is False
+            assert queue.metrics()["depth"] == 1
+            assert queue.metrics()["dropped_total"] == 1
+
+    class TestWhenStopped:
+        def test_should_refuse_new_tasks(self):
+            # Arrange
+            queue = IngestionQueue(workers=1).start()
+            queue.stop(timeout=1)
+
+            # Act
+            accepted = queue.submit(lambda: None)
+
+            # Assert
+            assert accepted is False
+
+
+class TestShardedIngestionQueue:
+    class TestWhenMessagesComeFromOneStation:
+        def test_should_process_them_in_arrival_order(self):
+            # Arrange
+            queue = ShardedIngestionQueue(lanes=4, maxsize=400).start()
+            done = []
+
+            # Act
+            for i in range(50):
+                queue.submit("AA:BB:CC:DD:EE:FF", lambda i=i: done.append(i))
+            queue.stop(timeout=2)
+
+            # Assert
+            assert done == list(range(50))
+
+        def test_should_always_route_a_station_to_the_same_lane(self):
+            # Arrange
+            queue = ShardedIngestionQueue(lanes=8)
+
+            # Act
+            lanes = {queue.lane_for("station-42") for _ in range(10)}
+
+            # Assert
+            assert lanes == {ShardedIngestionQueue(lanes=8).lane_for("station-42")}
+
+    class TestWhenOneStationIsSlow:
+        def test_should_not_delay_other_stations(self, gate):
+            # Arrange
+            queue = ShardedIngestionQueue(lanes=2, maxsize=20).start()
+            slow, fast = _keys_on_distinct_lanes(queue)
+            done = threading.Event()
+
+            # Act
+            queue.submit(slow, lambda: gate.wait(2))
+            queue.submit(fast, done.set)
+
+            # Assert
+            assert done.wait(1)
+            metrics = queue.metrics()
+            assert metrics["lanes"][queue.lane_for(slow)]["busy"] == 1
+            gate.set()
+            queue.stop(timeout=2)
+            assert queue.metrics()["processed_total"] == 2
+
+
+def _keys_on_distinct_lanes(queue):
+    first = "station-0"
+    for i in range(1, 100):
+        other = f"station-{i}"
+        if queue.lane_for(other) != queue.lane_for(first):
+            return first, other
+    raise AssertionError("no two keys on distinct lanes")
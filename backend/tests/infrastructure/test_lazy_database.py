@@ -0,0 +1,108 @@
+from infrastructure.database import LazyDatabase
+
+
+class FakeConnection:
+    def __init__(self):
+        self.commits = 0
+        self.rollbacks = 0
+
+    def cursor(self):
+        class _Cursor:
+            description = [("one",)]
+
+            def execute(self, sql, params=None):
+                pass
+
+            def fetchall(self):
+                return [(1,)]
+
+            def close(self):
+                pass
+
+        return _Cursor()
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class FakePool:
+    def __init__(self):
+        self.conn = FakeConnection()
+        self.checked_out = 0
+        self.released = []
+
+    def getconn(self):
+        self.checked_out += 1
+        return self.conn
+
+    def putconn(self, conn):
+        self.released.append(conn)
+
+
+class TestLazyDatabase:
+    class TestWhenNoQueryIsMade:
+        def test_should_never_checkout_a_connection(self):
+            # Arrange
+            pool = FakePool()
+            db = LazyDatabase(acquire=pool.getconn, release=pool.putconn)
+
+            # Act
+            db.finish(True)
+
+            # Assert
+            assert db.acquired is False
+            assert pool.checked_out == 0
+            assert pool.released == []
+
+    class TestWhenAQueryIsMade:
+        def test_should_checkout_once_then_commit_and_release(self):
+            # Arrange
+            pool = FakePool()
+            db = LazyDatabase(acquire=pool.getconn, release=pool.putconn)
+
+            # Act
+            db.query("SELECT 1;")
+            db.query("SELECT 1;")
+            db.finish(True)
+
+            # Assert
+            assert pool.checked_out == 1
+            assert pool.conn.commits == 1
+            assert pool.released == [pool.conn]
+            assert db.acquired is False
+
+    class TestWhenCachesAreInvalidatedDuringTheTransaction:
+        def test_should_run_callbacks_only_after_commit(self):
+            # Arrange
+            pool = FakePool()
+            db = LazyDatabase(acquire=pool.getconn, release=pool.putconn)
+            calls = []
+            db.query("SELECT 1;")
+
+            # Act
+            db.after_commit(lambda: calls.append(pool.conn.commits))
+            before_commit = list(calls)
+            db.finish(True)
+
+            # Assert
+            assert before_commit == []
+            assert calls == [1]
+
+        def test_should_drop_callbacks_on_rollback(self):
+            # Arrange
+            pool = FakePool()
+            db = LazyDatabase(acquire=pool.getconn, release=pool.putconn)
+            calls = []
+            db.query("SELECT 1;")
+            db.after_commit(lambda: calls.append("invalidated"))
+
+            # Act
+            db.finish(False)
+            db.query("SELECT 1;")
+            db.finish(True)
+
+            # Assert
+            assert calls == []
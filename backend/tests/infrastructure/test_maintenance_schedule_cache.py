@@ -0,0 +1,59 @@
+from infrastructure.maintenance_schedule_cache import CachedSchedule, MaintenanceScheduleCache
+from utils.ttl_cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def entry(*plant_ids) -> CachedSchedule:
+    return CachedSchedule(version="v1", etag='"e1"', items=[{"plant_id": p} for p in plant_ids], expires_at=None)
+
+
+class TestMaintenanceScheduleCache:
+    class TestWhenAReportArrivesForACachedPlant:
+        def test_should_drop_the_owner_schedule_only(self):
+            # Arrange
+            cache = MaintenanceScheduleCache(TTLCache(maxsize=10, ttl=3600))
+            cache.set(1, entry(10, 11))
+            cache.set(2, entry(20))
+
+            # Act
+            cache.invalidate_plants([11])
+
+            # Assert
+            assert cache.get(1) is None
+            assert cache.get(2) is not None
+
+    class TestWhenTtlIsLongerThanTheCacheTtl:
+        def test_should_expire_at_the_cache_ttl(self):
+            # Arrange
+            clock = FakeClock()
+            cache = MaintenanceScheduleCache(TTLCache(maxsize=10, ttl=60, clock=clock))
+            cache.set(1, entry(10), ttl=3600)
+
+            # Act
+            clock.now = 61
+
+            # Assert
+            assert cache.get(1) is None
+
+    class TestWhenTheNextChangeIsSoon:
+        def test_should_expire_at_that_time(self):
+            # Arrange
+            clock = FakeClock()
+            cache = MaintenanceScheduleCache(TTLCache(maxsize=10, ttl=3600, clock=clock))
+            cache.set(1, entry(10), ttl=5)
+
+            # Act
+            clock.now = 4
+            before = cache.get(1)
+            clock.now = 6
+
+            # Assert
+            assert before is not None
+            assert cache.get(1) is None
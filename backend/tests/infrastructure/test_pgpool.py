@@ -0,0 +1,169 @@
+import threading
+import time
+
+import pytest
+from psycopg2 import extensions
+
+from infrastructure.pgpool import BoundedConnectionPool, PoolTimeoutError, PoolOverflowError
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.status = extensions.TRANSACTION_STATUS_IDLE
+        self.rollbacks = 0
+        self.fail_on_execute = False
+
+    def get_transaction_status(self):
+        return self.status
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.status = extensions.TRANSACTION_STATUS_IDLE
+
+    def cursor(self):
+        conn = self
+
+        class _Cursor:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def execute(self, sql, params=None):
+                if conn.fail_on_execute:
+                    raise RuntimeError("server closed the connection unexpectedly")
+
+        return _Cursor()
+
+    def close(self):
+        self.closed = 1
+
+
+@pytest.fixture(scope="function")
+def opened():
+    return []
+
+
+@pytest.fixture(scope="function")
+def make_pool(opened):
+    def _connect(dsn):
+        conn = FakeConnection()
+        opened.append(conn)
+        return conn
+
+    def _make(**options):
+        options.setdefault("minconn", 0)
+        options.setdefault("maxconn", 2)
+        return BoundedConnectionPool(dsn="fake", connect=_connect, **options)
+
+    return _make
+
+
+class TestBoundedConnectionPool:
+    class TestWhenPoolIsFull:
+        def test_should_wait_for_a_released_connection_instead_of_failing(self, make_pool):
+            # Arrange
+            pool = make_pool(maxconn=1, acquire_timeout=2.0)
+            first = pool.getconn()
+            threading.Timer(0.05, pool.putconn, args=(first,)).start()
+
+            # Act
+            second = pool.getconn()
+
+            # Assert
+            assert second is first
+            assert pool.metrics()["in_use"] == 1
+
+        def test_should_raise_timeout_when_nothing_is_released(self, make_pool):
+            # Arrange
+            pool = make_pool(maxconn=1, acquire_timeout=0.05)
+            pool.getconn()
+
+            # Act / Assert
+            with pytest.raises(PoolTimeoutError):
+                pool.getconn()
+            assert pool.metrics()["timeouts_total"] == 1
+
+        def test_should_reject_immediately_when_wait_queue_is_full(self, make_pool):
+            # Arrange
+            pool = make_pool(maxconn=1, max_waiting=0)
+            pool.getconn()
+
+            # Act / Assert
+            with pytest.raises(PoolOverflowError):
+                pool.getconn()
+
+    class TestRecycling:
+        def test_should_replace_connections_older_than_max_lifetime(self, make_pool, opened):
+            # Arrange
+            pool = make_pool(max_lifetime=0.01)
+            conn = pool.getconn()
+            time.sleep(0.02)
+
+            # Act
+            pool.putconn(conn)
+            other = pool.getconn()
+
+            # Assert
+            assert conn.closed
+            assert other is not conn
+            assert pool.metrics()["recycled_total"] == 1
+
+        def test_should_free_the_slot_of_an_expired_idle_connection_when_pool_is_full(self, make_pool):
+            # Arrange
+            pool = make_pool(maxconn=1, max_idle_time=0.01, acquire_timeout=0.05)
+            conn = pool.getconn()
+            pool.putconn(conn)
+            time.sleep(0.02)
+
+            # Act
+            other = pool.getconn()
+
+            # Assert
+            assert conn.closed
+            assert other is not conn
+            assert pool.metrics()["size"] == 1
+
+        def test_should_discard_stale_idle_connection_failing_validation(self, make_pool):
+            # Arrange
+            pool = make_pool(validate_after_idle=0.0)
+            conn = pool.getconn()
+            pool.putconn(conn)
+            conn.fail_on_execute = True
+            time.sleep(0.01)
+
+            # Act
+            other = pool.getconn()
+
+            # Assert
+            assert conn.closed
+            assert other is not conn
+
+        def test_should_rollback_connections_returned_inside_a_transaction(self, make_pool):
+            # Arrange
+            pool = make_pool()
+            conn = pool.getconn()
+            conn.status = extensions.TRANSACTION_STATUS_INTRANS
+
+            # Act
+            pool.putconn(conn)
+
+            # Assert
+            assert conn.rollbacks == 1
+            assert pool.metrics()["idle"] == 1
+
+    class TestMetrics:
+        def test_should_record_acquire_latency(self, make_pool):
+            # Arrange
+            pool = make_pool()
+
+            # Act
+            pool.putconn(pool.getconn())
+            metrics = pool.metrics()
+
+            # Assert
+            assert metrics["acquired_total"] == 1
+            assert metrics["acquire_latency_ms"]["count"] == 1
+            assert metrics["in_use"] == 0
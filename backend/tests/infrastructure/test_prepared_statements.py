@@ -0,0 +1,58 @@
+from infrastructure.prepared_statements import PreparedStatementRegistry, to_server_side_sql
+
+
+class FakeConnection:
+    pass
+
+
+class FakeCursor:
+    def __init__(self):
+        self.executed = []
+
+    def execute(self, sql, params=None):
+        self.executed.append((sql, params))
+
+
+class TestToServerSideSql:
+    def test_should_number_placeholders_and_unescape_percent(self):
+        # Act
+        sql, count = to_server_side_sql("SELECT id FROM station WHERE mac_adress = %s AND name LIKE 'S%%' AND id = %s;")
+
+        # Assert
+        assert sql == "SELECT id FROM station WHERE mac_adress = $1 AND name LIKE 'S%' AND id = $2"
+        assert count == 2
+
+
+class TestPreparedStatementRegistry:
+    class TestWhenStatementIsUsedTwiceOnSameConnection:
+        def test_should_prepare_once_then_execute_by_name(self):
+            # Arrange
+            registry = PreparedStatementRegistry()
+            conn = FakeConnection()
+            cur = FakeCursor()
+
+            # Act
+            registry.execute(cur, conn, "station_by_mac_address", "SELECT 1 FROM station WHERE mac_adress = %s;", ("AA",))
+            registry.execute(cur, conn, "station_by_mac_address", "SELECT 1 FROM station WHERE mac_adress = %s;", ("BB",))
+
+            # Assert
+            assert cur.executed == [
+                ("PREPARE station_by_mac_address AS SELECT 1 FROM station WHERE mac_adress = $1", None),
+                ("EXECUTE station_by_mac_address (%s)", ("AA",)),
+                ("EXECUTE station_by_mac_address (%s)", ("BB",)),
+            ]
+
+    class TestWhenConnectionIsForgotten:
+        def test_should_prepare_again(self):
+            # Arrange
+            registry = PreparedStatementRegistry()
+            conn = FakeConnection()
+            cur = FakeCursor()
+            registry.execute(cur, conn, "station_by_id", "SELECT 1 FROM station WHERE id = %s;", (1,))
+
+            # Act
+            registry.forget(conn)
+            registry.execute(cur, conn, "station_by_id", "SELECT 1 FROM station WHERE id = %s;", (1,))
+
+            # Assert
+            assert [sql for sql, _ in cur.executed].count("PREPARE station_by_id AS SELECT 1 FROM station WHERE id = $1") == 2
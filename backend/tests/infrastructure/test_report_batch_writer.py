@@ -0,0 +1,117 @@
+import itertools
+
+import pytest
+
+from infrastructure.report_batch_writer import ReportBatchWriter
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.statements = []
+        self.fail_plant_ids = set()
+        self._ids = itertools.count(1)
+
+    def query_values(self, sql, argslist, template=None):
+        if any(args[0] in self.fail_plant_ids for args in argslist):
+            raise RuntimeError("violates foreign key constraint")
+        self.statements.append((sql, argslist))
+        return [(next(self._ids),) for _ in argslist]
+
+    def after_commit(self, callback):
+        callback()
+
+
+@pytest.fixture(scope="function")
+def db():
+    return FakeDatabase()
+
+
+@pytest.fixture(scope="function")
+def commits():
+    return []
+
+
+@pytest.fixture(scope="function")
+def transaction(db, commits):
+    def _transaction(callback):
+        result = callback(db)
+        commits.append(result)
+        return result
+    return _transaction
+
+
+def _express(plant_id):
+    return dict(plant_id=plant_id, soil_humidity_mean=42.0)
+
+
+def _watering(plant_id):
+    return dict(plant_id=plant_id, soil_humidity_mean=42.0, sigma3=1.0, target_humidity=40.0)
+
+
+class TestReportBatchWriter:
+    class TestWhenReportsArriveInTheSameWindow:
+        def test_should_insert_them_in_one_statement_per_type_and_one_commit(self, db, commits, transaction):
+            # Arrange
+            writer = ReportBatchWriter(transaction, max_batch=10, max_delay=0.05)
+
+            # Act
+            futures = [writer.submit_express_analysis(_express(1)),
+                       writer.submit_watering(_watering(1)),
+                       writer.submit_express_analysis(_express(2))]
+            writer.start()
+            ids = [f.result(timeout=2) for f in futures]
+            writer.stop()
+
+            # Assert
+            assert len(commits) == 1
+            assert len(db.statements) == 2
+            assert sorted(ids) == [1, 2, 3]
+            express_sql, express_rows = next(s for s in db.statements if "express_analysis_report" in s[0])
+            assert [row[0] for row in express_rows] == [1, 2]
+            assert writer.metrics()["rows_total"] == 3
+
+        def test_should_flush_when_max_batch_is_reached(self, db, transaction):
+            # Arrange
+            writer = ReportBatchWriter(transaction, max_batch=2, max_delay=10).start()
+
+            # Act
+            futures = [writer.submit_watering(_watering(i)) for i in range(2)]
+
+            # Assert
+            assert [f.result(timeout=2) for f in futures] == [1, 2]
+            writer.stop()
+
+    class TestWhenOneReportIsInvalid:
+        def test_should_only_fail_that_report(self, db, transaction):
+            # Arrange
+            db.fail_plant_ids = {404}
+            writer = ReportBatchWriter(transaction, max_batch=10, max_delay=0.01)
+            ok = writer.submit_watering(_watering(1))
+            ko = writer.submit_watering(_watering(404))
+
+            # Act
+            writer.start()
+            writer.stop()
+
+            # Assert
+            assert ok.result(timeout=1) == 1
+            with pytest.raises(RuntimeError):
+                ko.result(timeout=1)
+            metrics = writer.metrics()
+            assert metrics["failed_batches_total"] == 1
+            assert metrics["failed_rows_total"] == 1
+
+    class TestWhenStopped:
+        def test_should_flush_pending_reports_then_refuse_new_ones(self, transaction):
+            # Arrange
+            writer = ReportBatchWriter(transaction, max_batch=10, max_delay=10).start()
+            pending = writer.submit_watering(_watering(1))
+
+            # Act
+            writer.stop()
+            refused = writer.submit_watering(_watering(1))
+
+            # Assert
+            assert pending.result(timeout=1) == 1
+            with pytest.raises(RuntimeError):
+                refused.result(timeout=1)
@@ -0,0 +1,63 @@
+from types import SimpleNamespace
+
+from infrastructure.station_notifications import StationNotificationSubscriptions
+
+
+class FakeMqttClient:
+    def __init__(self):
+        self.callbacks = {}
+        self.subscribe_calls = []
+        self.unsubscribe_calls = []
+
+    def register_callback(self, topic, callback, subscription=None):
+        self.callbacks[topic] = callback
+        self.subscribe_calls.append(subscription or topic)
+
+    def unregister_callback(self, topic):
+        self.callbacks.pop(topic, None)
+        self.unsubscribe_calls.append(topic)
+
+
+class FakeFanout:
+    def __init__(self):
+        self.published = []
+
+    def publish(self, station_id, message):
+        self.published.append((station_id, message))
+
+
+class TestStationNotificationSubscriptions:
+    class TestWhenSeveralSocketsOpenForAStation:
+        def test_should_subscribe_once_and_unsubscribe_after_last(self):
+            # Arrange
+            mqtt = FakeMqttClient()
+            subscriptions = StationNotificationSubscriptions(mqtt, FakeFanout())
+
+            # Act
+            subscriptions.acquire("aa:bb")
+            subscriptions.acquire("aa:bb")
+            subscriptions.release("aa:bb")
+            still_subscribed = list(mqtt.callbacks)
+            subscriptions.release("aa:bb")
+
+            # Assert
+            assert mqtt.subscribe_calls == ["stations/aa:bb/#"]
+            assert still_subscribed == ["stations/aa:bb/#"]
+            assert mqtt.unsubscribe_calls == ["stations/aa:bb/#"]
+            assert subscriptions.metrics()["stations"] == 0
+
+    class TestWhenStationPublishes:
+        def test_should_forward_json_messages_to_local_sockets(self):
+            # Arrange
+            mqtt, fanout = FakeMqttClient(), FakeFanout()
+            subscriptions = StationNotificationSubscriptions(mqtt, fanout)
+            subscriptions.acquire("aa:bb")
+            callback = mqtt.callbacks["stations/aa:bb/#"]
+
+            # Act
+            callback(None, None, SimpleNamespace(topic="stations/aa:bb", payload=b'{"type":"command"}'))
+            callback(None, None, SimpleNamespace(topic="stations/aa:bb", payload=b"not json"))
+
+            # Assert
+            assert fanout.published == [("aa:bb", '{"type":"command"}')]
+            assert subscriptions.metrics()["skipped_total"] == 1
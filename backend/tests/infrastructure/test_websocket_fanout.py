@@ -0,0 +1,148 @@
+import asyncio
+import threading
+
+from infrastructure.websocket_fanout import WebSocketFanout, DISCONNECT, DROP_OLDEST, DROP_NEWEST
+
+
+class FakeWebSocket:
+    def __init__(self, blocked: bool = False):
+        self.sent = []
+        self.closed_with = None
+        self._gate = asyncio.Event()
+        if not blocked:
+            self._gate.set()
+
+    def unblock(self):
+        self._gate.set()
+
+    async def send_text(self, text):
+        await self._gate.wait()
+        self.sent.append(text)
+
+    async def close(self, code=1000, reason=None):
+        self.closed_with = code
+
+
+async def _settle():
+    # laisse tourner les callbacks et les tâches d'écriture
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+class TestWebSocketFanout:
+    class TestWhenOneClientIsSlow:
+        def test_should_still_deliver_to_other_clients(self):
+            # Arrange
+            async def _run():
+                fanout = WebSocketFanout(queue_size=4)
+                slow, fast = FakeWebSocket(blocked=True), FakeWebSocket()
+                fanout.register("st-1", slow)
+                fanout.register("st-1", fast)
+
+                # Act
+                for i in range(3):
+                    fanout.publish("st-1", {"n": i})
+                await _settle()
+                delivered_while_blocked = list(fast.sent)
+                slow.unblock()
+                await _settle()
+                await fanout.close()
+                return delivered_while_blocked, slow.sent, fanout.metrics()
+
+            fast_sent, slow_sent, metrics = asyncio.run(_run())
+
+            # Assert
+            assert fast_sent == ['{"n": 0}', '{"n": 1}', '{"n": 2}']
+            assert slow_sent == fast_sent
+            assert metrics["delivered_total"] == 6
+            assert metrics["delivery_lag_ms"]["count"] == 6
+
+    class TestWhenQueueIsFull:
+        def test_should_evict_oldest_with_drop_oldest(self):
+            # Arrange
+            async def _run():
+                fanout = WebSocketFanout(queue_size=2, slow_consumer_policy=DROP_OLDEST)
+                ws = FakeWebSocket(blocked=True)
+                fanout.register("st-1", ws)
+                await _settle()
+
+                # Act: m0 est pris par la tâche d'écriture, bloquée sur l'envoi
+                fanout.publish("st-1", "m0")
+                await _settle()
+                for i in range(1, 5):
+                    fanout.publish("st-1", f"m{i}")
+                await _settle()
+                ws.unblock()
+                await _settle()
+                await fanout.close()
+                return ws.sent, fanout.metrics()
+
+            sent, metrics = asyncio.run(_run())
+
+            # Assert
+            assert sent == ["m0", "m3", "m4"]
+            assert metrics["dropped_total"] == 2
+
+        def test_should_reject_newest_with_drop_newest(self):
+            # Arrange
+            async def _run():
+                fanout = WebSocketFanout(queue_size=2, slow_consumer_policy=DROP_NEWEST)
+                ws = FakeWebSocket(blocked=True)
+                fanout.register("st-1", ws)
+                await _settle()
+
+                # Act
+                fanout.publish("st-1", "m0")
+                await _settle()
+                for i in range(1, 5):
+                    fanout.publish("st-1", f"m{i}")
+                await _settle()
+                ws.unblock()
+                await _settle()
+                await fanout.close()
+                return ws.sent
+
+            # Assert
+            assert asyncio.run(_run()) == ["m0", "m1", "m2"]
+
+        def test_should_close_client_with_disconnect(self):
+            # Arrange
+            async def _run():
+                fanout = WebSocketFanout(queue_size=1, slow_consumer_policy=DISCONNECT)
+                ws = FakeWebSocket(blocked=True)
+                fanout.register("st-1", ws)
+                await _settle()
+
+                # Act
+                for i in range(3):
+                    fanout.publish("st-1", f"m{i}")
+                await _settle()
+                await fanout.close()
+                return ws.closed_with, fanout.connection_count("st-1"), fanout.metrics()
+
+            closed_with, remaining, metrics = asyncio.run(_run())
+
+            # Assert
+            assert closed_with == 1008
+            assert remaining == 0
+            assert metrics["disconnected_total"] == 1
+
+    class TestWhenPublishingFromAnotherThread:
+        def test_should_deliver_to_every_station(self):
+            # Arrange
+            async def _run():
+                fanout = WebSocketFanout().bind(asyncio.get_running_loop())
+                a, b = FakeWebSocket(), FakeWebSocket()
+                fanout.register("st-1", a)
+                fanout.register("st-2", b)
+
+                # Act
+                thread = threading.Thread(target=fanout.publish_all, args=("hello",))
+                thread.start()
+                thread.join()
+                await _settle()
+                await fanout.close()
+                return a.sent, b.sent
+
+            # Assert
+            assert asyncio.run(_run()) == (["hello"], ["hello"])
@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from starlette.testclient import TestClient
+
+from app import app
+from entities.models import MaintenanceSheet, User
+from entities.repositories import Repository
+from infrastructure.database import get_db as get_db_dep
+from usecases.ManageMaintenanceSchedules.GetMaintenanceSchedule.GetMaintenanceSheetAction import next_change_at
+from usecases.ManageUsers.AuthUser.guard import get_current_user_from_bearer, CurrentUser
+
+
+@pytest.fixture(scope="function")
+def repo(tests_database) -> Repository:
+    return Repository(tests_database)
+
+
+@pytest.fixture(scope="function")
+def user(repo) -> User:
+    return repo.get_or_create_user(email="test@example.com", google_sub="test")
+
+
+@pytest.fixture(scope="function")
+def client(tests_database, user):
+    app.dependency_overrides[get_db_dep] = lambda: tests_database
+    app.dependency_overrides[get_current_user_from_bearer] = lambda: CurrentUser(
+        user_id=str(user.id),
+        claims={"email": "test@example.com", "sub": "fake-sub-id", "roles": ["user"]}
+    )
+
+    with TestClient(app) as client:
+        yield client
+
+    app.dependency_overrides.pop(get_db_dep, None)
+    app.dependency_overrides.pop(get_current_user_from_bearer, None)
+
+
+@pytest.fixture(scope="function")
+def plant_id(repo, user) -> int:
+    return repo.create_maintenance_sheet(MaintenanceSheet(
+        id=None, user_id=user.id, name="Fiche Monstera", scientific_name="Monstera Deliciosa",
+        common_name=None, taxonkey=None, taxon_rank=None, gbif_id=None, identification_source="Other",
+        confidence_score=None, min_soil_humidity=20, max_soil_humidity=60, min_lumens=None, max_lumens=None,
+        lumens_unit="lux", min_air_humidity=None, max_air_humidity=None, min_temperature=None,
+        max_temperature=None, min_watering_days_frequency=3, max_watering_days_frequency=7,
+        created_at=None, updated_at=None,
+    ))
+
+
+class TestGetMaintenanceScheduleController:
+    class TestWhenTheClientHasTheCurrentVersion:
+        def test_should_return_304(self, client, plant_id: int):
+            # Arrange
+            first = client.get("api/maintenance-schedule")
+
+            # Act
+            resp = client.get("api/maintenance-schedule", headers={"If-None-Match": first.headers["ETag"]})
+
+            # Assert
+            assert first.status_code == 200
+            assert [s["plant_id"] for s in first.json()] == [plant_id]
+            assert resp.status_code == 304
+
+    class TestWhenAReportArrives:
+        def test_should_return_the_new_schedule(self, client, repo: Repository, plant_id: int):
+            # Arrange
+            first = client.get("api/maintenance-schedule")
+
+            # Act
+            repo.create_watering_report(plant_id, 50.0, 1.0, 40.0, None, None)
+            resp = client.get("api/maintenance-schedule", headers={"If-None-Match": first.headers["ETag"]})
+
+            # Assert
+            assert first.json()[0]["watering_advices"]["status"] == "never_tested"
+            assert resp.status_code == 200
+            assert resp.headers["ETag"] != first.headers["ETag"]
+            assert resp.json()[0]["watering_advices"]["status"] == "watering_ok"
+
+    class TestWhenTheSheetIsDeleted:
+        def test_should_not_serve_the_cached_plant(self, client, repo: Repository, plant_id: int):
+            # Arrange
+            client.get("api/maintenance-schedule")
+
+            # Act
+            repo.delete_maintenance_sheet_for_user(plant_id)
+            resp = client.get("api/maintenance-schedule")
+
+            # Assert
+            assert resp.status_code == 200
+            assert resp.json() == []
+
+
+class TestNextChangeAt:
+    class TestWhenReportsExist:
+        def test_should_return_the_next_hour_boundary_after_the_closest_report(self):
+            # Arrange
+            now = datetime.now(timezone.utc)
+            row = SimpleNamespace(
+                last_watering_above_target_date=None,
+                last_express_above_target_date=None,
+                last_watering_date=now - timedelta(days=2, minutes=50),
+                last_express_date=now - timedelta(minutes=30),
+            )
+
+            # Act
+            change_at = next_change_at([row])
+
+            # Assert
+            assert now + timedelta(minutes=9) < change_at <= now + timedelta(minutes=10)
+
+    class TestWhenThereIsNoReport:
+        def test_should_return_none(self):
+            # Arrange
+            row = SimpleNamespace(last_watering_above_target_date=None, last_express_above_target_date=None,
+                                  last_watering_date=None, last_express_date=None)
+
+            # Act / Assert
+            assert next_change_at([row]) is None
@@ -38,15 +38,16 @@ class TestGetExpressAnalysisReportAction:
             )
 
             class FakeRepository:
-                def get_express_analysis_report_by_id(self, report_id: int):
-                    # on vérifie qu'on reçoit bien l'ID demandé
+                def get_express_analysis_report_for_user(self, report_id: int, user_id: int):
+                    # on vérifie qu'on reçoit bien l'ID demandé et l'utilisateur
                     assert report_id == 123
+                    assert user_id == 1
                     return expected_report
 
             action = GetExpressAnalysisReportAction(repo=FakeRepository())
 
             # Act
-            report = action.execute(123)
+            report = action.execute(123, "1")
 
             # Assert
             assert report is expected_report
@@ -60,7 +61,7 @@ class TestGetExpressAnalysisReportAction:
 
             # Act / Assert
             with pytest.raises(NotFoundException) as excinfo:
-                action.execute(unknown_id)
+                action.execute(unknown_id, 1)
 
             assert str(unknown_id) in str(excinfo.value)
 
@@ -0,0 +1,113 @@
+from datetime import timedelta
+
+import pytest
+from starlette.testclient import TestClient
+
+from app import app
+from entities.models import MaintenanceSheet, User
+from entities.repositories import Repository
+from infrastructure.database import get_db as get_db_dep
+from usecases.ManageReports.GetPlantHistory.GetPlantHistoryAction import pick_resolution, MAX_POINTS
+from usecases.ManageUsers.AuthUser.guard import get_current_user_from_bearer, CurrentUser
+
+
+@pytest.fixture(scope="function")
+def repo(tests_database) -> Repository:
+    return Repository(tests_database)
+
+
+@pytest.fixture(scope="function")
+def user(repo) -> User:
+    return repo.get_or_create_user(email="test@example.com", google_sub="test")
+
+
+@pytest.fixture(scope="function")
+def client(tests_database, user):
+    app.dependency_overrides[get_db_dep] = lambda: tests_database
+    app.dependency_overrides[get_current_user_from_bearer] = lambda: CurrentUser(
+        user_id=str(user.id),
+        claims={"email": "test@example.com", "sub": "fake-sub-id", "roles": ["user"]}
+    )
+
+    with TestClient(app) as client:
+        yield client
+
+    app.dependency_overrides.pop(get_db_dep, None)
+    app.dependency_overrides.pop(get_current_user_from_bearer, None)
+
+
+@pytest.fixture(scope="function")
+def plant_id(repo, user) -> int:
+    return repo.create_maintenance_sheet(MaintenanceSheet(
+        id=None, user_id=user.id, name="Fiche Monstera", scientific_name="Monstera Deliciosa",
+        common_name=None, taxonkey=None, taxon_rank=None, gbif_id=None, identification_source="Other",
+        confidence_score=None, min_soil_humidity=20, max_soil_humidity=60, min_lumens=None, max_lumens=None,
+        lumens_unit="lux", min_air_humidity=None, max_air_humidity=None, min_temperature=None,
+        max_temperature=None, min_watering_days_frequency=None, max_watering_days_frequency=None,
+        created_at=None, updated_at=None,
+    ))
+
+
+class TestPickResolution:
+    class TestWhenAuto:
+        def test_should_pick_finest_resolution_within_max_points(self):
+            # Act / Assert
+            assert pick_resolution("auto", timedelta(days=7)) == "hour"
+            assert pick_resolution("auto", timedelta(days=90)) == "day"
+            assert pick_resolution("auto", timedelta(days=3 * 365)) == "week"
+
+    class TestWhenRequestedResolutionIsTooFine:
+        def test_should_coarsen(self):
+            # Act
+            resolution = pick_resolution("hour", timedelta(hours=MAX_POINTS + 1))
+
+            # Assert
+            assert resolution == "day"
+
+
+class TestGetPlantHistoryController:
+    class TestWhenReportsAreInserted:
+        def test_should_return_rollups_maintained_on_insert(self, client, repo: Repository, plant_id: int):
+            # Arrange: dans une même transaction now() est constant -> un seul bucket
+            for humidity in (30.0, 40.0):
+                repo.create_express_analysis_report(plant_id, humidity, 20.0, 50.0, 800.0, None, None, None, None)
+            repo.create_watering_report(plant_id, 45.0, 1.0, 40.0, None, None)
+
+            # Act
+            resp = client.get(f"api/plants/{plant_id}/history", params={"resolution": "day"})
+
+            # Assert
+            assert resp.status_code == 200
+            body = resp.json()
+            assert body["resolution"] == "day"
+            points = {p["metric"]: p for p in body["points"]}
+            assert points["soil_humidity"]["count"] == 2
+            assert points["soil_humidity"]["mean"] == pytest.approx(35.0)
+            assert points["soil_humidity"]["min"] == pytest.approx(30.0)
+            assert points["soil_humidity"]["max"] == pytest.approx(40.0)
+            assert points["watering_soil_humidity"]["count"] == 1
+
+    class TestWhenReportIsDeleted:
+        def test_should_refresh_its_buckets(self, client, repo: Repository, plant_id: int):
+            # Arrange
+            kept = repo.create_express_analysis_report(plant_id, 30.0, 20.0, 50.0, 800.0, None, None, None, None)
+            removed = repo.create_express_analysis_report(plant_id, 60.0, 20.0, 50.0, 800.0, None, None, None, None)
+
+            # Act
+            repo.delete_express_analysis_report_by_id(removed)
+            resp = client.get(f"api/plants/{plant_id}/history", params={"resolution": "hour"})
+
+            # Assert
+            assert kept
+            points = {p["metric"]: p for p in resp.json()["points"]}
+            assert points["soil_humidity"]["count"] == 1
+            assert points["soil_humidity"]["max"] == pytest.approx(30.0)
+
+    class TestWhenWindowIsInvalid:
+        def test_should_return_400(self, client, plant_id: int):
+            # Act
+            resp = client.get(f"api/plants/{plant_id}/history",
+                              params={"from": "2025-02-01T00:00:00Z", "to": "2025-01-01T00:00:00Z"})
+
+            # Assert
+            assert resp.status_code == 400
@@ -0,0 +1,79 @@
+import pytest
+from starlette.testclient import TestClient
+
+from app import app
+from entities.models import MaintenanceSheet, User
+from entities.repositories import Repository
+from infrastructure.database import get_db as get_db_dep
+from usecases.ManageUsers.AuthUser.guard import get_current_user_from_bearer, CurrentUser
+
+
+@pytest.fixture(scope="function")
+def repo(tests_database) -> Repository:
+    return Repository(tests_database)
+
+
+@pytest.fixture(scope="function")
+def user(repo) -> User:
+    return repo.get_or_create_user(email="test@example.com", google_sub="test")
+
+
+@pytest.fixture(scope="function")
+def client(tests_database, user):
+    app.dependency_overrides[get_db_dep] = lambda: tests_database
+    app.dependency_overrides[get_current_user_from_bearer] = lambda: CurrentUser(
+        user_id=str(user.id),
+        claims={"email": "test@example.com", "sub": "fake-sub-id", "roles": ["user"]}
+    )
+
+    with TestClient(app) as client:
+        yield client
+
+    app.dependency_overrides.pop(get_db_dep, None)
+    app.dependency_overrides.pop(get_current_user_from_bearer, None)
+
+
+@pytest.fixture(scope="function")
+def plant_id(repo, user) -> int:
+    return repo.create_maintenance_sheet(MaintenanceSheet(
+        id=None, user_id=user.id, name="Fiche Monstera", scientific_name="Monstera Deliciosa",
+        common_name=None, taxonkey=None, taxon_rank=None, gbif_id=None, identification_source="Other",
+        confidence_score=None, min_soil_humidity=20, max_soil_humidity=60, min_lumens=None, max_lumens=None,
+        lumens_unit="lux", min_air_humidity=None, max_air_humidity=None, min_temperature=None,
+        max_temperature=None, min_watering_days_frequency=None, max_watering_days_frequency=None,
+        created_at=None, updated_at=None,
+    ))
+
+
+class TestListMaintenanceSummariesController:
+    class TestWhenPagingWithCursor:
+        def test_should_return_every_report_once_in_order(self, client, repo: Repository, plant_id: int, tests_database):
+            # Arrange: dans une même transaction now() est constant -> horodatages identiques
+            for humidity in (30.0, 35.0, 40.0):
+                repo.create_watering_report(plant_id, humidity, 1.0, 40.0, None, None)
+                repo.create_express_analysis_report(plant_id, humidity, 20.0, 50.0, 800.0, None, None, None, None)
+
+            # Act
+            pages, cursor = [], None
+            while True:
+                resp = client.get(f"api/plants/{plant_id}/reports/resumes",
+                                  params={"limit": 2, **({"cursor": cursor} if cursor else {})})
+                assert resp.status_code == 200
+                pages.append(resp.json())
+                cursor = resp.headers.get("X-Next-Cursor")
+                if not cursor:
+                    break
+
+            # Assert
+            keys = [(r["type"], r["id"]) for page in pages for r in page]
+            assert [len(page) for page in pages] == [2, 2, 2]
+            assert len(set(keys)) == 6
+            assert [t for t, _ in keys] == ["watering"] * 3 + ["express"] * 3
+
+    class TestWhenCursorIsInvalid:
+        def test_should_return_400(self, client, plant_id: int):
+            # Act
+            resp = client.get(f"api/plants/{plant_id}/reports/resumes", params={"cursor": "garbage"})
+
+            # Assert
+            assert resp.status_code == 400
@@ -0,0 +1,111 @@
+import hashlib
+
+import pytest
+from starlette.testclient import TestClient
+
+from app import app
+from entities.models import MaintenanceSheet, User
+from entities.repositories import Repository
+from infrastructure.database import get_db as get_db_dep
+from usecases.ManageUsers.AuthUser.guard import get_current_user_from_bearer, CurrentUser
+
+JPEG = b"\xff\xd8\xff\xe0" + bytes(range(256)) * 4
+
+
+@pytest.fixture(scope="function")
+def repo(tests_database) -> Repository:
+    return Repository(tests_database)
+
+
+@pytest.fixture(scope="function")
+def user(repo) -> User:
+    return repo.get_or_create_user(email="test@example.com", google_sub="test")
+
+
+@pytest.fixture(scope="function")
+def client(tests_database, user):
+    app.dependency_overrides[get_db_dep] = lambda: tests_database
+    app.dependency_overrides[get_current_user_from_bearer] = lambda: CurrentUser(
+        user_id=str(user.id),
+        claims={"email": "test@example.com", "sub": "fake-sub-id", "roles": ["user"]}
+    )
+
+    with TestClient(app) as client:
+        yield client
+
+    app.dependency_overrides.pop(get_db_dep, None)
+    app.dependency_overrides.pop(get_current_user_from_bearer, None)
+
+
+@pytest.fixture(scope="function")
+def sheet_id(repo, user) -> int:
+    return repo.create_maintenance_sheet(MaintenanceSheet(
+        id=None, user_id=user.id, name="Fiche Monstera", scientific_name="Monstera Deliciosa",
+        common_name=None, taxonkey=None, taxon_rank=None, gbif_id=None, identification_source="Other",
+        confidence_score=None, min_soil_humidity=20, max_soil_humidity=60, min_lumens=None, max_lumens=None,
+        lumens_unit="lux", min_air_humidity=None, max_air_humidity=None, min_temperature=None,
+        max_temperature=None, min_watering_days_frequency=None, max_watering_days_frequency=None,
+        photo=JPEG,
+    ))
+
+
+class TestGetMaintenanceSheetPhoto:
+    class TestWhenSheetIsFetched:
+        def test_should_return_photo_url_instead_of_base64(self, client, sheet_id: int):
+            # Act
+            resp = client.get(f"api/maintenance-sheets/{sheet_id}")
+
+            # Assert
+            body = resp.json()
+            assert "photo_base64" not in body
+            assert body["photo_hash"] == hashlib.sha256(JPEG).hexdigest()
+            assert body["photo_url"] == f"/api/maintenance-sheets/{sheet_id}/photo?v={body['photo_hash']}"
+
+    class TestWhenPhotoIsRequested:
+        def test_should_return_bytes_with_strong_etag(self, client, sheet_id: int):
+            # Act
+            resp = client.get(f"api/maintenance-sheets/{sheet_id}/photo")
+
+            # Assert
+            assert resp.status_code == 200
+            assert resp.content == JPEG
+            assert resp.headers["content-type"] == "image/jpeg"
+            assert resp.headers["etag"] == f'"{hashlib.sha256(JPEG).hexdigest()}"'
+            assert "immutable" in resp.headers["cache-control"]
+
+        def test_should_return_304_when_etag_matches(self, client, sheet_id: int):
+            # Arrange
+            etag = client.get(f"api/maintenance-sheets/{sheet_id}/photo").headers["etag"]
+
+            # Act
+            resp = client.get(f"api/maintenance-sheets/{sheet_id}/photo", headers={"If-None-Match": etag})
+
+            # Assert
+            assert resp.status_code == 304
+            assert resp.content == b""
+
+        def test_should_return_requested_range(self, client, sheet_id: int):
+            # Act
+            resp = client.get(f"api/maintenance-sheets/{sheet_id}/photo", headers={"Range": "bytes=4-13"})
+
+            # Assert
+            assert resp.status_code == 206
+            assert resp.content == JPEG[4:14]
+            assert resp.headers["content-range"] == f"bytes 4-13/{len(JPEG)}"
+
+        def test_should_return_416_for_unsatisfiable_range(self, client, sheet_id: int):
+            # Act
+            resp = client.get(f"api/maintenance-sheets/{sheet_id}/photo", headers={"Range": f"bytes={len(JPEG)}-"})
+
+            # Assert
+            assert resp.status_code == 416
+
+    class TestWhenThumbnailIsMissing:
+        def test_should_fall_back_to_original_and_ask_for_revalidation(self, client, sheet_id: int):
+            # Act
+            resp = client.get(f"api/maintenance-sheets/{sheet_id}/photo", params={"variant": "small"})
+
+            # Assert
+            assert resp.status_code == 200
+            assert resp.content == JPEG
+            assert resp.headers["cache-control"] == "private, no-cache"
@@ -0,0 +1,23 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from utils.cursor import encode_summary_cursor, decode_summary_cursor
+
+
+class TestSummaryCursor:
+    def test_should_round_trip_the_key(self):
+        # Arrange
+        key = (datetime(2025, 3, 1, 12, 30, 15, 123456, tzinfo=timezone.utc), "watering", 42)
+
+        # Act
+        decoded = decode_summary_cursor(encode_summary_cursor(*key))
+
+        # Assert
+        assert decoded == key
+
+    @pytest.mark.parametrize("cursor", ["", "not-a-cursor", encode_summary_cursor(datetime(2025, 3, 1, tzinfo=timezone.utc), "other", 1)])
+    def test_should_reject_invalid_cursor(self, cursor):
+        # Act / Assert
+        with pytest.raises(ValueError):
+            decode_summary_cursor(cursor)
@@ -0,0 +1,36 @@
+import pytest
+
+from utils.http_cache import etag_matches, parse_byte_range
+
+
+class TestEtagMatches:
+    @pytest.mark.parametrize("header", ['"abc"', 'W/"abc"', '"zzz", "abc"', "*"])
+    def test_should_match(self, header):
+        # Act / Assert
+        assert etag_matches(header, '"abc"')
+
+    @pytest.mark.parametrize("header", [None, "", '"abd"'])
+    def test_should_not_match(self, header):
+        # Act / Assert
+        assert not etag_matches(header, '"abc"')
+
+
+class TestParseByteRange:
+    @pytest.mark.parametrize("header, expected", [
+        ("bytes=0-99", (0, 99)),
+        ("bytes=100-", (100, 999)),
+        ("bytes=-100", (900, 999)),
+        ("bytes=900-5000", (900, 999)),
+        ("bytes=0-1,5-6", None),
+        ("items=0-1", None),
+        (None, None),
+    ])
+    def test_should_parse_single_ranges(self, header, expected):
+        # Act / Assert
+        assert parse_byte_range(header, 1000) == expected
+
+    @pytest.mark.parametrize("header", ["bytes=1000-", "bytes=-0"])
+    def test_should_reject_unsatisfiable_ranges(self, header):
+        # Act / Assert
+        with pytest.raises(ValueError):
+            parse_byte_range(header, 1000)
@@ -0,0 +1,43 @@
+import json
+
+import pytest
+
+from utils.series import encode_series, decode_series
+
+
+class TestSeries:
+    @pytest.mark.parametrize("delta", [True, False])
+    def test_should_round_trip_values_and_missing_samples(self, delta):
+        # Arrange
+        values = [41.25, 41.3, None, 40.0, -3.5, None]
+
+        # Act
+        decoded = decode_series(encode_series(values, delta=delta))
+
+        # Assert
+        assert decoded == values
+
+    def test_should_round_trip_an_empty_series(self):
+        # Act / Assert
+        assert decode_series(encode_series([])) == []
+
+    def test_should_keep_a_600_samples_watering_curve_far_below_its_json_size(self):
+        # Arrange
+        values = [round(30 + i * 0.05, 2) for i in range(600)]
+
+        # Act
+        encoded = encode_series(values)
+
+        # Assert
+        assert decode_series(encoded) == values
+        assert len(encoded) < len(json.dumps(values, separators=(",", ":"))) / 3
+
+    def test_should_round_to_the_requested_decimals(self):
+        # Act / Assert
+        assert decode_series(encode_series([12.345, 12.355], decimals=1)) == [12.3, 12.4]
+
+    @pytest.mark.parametrize("blob", [b"", b"\x01\x01\x02", encode_series([1.0, 2.0])[:-1], b"\x09" + encode_series([1.0])[1:]])
+    def test_should_reject_truncated_or_unknown_data(self, blob):
+        # Act / Assert
+        with pytest.raises(ValueError):
+            decode_series(blob)
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from utils.series_stats import compute_series_stats
+
+
+class TestComputeSeriesStats:
+    def test_should_compute_every_statistic_ignoring_missing_samples(self):
+        # Arrange
+        values = [40.0, None, 42.0, 44.0]
+
+        # Act
+        stats = compute_series_stats({"soil_humidity": values})["soil_humidity"]
+
+        # Assert
+        present = np.array([40.0, 42.0, 44.0])
+        assert stats["count"] == 3
+        assert stats["mean"] == pytest.approx(present.mean(), abs=1e-4)
+        assert stats["std"] == pytest.approx(present.std(), abs=1e-4)
+        assert stats["sigma3"] == pytest.approx(3 * present.std(), abs=1e-4)
+        assert (stats["min"], stats["max"]) == (40.0, 44.0)
+        assert stats["slope"] == pytest.approx(np.polyfit([0, 2, 3], present, 1)[0], abs=1e-4)
+
+    def test_should_handle_series_of_different_lengths_in_one_pass(self):
+        # Act
+        stats = compute_series_stats({"humidity": [10.0] * 600, "temperature": [20.0, 22.0]})
+
+        # Assert
+        assert stats["humidity"]["count"] == 600
+        assert stats["humidity"]["slope"] == 0.0
+        assert stats["temperature"]["mean"] == 21.0
+
+    def test_should_count_samples_beyond_three_sigmas(self):
+        # Act
+        stats = compute_series_stats({"humidity": [10.0] * 20 + [100.0]})
+
+        # Assert
+        assert stats["humidity"]["outliers"] == 1
+
+    def test_should_omit_empty_series(self):
+        # Act / Assert
+        assert compute_series_stats({"pump": [], "air_humidity": [None, None]}) == {}
@@ -0,0 +1,59 @@
+from utils.ttl_cache import TTLCache, MISSING
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache:
+    class TestWhenEntryExpires:
+        def test_should_return_missing(self):
+            # Arrange
+            clock = FakeClock()
+            cache = TTLCache(maxsize=10, ttl=5, clock=clock)
+            cache.set("aa:bb", 1)
+
+            # Act
+            before = cache.get("aa:bb")
+            clock.now = 5
+            after = cache.get("aa:bb")
+
+            # Assert
+            assert before == 1
+            assert after is MISSING
+
+    class TestWhenFull:
+        def test_should_evict_least_recently_used(self):
+            # Arrange
+            cache = TTLCache(maxsize=2, ttl=60)
+            cache.set("a", 1)
+            cache.set("b", 2)
+            cache.get("a")
+
+            # Act
+            cache.set("c", 3)
+
+            # Assert
+            assert cache.get("b") is MISSING
+            assert cache.get("a") == 1
+            assert cache.metrics()["evictions"] == 1
+
+    class TestWhenValueIsNone:
+        def test_should_cache_it_until_invalidated(self):
+            # Arrange
+            cache = TTLCache()
+            loads = []
+            loader = lambda: loads.append(1)
+
+            # Act
+            cache.get_or_load("aa:bb", loader)
+            cache.get_or_load("aa:bb", loader)
+            cache.invalidate("aa:bb")
+            cache.get_or_load("aa:bb", loader)
+
+            # Assert
+            assert len(loads) == 2
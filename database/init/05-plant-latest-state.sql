@@ -0,0 +1,112 @@
+-- Projection "dernier état" par plante, maintenue par create_watering_report /
+-- create_express_analysis_report dans la même transaction que l'insertion du rapport.
+-- Remplace les ROW_NUMBER() sur tout l'historique de get_last_feeled_humidity.
+CREATE TABLE IF NOT EXISTS plant_latest_state (
+  plant_id BIGINT PRIMARY KEY REFERENCES maintenance_sheet(id) ON DELETE CASCADE,
+
+  last_watering_id INTEGER,
+  last_watering_at TIMESTAMP WITH TIME ZONE,
+  last_watering_humidity REAL,
+
+  last_watering_above_target_id INTEGER,
+  last_watering_above_target_at TIMESTAMP WITH TIME ZONE,
+  last_watering_above_target_humidity REAL,
+
+  last_express_id INTEGER,
+  last_express_at TIMESTAMP WITH TIME ZONE,
+  last_express_soil_humidity REAL,
+  last_express_air_humidity REAL,
+  last_express_temperature REAL,
+
+  last_express_above_target_id INTEGER,
+  last_express_above_target_at TIMESTAMP WITH TIME ZONE,
+  last_express_above_target_humidity REAL,
+
+  updated_at TIMESTAMP WITH TIME ZONE DEFAULT now()
+);
+
+-- Recalcule la projection depuis les rapports (backfill, suppression d'un rapport,
+-- changement des cibles). p_plant_id NULL = toutes les plantes. Retourne le nombre de plantes.
+CREATE OR REPLACE FUNCTION refresh_plant_latest_state(p_plant_id BIGINT DEFAULT NULL)
+RETURNS INTEGER AS $$
+DECLARE
+  refreshed INTEGER;
+BEGIN
+  WITH plant_targets AS (
+    SELECT
+      ms.id AS plant_id,
+      COALESCE(
+        ms.ideal_soil_humidity_after_watering::float,
+        (ms.min_soil_humidity + ms.max_soil_humidity) / 2.0
+      ) AS target_humidity
+    FROM maintenance_sheet ms
+    WHERE p_plant_id IS NULL OR ms.id = p_plant_id
+  )
+  INSERT INTO plant_latest_state (
+    plant_id,
+    last_watering_id, last_watering_at, last_watering_humidity,
+    last_watering_above_target_id, last_watering_above_target_at, last_watering_above_target_humidity,
+    last_express_id, last_express_at, last_express_soil_humidity, last_express_air_humidity, last_express_temperature,
+    last_express_above_target_id, last_express_above_target_at, last_express_above_target_humidity,
+    updated_at
+  )
+  SELECT
+    pt.plant_id,
+    lw.id, lw.created_at, lw.soil_humidity_mean,
+    lwa.id, lwa.created_at, lwa.soil_humidity_mean,
+    le.id, le.created_at, le.soil_humidity_mean, le.air_humidity_mean, le.temperature_mean,
+    lea.id, lea.created_at, lea.soil_humidity_mean,
+    now()
+  FROM plant_targets pt
+  LEFT JOIN LATERAL (
+    SELECT wr.id, wr.created_at, wr.soil_humidity_mean
+    FROM watering_report wr
+    WHERE wr.plant_id = pt.plant_id
+    ORDER BY wr.created_at DESC, wr.id DESC
+    LIMIT 1
+  ) lw ON TRUE
+  LEFT JOIN LATERAL (
+    SELECT wr.id, wr.created_at, wr.soil_humidity_mean
+    FROM watering_report wr
+    WHERE wr.plant_id = pt.plant_id AND wr.soil_humidity_mean > pt.target_humidity
+    ORDER BY wr.created_at DESC, wr.id DESC
+    LIMIT 1
+  ) lwa ON TRUE
+  LEFT JOIN LATERAL (
+    SELECT ear.id, ear.created_at, ear.soil_humidity_mean, ear.air_humidity_mean, ear.temperature_mean
+    FROM express_analysis_report ear
+    WHERE ear.plant_id = pt.plant_id
+    ORDER BY ear.created_at DESC, ear.id DESC
+    LIMIT 1
+  ) le ON TRUE
+  LEFT JOIN LATERAL (
+    SELECT ear.id, ear.created_at, ear.soil_humidity_mean
+    FROM express_analysis_report ear
+    WHERE ear.plant_id = pt.plant_id AND ear.soil_humidity_mean > pt.target_humidity
+    ORDER BY ear.created_at DESC, ear.id DESC
+    LIMIT 1
+  ) lea ON TRUE
+  ON CONFLICT (plant_id) DO UPDATE SET
+    last_watering_id = EXCLUDED.last_watering_id,
+    last_watering_at = EXCLUDED.last_watering_at,
+    last_watering_humidity = EXCLUDED.last_watering_humidity,
+    last_watering_above_target_id = EXCLUDED.last_watering_above_target_id,
+    last_watering_above_target_at = EXCLUDED.last_watering_above_target_at,
+    last_watering_above_target_humidity = EXCLUDED.last_watering_above_target_humidity,
+    last_express_id = EXCLUDED.last_express_id,
+    last_express_at = EXCLUDED.last_express_at,
+    last_express_soil_humidity = EXCLUDED.last_express_soil_humidity,
+    last_express_air_humidity = EXCLUDED.last_express_air_humidity,
+    last_express_temperature = EXCLUDED.last_express_temperature,
+    last_express_above_target_id = EXCLUDED.last_express_above_target_id,
+    last_express_above_target_at = EXCLUDED.last_express_above_target_at,
+    last_express_above_target_humidity = EXCLUDED.last_express_above_target_humidity,
+    updated_at = EXCLUDED.updated_at;
+
+  GET DIAGNOSTICS refreshed = ROW_COUNT;
+  RETURN refreshed;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Backfill des données existantes
+SELECT refresh_plant_latest_state();
@@ -0,0 +1,15 @@
+-- Index couvrants pour les timelines de rapports: filtre plant_id, tri created_at DESC
+-- (id DESC départage les rapports de même horodatage). Les moyennes en INCLUDE permettent
+-- des Index Only Scan pour list_maintenance_summaries; les LATERAL ... LIMIT 1 de
+-- refresh_plant_latest_state() s'arrêtent à la première entrée de l'index.
+-- CONCURRENTLY: pas de verrou d'écriture sur une base déjà en service.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_express_report_plant_created
+  ON express_analysis_report (plant_id, created_at DESC, id DESC)
+  INCLUDE (soil_humidity_mean, lumens_mean, air_humidity_mean, temperature_mean);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_watering_report_plant_created
+  ON watering_report (plant_id, created_at DESC, id DESC)
+  INCLUDE (soil_humidity_mean);
+
+ANALYZE express_analysis_report;
+ANALYZE watering_report;
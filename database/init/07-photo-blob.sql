@@ -0,0 +1,51 @@
+-- Photos des plantes adressées par contenu (sha256), hors des lignes maintenance_sheet.
+-- Les requêtes sur les fiches ne lisent plus que photo_id; une même image envoyée
+-- deux fois n'est stockée qu'une fois.
+CREATE TABLE IF NOT EXISTS photo_blob (
+  id BIGSERIAL PRIMARY KEY,
+  content_hash CHAR(64) NOT NULL UNIQUE,   -- sha256 hexadécimal du contenu
+  content_type TEXT NOT NULL DEFAULT 'application/octet-stream',
+  byte_size INTEGER NOT NULL CHECK (byte_size >= 0),
+  content BYTEA NOT NULL,
+  created_at TIMESTAMP WITH TIME ZONE DEFAULT now()
+);
+
+-- Les images sont déjà compressées: pas de TOAST pglz inutile
+ALTER TABLE photo_blob ALTER COLUMN content SET STORAGE EXTERNAL;
+
+ALTER TABLE maintenance_sheet
+  ADD COLUMN IF NOT EXISTS photo_id BIGINT REFERENCES photo_blob(id) ON DELETE SET NULL;
+
+CREATE INDEX IF NOT EXISTS idx_maintenance_photo ON maintenance_sheet (photo_id);
+
+-- Migration des photos existantes (dédupliquées par hash) puis suppression de la colonne
+DO $$
+BEGIN
+  IF EXISTS (
+    SELECT 1 FROM information_schema.columns
+    WHERE table_name = 'maintenance_sheet' AND column_name = 'photo'
+  ) THEN
+    INSERT INTO photo_blob (content_hash, content_type, byte_size, content)
+    SELECT DISTINCT ON (encode(sha256(photo), 'hex'))
+      encode(sha256(photo), 'hex'),
+      CASE
+        WHEN substring(photo FROM 1 FOR 3) = '\xffd8ff'::bytea THEN 'image/jpeg'
+        WHEN substring(photo FROM 1 FOR 8) = '\x89504e470d0a1a0a'::bytea THEN 'image/png'
+        WHEN substring(photo FROM 9 FOR 4) = 'WEBP'::bytea THEN 'image/webp'
+        ELSE 'application/octet-stream'
+      END,
+      octet_length(photo),
+      photo
+    FROM maintenance_sheet
+    WHERE photo IS NOT NULL
+    ON CONFLICT (content_hash) DO NOTHING;
+
+    UPDATE maintenance_sheet ms
+    SET photo_id = pb.id
+    FROM photo_blob pb
+    WHERE ms.photo IS NOT NULL
+      AND pb.content_hash = encode(sha256(ms.photo), 'hex');
+
+    ALTER TABLE maintenance_sheet DROP COLUMN photo;
+  END IF;
+END $$;
@@ -0,0 +1,16 @@
+-- Variantes pré-calculées d'une photo (miniatures), servies par
+-- GET /maintenance-sheets/{id}/photo?variant=small|medium. L'original reste dans photo_blob.
+CREATE TABLE IF NOT EXISTS photo_variant (
+  photo_id BIGINT NOT NULL REFERENCES photo_blob(id) ON DELETE CASCADE,
+  variant TEXT NOT NULL CHECK (variant IN ('small', 'medium')),
+  content_hash CHAR(64) NOT NULL,
+  content_type TEXT NOT NULL,
+  byte_size INTEGER NOT NULL CHECK (byte_size >= 0),
+  width INTEGER,
+  height INTEGER,
+  content BYTEA NOT NULL,
+  created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+  PRIMARY KEY (photo_id, variant)
+);
+
+ALTER TABLE photo_variant ALTER COLUMN content SET STORAGE EXTERNAL;
@@ -0,0 +1,24 @@
+-- Séries capteurs en binaire compact (utils/series.py: virgule fixe, deltas zigzag/varint)
+-- à la place du JSON texte limité à 512 caractères. Une courbe d'arrosage de 600
+-- points tient en moins d'1 Ko. Les colonnes *_data (JSON) restent lisibles pour
+-- les anciens rapports jusqu'au backfill (python -m commands.pack_report_series).
+ALTER TABLE express_analysis_report
+  ADD COLUMN IF NOT EXISTS soil_humidity_series BYTEA CHECK (octet_length(soil_humidity_series) <= 16384),
+  ADD COLUMN IF NOT EXISTS lumens_series BYTEA CHECK (octet_length(lumens_series) <= 16384),
+  ADD COLUMN IF NOT EXISTS air_humidity_series BYTEA CHECK (octet_length(air_humidity_series) <= 16384),
+  ADD COLUMN IF NOT EXISTS temperature_series BYTEA CHECK (octet_length(temperature_series) <= 16384);
+
+ALTER TABLE watering_report
+  ADD COLUMN IF NOT EXISTS soil_humidity_series BYTEA CHECK (octet_length(soil_humidity_series) <= 16384),
+  ADD COLUMN IF NOT EXISTS pump_series BYTEA CHECK (octet_length(pump_series) <= 16384);
+
+-- Données déjà compactes et peu compressibles: stockage en ligne, sans pglz
+ALTER TABLE express_analysis_report
+  ALTER COLUMN soil_humidity_series SET STORAGE MAIN,
+  ALTER COLUMN lumens_series SET STORAGE MAIN,
+  ALTER COLUMN air_humidity_series SET STORAGE MAIN,
+  ALTER COLUMN temperature_series SET STORAGE MAIN;
+
+ALTER TABLE watering_report
+  ALTER COLUMN soil_humidity_series SET STORAGE MAIN,
+  ALTER COLUMN pump_series SET STORAGE MAIN;
@@ -0,0 +1,4 @@
+-- Statistiques calculées côté serveur (utils/series_stats.py) pour chaque série du
+-- rapport: {"soil_humidity": {"count", "mean", "std", "sigma3", "min", "max", "slope", "outliers"}, ...}
+ALTER TABLE express_analysis_report ADD COLUMN IF NOT EXISTS stats JSONB;
+ALTER TABLE watering_report ADD COLUMN IF NOT EXISTS stats JSONB;
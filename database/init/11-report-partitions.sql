@@ -0,0 +1,172 @@
+-- Partitionnement mensuel (RANGE sur created_at, UTC) de express_analysis_report et
+-- watering_report. Les requêtes bornées en created_at n'ouvrent que les partitions
+-- utiles (partition pruning) et la rétention devient un DROP TABLE de partition au
+-- lieu d'un DELETE massif. Les partitions à venir sont créées par
+-- ensure_report_partitions(), appelée chaque jour par le backend
+-- (infrastructure/report_partitions.py) ou par `make maintain-report-partitions`.
+-- La conversion réécrit les tables: à lancer pendant une fenêtre de maintenance.
+
+-- Crée les partitions manquantes du mois de p_from (défaut: mois courant) jusqu'à
+-- p_months_ahead mois après le mois courant, pour p_table ou (NULL) pour les deux
+-- tables déjà partitionnées. Les lignes du mois tombées dans <table>_default sont
+-- déplacées dans la nouvelle partition (sinon CREATE ... PARTITION OF échoue).
+-- Retourne le nombre de partitions créées.
+DROP FUNCTION IF EXISTS ensure_report_partitions(INTEGER, DATE);
+CREATE OR REPLACE FUNCTION ensure_report_partitions(
+  p_months_ahead INTEGER DEFAULT 3,
+  p_from DATE DEFAULT NULL,
+  p_table TEXT DEFAULT NULL
+)
+RETURNS INTEGER AS $$
+DECLARE
+  report_table TEXT;
+  month_start DATE;
+  last_month DATE;
+  partition_name TEXT;
+  default_name TEXT;
+  range_from TIMESTAMPTZ;
+  range_to TIMESTAMPTZ;
+  has_default_rows BOOLEAN;
+  created INTEGER := 0;
+BEGIN
+  -- plusieurs réplicas peuvent lancer la maintenance en même temps
+  PERFORM pg_advisory_xact_lock(hashtext('ensure_report_partitions'));
+
+  last_month := (date_trunc('month', now() AT TIME ZONE 'UTC') + make_interval(months => p_months_ahead))::date;
+  FOREACH report_table IN ARRAY CASE
+    WHEN p_table IS NULL THEN ARRAY['express_analysis_report', 'watering_report']
+    ELSE ARRAY[p_table]
+  END LOOP
+    -- table pas encore convertie (conversion en cours dans 11-report-partitions.sql)
+    IF (SELECT relkind FROM pg_class WHERE oid = to_regclass(report_table)) IS DISTINCT FROM 'p' THEN
+      CONTINUE;
+    END IF;
+    default_name := report_table || '_default';
+
+    month_start := date_trunc('month', COALESCE(p_from, (now() AT TIME ZONE 'UTC')::date))::date;
+    WHILE month_start <= last_month LOOP
+      partition_name := format('%s_p%s', report_table, to_char(month_start, 'YYYY_MM'));
+      IF to_regclass(partition_name) IS NULL THEN
+        range_from := month_start::timestamp AT TIME ZONE 'UTC';
+        range_to := (month_start + interval '1 month')::timestamp AT TIME ZONE 'UTC';
+
+        has_default_rows := FALSE;
+        IF to_regclass(default_name) IS NOT NULL THEN
+          EXECUTE format('SELECT EXISTS (SELECT 1 FROM %I WHERE created_at >= %L AND created_at < %L)',
+                         default_name, range_from, range_to)
+            INTO has_default_rows;
+        END IF;
+        IF has_default_rows THEN
+          EXECUTE format('CREATE TEMP TABLE report_partition_move (LIKE %I)', report_table);
+          EXECUTE format(
+            'WITH moved AS (DELETE FROM %I WHERE created_at >= %L AND created_at < %L RETURNING *) '
+            'INSERT INTO report_partition_move SELECT * FROM moved',
+            default_name, range_from, range_to
+          );
+        END IF;
+
+        EXECUTE format(
+          'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+          partition_name, report_table, range_from, range_to
+        );
+
+        IF has_default_rows THEN
+          EXECUTE format('INSERT INTO %I SELECT * FROM report_partition_move', report_table);
+          EXECUTE 'DROP TABLE report_partition_move';
+        END IF;
+        created := created + 1;
+      END IF;
+      month_start := (month_start + interval '1 month')::date;
+    END LOOP;
+  END LOOP;
+  RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Supprime les partitions mensuelles entièrement antérieures à p_months mois avant le
+-- mois courant, puis recalcule plant_latest_state. Retourne le nombre de partitions supprimées.
+CREATE OR REPLACE FUNCTION drop_report_partitions_older_than(p_months INTEGER)
+RETURNS INTEGER AS $$
+DECLARE
+  cutoff DATE;
+  partition_name TEXT;
+  dropped INTEGER := 0;
+BEGIN
+  PERFORM pg_advisory_xact_lock(hashtext('ensure_report_partitions'));
+
+  cutoff := (date_trunc('month', now() AT TIME ZONE 'UTC') - make_interval(months => p_months))::date;
+  FOR partition_name IN
+    SELECT c.relname
+    FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    JOIN pg_class p ON p.oid = i.inhparent
+    WHERE p.relname IN ('express_analysis_report', 'watering_report')
+      AND c.relname ~ '_p[0-9]{4}_[0-9]{2}$'
+      AND to_date(right(c.relname, 7), 'YYYY_MM') < cutoff
+  LOOP
+    EXECUTE format('DROP TABLE %I', partition_name);
+    dropped := dropped + 1;
+  END LOOP;
+
+  IF dropped > 0 THEN
+    PERFORM refresh_plant_latest_state();
+  END IF;
+  RETURN dropped;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Conversion des tables existantes (idempotente: ignorée si déjà partitionnées)
+DO $$
+DECLARE
+  report_table TEXT;
+  first_month DATE;
+BEGIN
+  FOREACH report_table IN ARRAY ARRAY['express_analysis_report', 'watering_report'] LOOP
+    IF (SELECT relkind FROM pg_class WHERE oid = to_regclass(report_table)) = 'r' THEN
+      EXECUTE format('ALTER TABLE %I RENAME TO %I', report_table, report_table || '_unpartitioned');
+      -- libère le nom <table>_pkey pour la nouvelle clé primaire
+      EXECUTE format('ALTER INDEX %I RENAME TO %I', report_table || '_pkey', report_table || '_unpartitioned_pkey');
+      -- la séquence SERIAL survit à la table d'origine et reste celle des ids
+      EXECUTE format('ALTER SEQUENCE %I OWNED BY NONE', report_table || '_id_seq');
+      EXECUTE format(
+        'CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING STORAGE) PARTITION BY RANGE (created_at)',
+        report_table, report_table || '_unpartitioned'
+      );
+      EXECUTE format('UPDATE %I SET created_at = now() WHERE created_at IS NULL', report_table || '_unpartitioned');
+      EXECUTE format('ALTER TABLE %I ALTER COLUMN created_at SET NOT NULL', report_table);
+      -- la clé de partition fait partie de toute contrainte d'unicité
+      EXECUTE format('ALTER TABLE %I ADD PRIMARY KEY (id, created_at)', report_table);
+      EXECUTE format(
+        'ALTER TABLE %I ADD FOREIGN KEY (plant_id) REFERENCES maintenance_sheet(id) ON DELETE CASCADE',
+        report_table
+      );
+      EXECUTE format('ALTER SEQUENCE %I OWNED BY %I.id', report_table || '_id_seq', report_table);
+      -- filet de sécurité: une ligne hors des partitions mensuelles n'est jamais rejetée
+      EXECUTE format('CREATE TABLE %I PARTITION OF %I DEFAULT', report_table || '_default', report_table);
+
+      EXECUTE format('SELECT date_trunc(''month'', min(created_at) AT TIME ZONE ''UTC'')::date FROM %I',
+                     report_table || '_unpartitioned')
+        INTO first_month;
+      -- seulement la table convertie: l'autre n'est peut-être pas encore partitionnée
+      PERFORM ensure_report_partitions(
+        3, LEAST(first_month, (now() AT TIME ZONE 'UTC' - interval '1 month')::date), report_table
+      );
+
+      EXECUTE format('INSERT INTO %I SELECT * FROM %I', report_table, report_table || '_unpartitioned');
+      EXECUTE format('DROP TABLE %I', report_table || '_unpartitioned');
+    END IF;
+  END LOOP;
+END $$;
+
+-- Index des timelines (cf. 06-report-timeline-indexes.sql), créés sur la table
+-- partitionnée et donc sur chaque partition présente et future
+CREATE INDEX IF NOT EXISTS idx_express_report_plant_created
+  ON express_analysis_report (plant_id, created_at DESC, id DESC)
+  INCLUDE (soil_humidity_mean, lumens_mean, air_humidity_mean, temperature_mean);
+
+CREATE INDEX IF NOT EXISTS idx_watering_report_plant_created
+  ON watering_report (plant_id, created_at DESC, id DESC)
+  INCLUDE (soil_humidity_mean);
+
+ANALYZE express_analysis_report;
+ANALYZE watering_report;
@@ -0,0 +1,64 @@
+-- Agrégats par plante et par métrique à trois résolutions (heure, jour, semaine; UTC)
+-- pour les courbes d'historique longues: count/sum/min/max, moyenne = sum / count.
+-- Maintenus dans la même transaction que l'insertion des rapports
+-- (create_*_reports), recalculés par bucket à la suppression d'un rapport. Ils
+-- survivent à la rétention des partitions de rapports bruts.
+CREATE TABLE IF NOT EXISTS plant_metric_rollup (
+  plant_id BIGINT NOT NULL REFERENCES maintenance_sheet(id) ON DELETE CASCADE,
+  resolution TEXT NOT NULL CHECK (resolution IN ('hour', 'day', 'week')),
+  bucket_start TIMESTAMP WITH TIME ZONE NOT NULL,
+  metric TEXT NOT NULL,
+  sample_count INTEGER NOT NULL CHECK (sample_count > 0),
+  value_sum DOUBLE PRECISION NOT NULL,
+  value_min REAL NOT NULL,
+  value_max REAL NOT NULL,
+  -- (plant, résolution, fenêtre) : la lecture de l'historique est un range scan
+  PRIMARY KEY (plant_id, resolution, bucket_start, metric)
+);
+
+-- Une ligne par (rapport, métrique) non nulle: source des agrégats
+CREATE OR REPLACE VIEW plant_metric_sample AS
+  SELECT ear.plant_id, ear.created_at, m.metric, m.value::float AS value
+  FROM express_analysis_report ear
+  CROSS JOIN LATERAL (VALUES
+    ('soil_humidity', ear.soil_humidity_mean),
+    ('air_humidity', ear.air_humidity_mean),
+    ('temperature', ear.temperature_mean),
+    ('lumens', ear.lumens_mean)
+  ) AS m (metric, value)
+  WHERE m.value IS NOT NULL
+  UNION ALL
+  SELECT wr.plant_id, wr.created_at, 'watering_soil_humidity', wr.soil_humidity_mean::float
+  FROM watering_report wr
+  WHERE wr.soil_humidity_mean IS NOT NULL;
+
+-- Recalcule les agrégats depuis les rapports bruts. p_at NULL: tout l'historique
+-- de la plante (ou de toutes si p_plant_id NULL); sinon seulement les buckets
+-- contenant p_at. Retourne le nombre de lignes d'agrégats écrites.
+CREATE OR REPLACE FUNCTION refresh_plant_metric_rollups(p_plant_id BIGINT DEFAULT NULL, p_at TIMESTAMP WITH TIME ZONE DEFAULT NULL)
+RETURNS INTEGER AS $$
+DECLARE
+  written INTEGER;
+BEGIN
+  DELETE FROM plant_metric_rollup r
+  WHERE (p_plant_id IS NULL OR r.plant_id = p_plant_id)
+    AND (p_at IS NULL OR r.bucket_start = date_trunc(r.resolution, p_at, 'UTC'));
+
+  INSERT INTO plant_metric_rollup (plant_id, resolution, bucket_start, metric, sample_count, value_sum, value_min, value_max)
+  SELECT s.plant_id, res.resolution, date_trunc(res.resolution, s.created_at, 'UTC'), s.metric,
+         count(*), sum(s.value), min(s.value), max(s.value)
+  FROM (VALUES ('hour'), ('day'), ('week')) AS res (resolution)
+  JOIN plant_metric_sample s
+    ON p_at IS NULL
+    OR s.created_at >= date_trunc(res.resolution, p_at, 'UTC')
+       AND s.created_at < date_trunc(res.resolution, p_at, 'UTC') + ('1 ' || res.resolution)::interval
+  WHERE p_plant_id IS NULL OR s.plant_id = p_plant_id
+  GROUP BY 1, 2, 3, 4;
+
+  GET DIAGNOSTICS written = ROW_COUNT;
+  RETURN written;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Backfill des rapports existants
+SELECT refresh_plant_metric_rollups();
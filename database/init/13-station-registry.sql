@@ -0,0 +1,25 @@
+-- Recherches de station par adresse MAC (connexion WebSocket, commandes, jumelage
+-- MQTT) et par code de jumelage: sans index, chaque lecture parcourait la table.
+CREATE INDEX IF NOT EXISTS idx_station_mac_adress ON station (mac_adress);
+CREATE INDEX IF NOT EXISTS idx_station_pairing_code ON station (pairing_code) WHERE pairing_code IS NOT NULL;
+
+-- Invalidation inter-processus du cache des stations (infrastructure/station_cache.py):
+-- chaque écriture notifie, au commit, les clés (id, mac_adress, pairing_code)
+-- avant et après modification sur le canal 'station_changed'.
+CREATE OR REPLACE FUNCTION notify_station_changed()
+RETURNS trigger AS $$
+BEGIN
+  -- OLD est NULL pour un INSERT, NEW pour un DELETE
+  PERFORM pg_notify('station_changed', json_build_object(
+    'id', json_build_array(OLD.id, NEW.id),
+    'mac_adress', json_build_array(OLD.mac_adress, NEW.mac_adress),
+    'pairing_code', json_build_array(OLD.pairing_code, NEW.pairing_code)
+  )::text);
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS station_changed ON station;
+CREATE TRIGGER station_changed
+  AFTER INSERT OR UPDATE OR DELETE ON station
+  FOR EACH ROW EXECUTE FUNCTION notify_station_changed();
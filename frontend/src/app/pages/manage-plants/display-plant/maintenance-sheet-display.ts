@@ -2,6 +2,7 @@ import {Component, EventEmitter, Input, OnChanges, Output, SimpleChanges} from '
 import { MatIcon } from '@angular/material/icon';
 import {DatePipe, NgIf} from '@angular/common';
 import { DomSanitizer, SafeUrl } from '@angular/platform-browser';
+import { PhotoService } from '../../../services/photo.service';
 import * as QRCode from 'qrcode';
 import {MatButton} from '@angular/material/button';
 
@@ -23,7 +24,7 @@ export class MaintenanceSheetDisplayComponent implements OnChanges {
   @Output() delete = new EventEmitter<number>();
 
 
-  constructor(private sanitizer: DomSanitizer) {}
+  constructor(private sanitizer: DomSanitizer, private photoService: PhotoService) {}
 
   ngOnChanges(changes: SimpleChanges): void {
     if (changes['sheet'] && this.sheet?.id) {
@@ -49,6 +50,11 @@ export class MaintenanceSheetDisplayComponent implements OnChanges {
   }
 
   getPhotoUrl(): SafeUrl | null {
+    // Fiche enregistrée: photo servie par l'API
+    if (this.sheet?.photo_url) {
+      return this.photoService.url(this.sheet.photo_url);
+    }
+    // Aperçu avant création: photo locale en base64
     if (!this.sheet?.photo_base64) {
       return null;
     }
@@ -17,6 +17,7 @@ import {MatMenu, MatMenuItem, MatMenuTrigger} from '@angular/material/menu';
 import {MatBottomSheet} from '@angular/material/bottom-sheet';
 import {MatDivider} from '@angular/material/divider';
 import {MaintenanceActionsSheet} from './maintenance-actions-sheet/component';
+import {PhotoService} from '../../../services/photo.service';
 
 enum Watering_status { URGENT_WATERING = "under_min_humidity" }
 
@@ -56,6 +57,7 @@ export class ViewDailyScheduleComponent implements OnInit, AfterViewInit {
   constructor(
     private stationService: StationService,
     private sanitizer: DomSanitizer,
+    private photoService: PhotoService,
     private nativeService: NativeService,
     private route: ActivatedRoute,
     private breadcrumbService: BreadcrumbService,
@@ -114,15 +116,8 @@ export class ViewDailyScheduleComponent implements OnInit, AfterViewInit {
   }
 
   getPhotoUrl(sheet:any): SafeUrl | null {
-    if (!sheet.photo_base64) {
-      return null;
-    }
-
-    if (sheet.photo_base64.startsWith('data:image')) {
-      return this.sanitizer.bypassSecurityTrustUrl(sheet.photo_base64);
-    }
-
-    return this.sanitizer.bypassSecurityTrustUrl(`data:image/jpeg;base64,${sheet.photo_base64}`);
+    // Les cartes n'ont besoin que de la miniature
+    return this.photoService.url(sheet.photo_url, 'medium');
   }
 
   scrollToPlantById(plantId: number): void {
@@ -37,7 +37,9 @@ export interface MaintenanceSheet {
   ideal_temperature?: number;
   ideal_watering_days_frequency?: number;
 
-  photo_base64?: string;
+  photo_base64?: string;  // envoi uniquement (création)
+  photo_url?: string;     // GET {photo_url}[&variant=small|medium]
+  photo_hash?: string;
 
   created_at: string;
   updated_at: string;
@@ -0,0 +1,53 @@
+import { Injectable, signal } from '@angular/core';
+import { HttpClient } from '@angular/common/http';
+import { DomSanitizer, SafeUrl } from '@angular/platform-browser';
+
+import { environment } from '../../environments/environment';
+
+export type PhotoVariant = 'small' | 'medium';
+
+/**
+ * Photos des plantes servies par GET /maintenance-sheets/{id}/photo (auth Bearer):
+ * téléchargées via HttpClient (intercepteur d'auth) puis exposées en URL blob:.
+ * Les réponses sont immuables (hash dans l'URL) et mises en cache par le navigateur.
+ */
+@Injectable({
+  providedIn: 'root'
+})
+export class PhotoService {
+  private urls = signal<Record<string, SafeUrl>>({});
+  private pending = new Set<string>();
+
+  constructor(private http: HttpClient, private sanitizer: DomSanitizer) {}
+
+  /** URL affichable de la photo, null tant qu'elle n'est pas chargée. */
+  url(photoUrl: string | null | undefined, variant?: PhotoVariant): SafeUrl | null {
+    if (!photoUrl) {
+      return null;
+    }
+    const src = new URL(photoUrl, environment.apiUrl);
+    if (variant) {
+      src.searchParams.set('variant', variant);
+    }
+    const key = src.toString();
+
+    const cached = this.urls()[key];
+    if (cached) {
+      return cached;
+    }
+    if (!this.pending.has(key)) {
+      this.pending.add(key);
+      this.http.get(key, { responseType: 'blob' }).subscribe({
+        next: (blob) => {
+          const objectUrl = this.sanitizer.bypassSecurityTrustUrl(URL.createObjectURL(blob));
+          this.urls.update((urls) => ({ ...urls, [key]: objectUrl }));
+        },
+        error: (err) => {
+          console.error('[PhotoService] Erreur lors du chargement de la photo:', err);
+          this.pending.delete(key);
+        },
+      });
+    }
+    return null;
+  }
+}
@@ -83,14 +83,16 @@ fi
 declare -A MIGRATION_MAP
 for MIGRATION_FILE in "${MIGRATIONS[@]}"; do
     FILE=$(basename "$MIGRATION_FILE")
-    NUMBER=$(echo "$FILE" | grep -oE '^[0-9]+')
+    # préfixes sur deux chiffres (05-...): 05 et 5 désignent la même migration
+    NUMBER=$((10#$(echo "$FILE" | grep -oE '^[0-9]+')))
     MIGRATION_MAP[$NUMBER]="$MIGRATION_FILE"
     echo "  [$NUMBER] $FILE"
 done
 
 echo ""
-echo -e "${YELLOW}Enter the migration number to execute (e.g., 3 for 3-add-photo-column.sql):${NC}"
+echo -e "${YELLOW}Enter the migration number to execute (e.g., 3 for 03-add-photo-column.sql):${NC}"
 read -r SELECTION
+[[ "$SELECTION" =~ ^[0-9]+$ ]] && SELECTION=$((10#$SELECTION))
 
 if [ -z "${MIGRATION_MAP[$SELECTION]}" ]; then
     echo -e "${RED}Invalid migration number: $SELECTION${NC}"
@@ -101,7 +103,7 @@ fi
 START_INDEX=-1
 for i in "${!MIGRATIONS[@]}"; do
     FILE=$(basename "${MIGRATIONS[$i]}")
-    NUMBER=$(echo "$FILE" | grep -oE '^[0-9]+')
+    NUMBER=$((10#$(echo "$FILE" | grep -oE '^[0-9]+')))
     if [ "$NUMBER" -ge "$SELECTION" ] && [ "$START_INDEX" -eq -1 ]; then
         START_INDEX=$i
         break